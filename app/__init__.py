@@ -11,7 +11,14 @@ import logging
 from logging.handlers import RotatingFileHandler
 import sys
 
-def create_app():
+def create_app(test_config=None):
+    """
+    Create the Flask application
+
+    Args:
+        test_config (dict, optional): Config overrides applied before any
+            extension is initialized (e.g. the tests' in-memory database)
+    """
     # Setup logging first so we can capture initialization logs
     setup_logging()
     
@@ -27,6 +34,10 @@ def create_app():
     else:
         app.config.from_object('config.DevConfig')
     
+    # Overrides must be in place before init_db creates the engine
+    if test_config:
+        app.config.update(test_config)
+    
     # Explicitly set FLASK_ENV in app config so it's accessible in templates
     app.config['FLASK_ENV'] = flask_env
     
@@ -58,6 +69,13 @@ def create_app():
     # Import models to ensure they're registered with SQLAlchemy
     from app.database.models import User, Post, AuthToken, Trip, Recommendation, Activity
     
+    # Keep trip summary counters in step with recommendation writes
+    from app.database import trip_counters  # noqa: F401
+    
+    # Load the in-memory destination autocomplete index for this worker
+    from app.services.destination_index import DestinationIndex
+    DestinationIndex.init_app(app)
+    
     # Register CLI commands
     from app.cli import init_app as init_cli
     init_cli(app)
@@ -186,9 +204,10 @@ def setup_logging():
     root_logger.addHandler(file_handler)
     
     # Configure specific module loggers
-    google_places_logger = logging.getLogger('app.services.google_places_service')
-    google_places_logger.setLevel(logging.DEBUG)
-    google_places_logger.addHandler(places_file_handler)
+    for places_module in ('google_places_service', 'google_places_batch', 'google_places_destinations'):
+        google_places_logger = logging.getLogger(f'app.services.{places_module}')
+        google_places_logger.setLevel(logging.DEBUG)
+        google_places_logger.addHandler(places_file_handler)
     
     activity_model_logger = logging.getLogger('app.database.models')
     activity_model_logger.setLevel(logging.DEBUG)
@@ -1,9 +1,9 @@
 from flask import Blueprint, render_template, request, redirect, url_for, current_app, flash, session
 import secrets
 from datetime import datetime, timedelta
-import requests
 from app.database import db
 from app.database.models import User, AuthToken
+from app.services.http_client import get_client
 import logging
 
 # Temporary toggle to enable real email sending in dev mode
@@ -84,7 +84,7 @@ def send_auth_email(email, token):
             }
             
             # Make the API request to Resend
-            response = requests.post(
+            response = get_client('resend').post(
                 "https://api.resend.com/emails",
                 headers={
                     "Authorization": f"Bearer {api_key}",
@@ -74,8 +74,86 @@ def clear_tokens_command():
     db.session.commit()
     click.echo(f'Cleared {expired_tokens} expired or used tokens.')
 
+@click.command('evict-place-cache')
+@with_appcontext
+def evict_place_cache_command():
+    """Remove expired place lookup cache entries (found and not found)."""
+    from app.services.place_cache_service import PlaceCacheService
+    evicted = PlaceCacheService.evict_expired()
+    click.echo(f'Evicted {evicted} expired place cache entries.')
+
+@click.command('import-gazetteer')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['geonames', 'csv']), default='geonames',
+              help='GeoNames TSV dump or a headed CSV (e.g. Natural Earth populated places).')
+@click.option('--source', default='geonames', help='Prefix for destination external ids.')
+@click.option('--country-info', type=click.Path(exists=True, dir_okay=False),
+              help='GeoNames countryInfo.txt, to store country names instead of ISO codes.')
+@click.option('--chunk-size', default=1000, show_default=True, help='Rows written per batch.')
+@click.option('--min-population', default=0, show_default=True, help='Skip smaller places.')
+@with_appcontext
+def import_gazetteer_command(path, file_format, source, country_info, chunk_size, min_population):
+    """Import cities from a local gazetteer dump into destinations."""
+    from app.services.gazetteer_import_service import GazetteerImportService
+    counts = GazetteerImportService.import_file(
+        path,
+        file_format=file_format,
+        source=source,
+        country_info_path=country_info,
+        chunk_size=chunk_size,
+        min_population=min_population
+    )
+    click.echo(f"Read {counts['read']} rows: imported {counts['imported']}, skipped {counts['skipped']}.")
+
+@click.command('reconcile-trip-counters')
+@with_appcontext
+def reconcile_trip_counters_command():
+    """Recompute trip summary counters that have drifted from their recommendations."""
+    from app.database.trip_counters import reconcile_trip_counters
+    with db.engine.begin() as conn:
+        repaired = reconcile_trip_counters(conn)
+    click.echo(f'Repaired counters for {repaired} trips.')
+
+@click.command('run-worker')
+@click.option('--poll-interval', default=0.5, show_default=True, help='Seconds to wait when the queue is empty.')
+@click.option('--max-jobs', type=int, help='Exit after running this many jobs.')
+@click.option('--burst', is_flag=True, help='Exit once the queue is empty.')
+@click.option('--threads', default=1, show_default=True,
+              help='Jobs to run at once (lets short extractions share a batched request); --max-jobs is per thread.')
+@with_appcontext
+def run_worker_command(poll_interval, max_jobs, burst, threads):
+    """Run queued background jobs (e.g. AI extraction)."""
+    import os
+    import socket
+    import threading
+    from flask import current_app
+    from app.services.job_worker import JobWorker
+    if threads <= 1:
+        ran = JobWorker.work(poll_interval=poll_interval, max_jobs=max_jobs, burst=burst)
+        click.echo(f'Ran {ran} jobs.')
+        return
+
+    app = current_app._get_current_object()
+    counts = []
+    def run(number):
+        with app.app_context():
+            counts.append(JobWorker.work(
+                worker_id=f"{socket.gethostname()}:{os.getpid()}:{number}",
+                poll_interval=poll_interval, max_jobs=max_jobs, burst=burst
+            ))
+    workers = [threading.Thread(target=run, args=(number,), daemon=True) for number in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    click.echo(f'Ran {sum(counts)} jobs.')
+
 def init_app(app):
     """Register database commands with the Flask app."""
     app.cli.add_command(init_db_command)
     app.cli.add_command(seed_db_command)
-    app.cli.add_command(clear_tokens_command) 
\ No newline at end of file
+    app.cli.add_command(clear_tokens_command)
+    app.cli.add_command(evict_place_cache_command)
+    app.cli.add_command(import_gazetteer_command)
+    app.cli.add_command(reconcile_trip_counters_command)
+    app.cli.add_command(run_worker_command) 
\ No newline at end of file
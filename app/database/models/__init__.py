@@ -0,0 +1,11 @@
+"""
+Database models, one module per area. Everything is re-exported here so
+models are imported from app.database.models, and so every mapped class is
+registered before relationships between modules are configured.
+"""
+from app.database.models.users import User, AuthToken, Post
+from app.database.models.destinations import Destination, DestinationSuggestion
+from app.database.models.trips import Trip, Recommendation, TripSubscription
+from app.database.models.activities import Activity
+from app.database.models.caches import PlaceCacheEntry, PlaceLookupMiss, RenderedFragment, ExtractionCacheEntry
+from app.database.models.jobs import BackgroundJob
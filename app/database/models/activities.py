@@ -0,0 +1,285 @@
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import validates
+from app.database import db
+from app.services.normalization import normalize_text
+
+class Activity(db.Model):
+    """
+    An activity represents a place or experience that can be recommended.
+    It is separated from recommendations to allow multiple users to recommend
+    the same activity without duplicating the activity information.
+    """
+    __tablename__ = 'activities'
+    __table_args__ = (db.Index('ix_activities_normalized_name_country', 'normalized_name', 'country'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), nullable=False)
+    normalized_name = db.Column(db.String(255), nullable=True)  # Kept in step with name, for lookups
+    category = db.Column(db.String(50), nullable=True)  # restaurant, museum, hiking, tour, etc.
+    website_url = db.Column(db.String(255), nullable=True)
+    
+    # Location details (optional - for place-based activities)
+    address = db.Column(db.String(255), nullable=True)
+    city = db.Column(db.String(100), nullable=True)
+    country = db.Column(db.String(100), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    
+    # Google Places data
+    google_place_id = db.Column(db.String(255), nullable=True, unique=True, index=True)
+    place_data = db.Column(db.JSON, nullable=True)  # Store additional Google Place data
+    
+    is_place_based = db.Column(db.Boolean, default=True)  # Whether it's tied to a physical location
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Activity can be recommended multiple times
+    recommendations = db.relationship('Recommendation', backref='activity', lazy=True)
+    
+    def __repr__(self):
+        return f'<Activity {self.name}>'
+    
+    @validates('name')
+    def _set_normalized_name(self, key, name):
+        self.normalized_name = normalize_text(name)
+        return name
+    
+    @classmethod
+    def get_or_create(cls, name, category=None, website_url=None, **kwargs):
+        """
+        Find an existing activity by name (and optionally category) or create a new one.
+        This helps prevent duplicate activities when multiple users recommend the same place.
+        
+        First attempts to match with Google Places API to get standardized place data.
+        If Google Place ID is found, uses that for exact matching.
+        
+        Returns:
+            Activity: The existing or newly created activity
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        logger.info(f"Activity.get_or_create called for: {name}")
+        if category:
+            logger.info(f"Category: {category}")
+        
+        # Log destination context information if provided
+        if kwargs.get('search_vicinity'):
+            logger.info(f"With search_vicinity: {kwargs.get('search_vicinity')}")
+        if kwargs.get('destination_country'):
+            logger.info(f"With destination_country: {kwargs.get('destination_country')}")
+            
+        # First check if we already have this activity by name (in the trip's country)
+        destination_country = kwargs.get('destination_country')
+        activity = cls._in_country(cls.query.filter_by(normalized_name=normalize_text(name)), destination_country).first()
+        if activity:
+            logger.info(f"Found existing activity by name: {activity.name}")
+            # Skip Google Places API call if we already have this activity
+            # (prevents repeatedly trying to get coordinates for places that don't have them)
+            return activity
+            
+        from app.services.google_places_service import GooglePlacesService
+        
+        # First check if we have a Google Place ID in the kwargs and try to find by that
+        google_place_id = kwargs.pop('google_place_id', None)
+        if google_place_id:
+            logger.info(f"Searching by provided place_id: {google_place_id}")
+            activity = cls.query.filter_by(google_place_id=google_place_id).first()
+            if activity:
+                logger.info(f"Found existing activity with place_id: {activity.name}")
+                return activity
+        
+        # Try to match the place name with Google Places API
+        place_data = None
+        google_place_id = None
+        try:
+            # Extract search context parameters
+            search_context = {
+                'search_vicinity': kwargs.pop('search_vicinity', None),
+                'destination_country': kwargs.pop('destination_country', None)
+            }
+            
+            # Filter out None values
+            search_context = {k: v for k, v in search_context.items() if v is not None}
+            
+            logger.info(f"Making Google Places API call for: {name}")
+            place_data = GooglePlacesService.find_place(name, category, **search_context)
+            
+            if place_data:
+                logger.info(f"Google Places API returned data for place: {place_data.get('name')}")
+                google_place_id = place_data.get('place_id')
+                if google_place_id:
+                    logger.info(f"Found place_id from Google: {google_place_id}")
+                    # Check if we already have this place ID in our database
+                    activity = cls.query.filter_by(google_place_id=google_place_id).first()
+                    if activity:
+                        logger.info(f"Found existing activity with this place_id: {activity.name}")
+                        return activity
+                else:
+                    logger.warning("Google Places API returned data but no place_id")
+            else:
+                logger.info(f"No Google Places match found for: {name}")
+        except Exception as e:
+            logger.error(f"Error matching with Google Places API: {str(e)}")
+        
+        # The name lookup above already missed, so there's nothing to fall back to
+        if not google_place_id:
+            logger.info(f"No existing activity found with name: {name}")
+        
+        # If no activity found, create a new one
+        if not activity:
+            logger.info(f"Creating new activity for: {name}")
+            kwargs.setdefault('country', destination_country)
+            activity = cls._build(name, category, website_url, place_data if google_place_id else None, **kwargs)
+            db.session.add(activity)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Another request created the same place between our lookup and insert
+                db.session.rollback()
+                existing = cls.query.filter_by(google_place_id=google_place_id).first() if google_place_id else None
+                if not existing:
+                    raise
+                logger.info(f"Activity with place_id {google_place_id} was created concurrently: {existing.name}")
+                return existing
+            
+            # Log the newly created activity
+            activity_id = activity.id if activity else None
+            logger.info(f"Created new activity: {name} (ID: {activity_id})")
+            
+        return activity
+    
+    @classmethod
+    def resolve_many(cls, items, **kwargs):
+        """
+        Find or create activities for a batch of submitted places at once.
+        Matches every name in one query, resolves the rest against Google
+        Places concurrently, and adds new activities with a single flush.
+        Nothing is committed; the caller commits along with its own changes.
+        
+        Args:
+            items: List of dicts with 'name' and optional 'category' and 'website_url'
+            **kwargs: Search context for Google Places (search_vicinity, destination_country)
+            
+        Returns:
+            List of Activity objects, one per item in the same order
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        from app.services.google_places_batch import GooglePlacesBatch
+        
+        logger.info(f"Activity.resolve_many called for {len(items)} items")
+        
+        # One query for every name we already know (in the trip's country)
+        destination_country = kwargs.get('destination_country')
+        normalized = {normalize_text(item['name']) for item in items}
+        by_name = {}
+        for activity in cls._in_country(cls.query.filter(cls.normalized_name.in_(normalized)), destination_country).all():
+            by_name.setdefault(activity.normalized_name, activity)
+        
+        # Resolve each unmatched name once, concurrently
+        unmatched = []
+        for item in items:
+            key = normalize_text(item['name'])
+            if key not in by_name:
+                by_name[key] = None
+                unmatched.append(item)
+        
+        search_context = {k: v for k, v in kwargs.items() if k in ('search_vicinity', 'destination_country') and v is not None}
+        places = GooglePlacesBatch.find_places(
+            [(item['name'], item.get('category')) for item in unmatched], **search_context
+        )
+        
+        # One query for places that already exist under another name
+        place_ids = {place['place_id'] for place in places if place and place.get('place_id')}
+        by_place_id = {}
+        if place_ids:
+            by_place_id = {a.google_place_id: a for a in cls.query.filter(cls.google_place_id.in_(place_ids)).all()}
+        
+        new_activities = []
+        for item, place in zip(unmatched, places):
+            place_id = place.get('place_id') if place else None
+            activity = by_place_id.get(place_id) if place_id else None
+            if activity is None:
+                activity = cls._build(item['name'], item.get('category'), item.get('website_url'),
+                                      place if place_id else None, country=destination_country)
+                new_activities.append(activity)
+                if place_id:
+                    # Two names for the same place share one new activity
+                    by_place_id[place_id] = activity
+            by_name[normalize_text(item['name'])] = activity
+        
+        if new_activities and db.engine.dialect.name == 'sqlite':
+            # pysqlite commits when a savepoint is released outside an explicit
+            # transaction, which would commit the caller's work early
+            db.session.add_all(new_activities)
+            db.session.flush()
+        elif new_activities:
+            try:
+                with db.session.begin_nested():
+                    db.session.add_all(new_activities)
+            except IntegrityError:
+                # Another request inserted some of these places first; use its rows
+                logger.info("Activities were created concurrently; re-matching by place_id")
+                existing = {a.google_place_id: a for a in cls.query.filter(cls.google_place_id.in_(place_ids)).all()}
+                for key, activity in list(by_name.items()):
+                    if activity.google_place_id in existing and activity in new_activities:
+                        by_name[key] = existing[activity.google_place_id]
+                remaining = [a for a in new_activities if a.google_place_id not in existing]
+                db.session.add_all(remaining)
+                db.session.flush()
+                new_activities = remaining
+        
+        logger.info(f"Resolved {len(items)} items: {len(new_activities)} new activities")
+        return [by_name[normalize_text(item['name'])] for item in items]
+    
+    @classmethod
+    def _in_country(cls, query, country):
+        """
+        Limit a lookup to activities in a country, or with none recorded,
+        preferring the ones in the country; unchanged if country is unknown
+        """
+        if not country:
+            return query
+        return query.filter(db.or_(cls.country == country, cls.country.is_(None))).order_by(cls.country.is_(None))
+    
+    @classmethod
+    def _build(cls, name, category=None, website_url=None, place_data=None, **kwargs):
+        """
+        Make a new (unsaved) activity, filled in from Google Places data if given
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        activity_data = {
+            'name': name,
+            'category': category,
+            'website_url': website_url,
+            **kwargs
+        }
+        
+        # Add Google Places data if available
+        if place_data:
+            logger.info(f"Adding Google Places data to new activity")
+            activity_data.update({
+                'google_place_id': place_data.get('place_id'),
+                'place_data': place_data,
+                'address': place_data.get('formatted_address'),
+                'latitude': place_data.get('geometry', {}).get('location', {}).get('lat'),
+                'longitude': place_data.get('geometry', {}).get('location', {}).get('lng'),
+                'website_url': place_data.get('website') or website_url,
+            })
+            
+            # Try to determine city and country from address components
+            if place_data.get('address_components'):
+                for component in place_data.get('address_components', []):
+                    if 'locality' in component.get('types', []):
+                        activity_data['city'] = component.get('long_name')
+                        logger.info(f"Found city from Google: {component.get('long_name')}")
+                    elif 'country' in component.get('types', []):
+                        activity_data['country'] = component.get('long_name')
+                        logger.info(f"Found country from Google: {component.get('long_name')}")
+        
+        return cls(**activity_data)
@@ -0,0 +1,95 @@
+from datetime import datetime
+from app.database import db
+
+class PlaceCacheEntry(db.Model):
+    """
+    Cached result of an external place lookup (e.g. Google Places find_place).
+    Shared by all app workers so a place resolved once is not looked up again
+    until the entry expires.
+    """
+    __tablename__ = 'place_cache'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False, index=True)  # sha256 of the normalized lookup
+    provider = db.Column(db.String(50), nullable=False)  # google_places, openstreetmap, etc.
+    
+    # Normalized lookup parameters (kept for debugging and admin inspection)
+    query_name = db.Column(db.String(255), nullable=False)
+    category = db.Column(db.String(50), nullable=True)
+    search_vicinity = db.Column(db.String(255), nullable=True)
+    destination_country = db.Column(db.String(100), nullable=True)
+    
+    place_id = db.Column(db.String(255), nullable=True)
+    place_data = db.Column(db.JSON, nullable=True)  # Trimmed place details
+    
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_hit_at = db.Column(db.DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<PlaceCacheEntry {self.provider}:{self.query_name}>'
+
+class PlaceLookupMiss(db.Model):
+    """
+    Negative cache entry: an external place lookup that found nothing.
+    Kept separate from PlaceCacheEntry with a much shorter TTL so names that
+    become resolvable upstream are retried soon.
+    """
+    __tablename__ = 'place_lookup_misses'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False, index=True)  # Same key scheme as PlaceCacheEntry
+    provider = db.Column(db.String(50), nullable=False)
+    query_name = db.Column(db.String(255), nullable=False)
+    search_vicinity = db.Column(db.String(255), nullable=True)
+    
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<PlaceLookupMiss {self.provider}:{self.query_name}>'
+
+class RenderedFragment(db.Model):
+    """
+    Shared copy of a rendered template fragment (e.g. a trip's recommendation
+    list), keyed by the owning object and its content version. Only the
+    latest version of each scope is kept.
+    """
+    __tablename__ = 'rendered_fragments'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False, index=True)  # sha256 of scope, version and name
+    scope = db.Column(db.String(255), nullable=False, index=True)  # e.g. trip:12:<share token>
+    version = db.Column(db.Integer, nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RenderedFragment {self.scope} v{self.version} {self.name}>'
+
+class ExtractionCacheEntry(db.Model):
+    """
+    Recommendations extracted from a submitted text, keyed by the text,
+    destination, model and prompt version so resubmitting the same text
+    doesn't pay for another extraction. Least recently used entries are
+    evicted once the table is over EXTRACTION_CACHE_MAX_ENTRIES.
+    """
+    __tablename__ = 'extraction_cache'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False, index=True)  # sha256 of text, destination, model and prompt version
+    model = db.Column(db.String(100), nullable=False)
+    prompt_version = db.Column(db.String(16), nullable=False)  # Digest of the prompt template
+    destination = db.Column(db.String(255), nullable=True)  # Normalized, for admin inspection
+    text_length = db.Column(db.Integer, nullable=False)
+    recommendations = db.Column(db.JSON, nullable=False)
+    
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<ExtractionCacheEntry {self.cache_key[:12]} {self.model}>'
@@ -0,0 +1,176 @@
+from datetime import datetime
+from sqlalchemy.orm import validates
+from app.database import db
+from app.database import search as destination_search
+from app.services.normalization import normalize_text
+
+class Destination(db.Model):
+    """
+    Represents a travel destination such as a city, region, or country.
+    Used to standardize destination data across trips and enable features
+    like autosuggest and destination metadata.
+    """
+    __tablename__ = 'destinations'
+    __table_args__ = (db.Index('ix_destinations_normalized_name_country', 'normalized_name', 'country'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), nullable=False)
+    normalized_name = db.Column(db.String(255), nullable=True)  # Kept in step with name, for lookups
+    display_name = db.Column(db.String(255), nullable=True)
+    country = db.Column(db.String(100), nullable=True)
+    type = db.Column(db.String(50), nullable=True)  # city, region, country, etc.
+    
+    # Geographical data
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    population = db.Column(db.Integer, nullable=True)
+    travel_popularity = db.Column(db.Float, nullable=True)  # A metric for travel popularity if available
+    
+    # External references
+    google_place_id = db.Column(db.String(255), nullable=True, unique=True, index=True)
+    external_id = db.Column(db.String(100), nullable=True, unique=True, index=True)  # Gazetteer id, e.g. "geonames:2988507"
+    place_data = db.Column(db.JSON, nullable=True)  # Store additional place data
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationship with trips
+    trips = db.relationship('Trip', backref='destination_obj', lazy=True)
+    
+    def __repr__(self):
+        return f'<Destination {self.name}, {self.country if self.country else "Unknown"}>'
+    
+    @validates('name')
+    def _set_normalized_name(self, key, name):
+        self.normalized_name = normalize_text(name)
+        return name
+    
+    @classmethod
+    def search(cls, query, limit=10):
+        """
+        Find destinations whose name, display name or country matches the query,
+        best match first. Uses the dialect's search index (FTS5 on SQLite,
+        pg_trgm on PostgreSQL) and falls back to ILIKE when it isn't available.
+        
+        Args:
+            query: The search text
+            limit: Maximum number of destinations to return
+            
+        Returns:
+            List of Destination objects
+        """
+        ids = destination_search.search_ids(query, limit)
+        if ids is not None:
+            if not ids:
+                return []
+            by_id = {dest.id: dest for dest in cls.query.filter(cls.id.in_(ids)).all()}
+            return [by_id[dest_id] for dest_id in ids if dest_id in by_id]
+        
+        return cls.query.filter(
+            db.or_(
+                cls.name.ilike(f"%{query}%"),
+                cls.display_name.ilike(f"%{query}%"),
+                cls.country.ilike(f"%{query}%")
+            )
+        ).limit(limit).all()
+    
+    def to_search_result(self):
+        """Format this destination like the external destination search results"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "display_name": self.display_name,
+            "country": self.country,
+            "type": self.type,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "source": "database"
+        }
+    
+    @classmethod
+    def get_or_create(cls, name, country=None, **kwargs):
+        """
+        Find an existing destination by name and country or create a new one.
+        
+        Args:
+            name: The destination name
+            country: Optional country name
+            **kwargs: Additional attributes for the destination
+            
+        Returns:
+            Destination object
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        logger.info(f"Destination.get_or_create called for: {name}")
+        if country:
+            logger.info(f"Country: {country}")
+            destination = cls.query.filter(
+                cls.normalized_name == normalize_text(name),
+                db.func.lower(cls.country) == db.func.lower(country)
+            ).first()
+        else:
+            destination = cls.query.filter(
+                cls.normalized_name == normalize_text(name)
+            ).first()
+        
+        if destination:
+            logger.info(f"Found existing destination: {destination.name}")
+            return destination
+            
+        # Check if we have a Google Place ID and try to find by that
+        google_place_id = kwargs.get('google_place_id')
+        if google_place_id:
+            logger.info(f"Searching by provided place_id: {google_place_id}")
+            destination = cls.query.filter_by(google_place_id=google_place_id).first()
+            if destination:
+                logger.info(f"Found existing destination with place_id: {destination.name}")
+                return destination
+        
+        # If no destination found, create a new one
+        logger.info(f"Creating new destination for: {name}")
+        display_name = kwargs.pop('display_name', name)
+        if country and not display_name.endswith(country):
+            display_name = f"{name}, {country}"
+            
+        destination = cls(
+            name=name,
+            display_name=display_name,
+            country=country,
+            **kwargs
+        )
+        db.session.add(destination)
+        db.session.commit()
+        
+        logger.info(f"Created new destination: {name} (ID: {destination.id})")
+        return destination
+
+# Keep the search index in step with the destinations table
+destination_search.install(Destination.__table__)
+
+class DestinationSuggestion(db.Model):
+    """
+    AI destination suggestions for a normalized destination query, shared by
+    every trip created for it instead of each trip storing its own copy.
+    Linked to the matching Destination row when there is one. Entries older
+    than DESTINATION_SUGGESTIONS_MAX_AGE_DAYS are refreshed by a background job.
+    """
+    __tablename__ = 'destination_suggestions'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    normalized_query = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    query = db.Column(db.String(255), nullable=False)  # As first entered, used for refreshes
+    destination_id = db.Column(db.Integer, db.ForeignKey('destinations.id'), nullable=True, index=True)
+    suggestions = db.Column(db.JSON, nullable=False)  # Same shape as AIService.get_destination_suggestions
+    
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+    refresh_requested_at = db.Column(db.DateTime, nullable=True)  # Set while a refresh job is pending
+    
+    destination = db.relationship('Destination', backref='suggestions', lazy=True)
+    trips = db.relationship('Trip', backref='destination_suggestion', lazy=True)
+    
+    def __repr__(self):
+        return f'<DestinationSuggestion {self.normalized_query}>'
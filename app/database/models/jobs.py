@@ -0,0 +1,31 @@
+from datetime import datetime
+from app.database import db
+
+class BackgroundJob(db.Model):
+    """
+    Unit of work handed from the web process to the job worker (e.g. AI
+    extraction of a recommender's text). Jobs are claimed by flipping status
+    from queued to running in a single UPDATE, so any number of workers can
+    poll the same table. Clients follow a job by its token, not its id.
+    """
+    __tablename__ = 'background_jobs'
+    __table_args__ = (
+        db.Index('ix_background_jobs_status_id', 'status', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(32), unique=True, nullable=False, index=True)
+    kind = db.Column(db.String(100), nullable=False)  # Registered handler name
+    payload = db.Column(db.JSON, nullable=True)  # Handler arguments
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    progress = db.Column(db.JSON, nullable=True)  # Partial result reported while running
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    locked_by = db.Column(db.String(255), nullable=True)  # Worker that claimed the job
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<BackgroundJob {self.id} {self.kind} {self.status}>'
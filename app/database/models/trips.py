@@ -0,0 +1,105 @@
+from datetime import datetime
+from slugify import slugify
+from app.database import db
+
+class Trip(db.Model):
+    __tablename__ = 'trips'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    destination = db.Column(db.String(255), nullable=False)
+    traveler_name = db.Column(db.String(100), nullable=True)
+    share_token = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    slug = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # New fields for destination information
+    destination_info = db.Column(db.JSON, nullable=True)
+    destination_display_name = db.Column(db.String(255), nullable=True)
+    destination_country = db.Column(db.String(100), nullable=True)
+    
+    # New foreign key to Destination model (nullable for backward compatibility)
+    destination_id = db.Column(db.Integer, db.ForeignKey('destinations.id'), nullable=True)
+    # Shared AI suggestions for the destination; destination_info is only set on older trips
+    destination_suggestion_id = db.Column(db.Integer, db.ForeignKey('destination_suggestions.id'), nullable=True, index=True)
+    
+    # Denormalized summary, maintained by app.database.trip_counters on every flush
+    recommendation_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    activity_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    contributor_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_recommendation_at = db.Column(db.DateTime, nullable=True)
+    content_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped with the counters; keys rendered-page caches
+    
+    recommendations = db.relationship('Recommendation', backref='trip', lazy=True, cascade='all, delete-orphan')
+    subscriptions = db.relationship('TripSubscription', backref='trip', lazy=True, cascade='all, delete-orphan')
+    
+    def __repr__(self):
+        return f'<Trip {self.destination}>'
+    
+    @staticmethod
+    def generate_slug(destination, traveler_name, created_at=None):
+        """Generate a URL-friendly slug for the trip"""
+        if not created_at:
+            created_at = datetime.utcnow()
+            
+        # Get month and year
+        month = created_at.strftime('%b').lower()
+        year = created_at.strftime('%Y')
+        
+        # Create base slug
+        base_slug = f"{destination.lower()}-{month}-{year}"
+        
+        # Slugify to handle special characters and spaces
+        return slugify(base_slug)
+        
+    @property
+    def destination_details(self):
+        """Destination suggestions for the info card, from the shared entry or this trip's own copy"""
+        if self.destination_suggestion_id is not None and self.destination_suggestion is not None:
+            return self.destination_suggestion.suggestions
+        return self.destination_info
+        
+    @property
+    def unique_activity_count(self):
+        """Returns the count of unique activities recommended for this trip"""
+        return self.activity_count
+
+class Recommendation(db.Model):
+    """
+    A recommendation is a user's endorsement of an activity for a specific trip.
+    It contains the user's personal comments about the activity.
+    """
+    __tablename__ = 'recommendations'
+    __table_args__ = (db.Index('ix_recommendations_trip_id_activity_id', 'trip_id', 'activity_id'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    activity_id = db.Column(db.Integer, db.ForeignKey('activities.id'), nullable=False)
+    description = db.Column(db.Text, nullable=True)  # Personal notes/comments about the activity
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trips.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Recommendation for {self.activity.name if self.activity else "Unknown"}>'
+
+class TripSubscription(db.Model):
+    """
+    Tracks user subscriptions to trip notifications.
+    When a user wants to be notified about updates to a trip,
+    such as when all recommendations are submitted.
+    """
+    __tablename__ = 'trip_subscriptions'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trips.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    notified = db.Column(db.Boolean, default=False)  # Track if we've sent a notification
+    
+    # Add a unique constraint to prevent duplicate subscriptions
+    __table_args__ = (db.UniqueConstraint('user_id', 'trip_id', name='uix_user_trip_subscription'),)
+    
+    def __repr__(self):
+        return f'<TripSubscription User {self.user_id} for Trip {self.trip_id}>'
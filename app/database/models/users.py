@@ -0,0 +1,91 @@
+from datetime import datetime
+from app.database import db
+
+class User(db.Model):
+    __tablename__ = 'users'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    name = db.Column(db.String(80), nullable=True)
+    password = db.Column(db.String(128), nullable=True)  # Make password nullable since we're using passwordless auth
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_login_at = db.Column(db.DateTime, nullable=True)
+    
+    posts = db.relationship('Post', backref='author', lazy=True)
+    auth_tokens = db.relationship('AuthToken', backref='user', lazy=True, cascade='all, delete-orphan')
+    trips = db.relationship('Trip', backref='user', lazy=True)
+    recommendations = db.relationship('Recommendation', backref='author', lazy=True)
+    trip_subscriptions = db.relationship('TripSubscription', backref='user', lazy=True, cascade='all, delete-orphan')
+    
+    def __repr__(self):
+        return f'<User {self.email}>'
+    
+    @classmethod
+    def get_or_create(cls, email, name=None):
+        """
+        Get an existing user or create a new one if not exists.
+        If name is provided and user exists without a name, update the name.
+        
+        Args:
+            email: User's email address
+            name: Optional name to set or update
+            
+        Returns:
+            User object and a boolean indicating if the user was created
+        """
+        user = cls.query.filter_by(email=email).first()
+        created = False
+        
+        if not user:
+            # Create new user
+            user = cls(email=email, name=name)
+            db.session.add(user)
+            db.session.commit()
+            created = True
+        elif name and not user.name:
+            # Update name if it was null
+            user.name = name
+            db.session.commit()
+        
+        return user, created
+
+class AuthToken(db.Model):
+    __tablename__ = 'auth_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    used = db.Column(db.Boolean, default=False)
+    
+    def __repr__(self):
+        return f'<AuthToken {self.token[:8]}...>'
+    
+    @property
+    def is_expired(self):
+        """Check if the token has expired"""
+        return datetime.utcnow() > self.expires_at
+    
+    @classmethod
+    def get_valid_token(cls, token_string):
+        """Get a valid token by string"""
+        token = cls.query.filter_by(token=token_string, used=False).first()
+        if token and not token.is_expired:
+            return token
+        return None
+
+class Post(db.Model):
+    __tablename__ = 'posts'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(255), nullable=False)
+    content = db.Column(db.Text, nullable=True)
+    published = db.Column(db.Boolean, default=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Post {self.title}>'
@@ -0,0 +1,166 @@
+"""
+Destination search index
+
+Destination name search backed by a real index instead of ILIKE '%q%' scans:
+pg_trgm GIN indexes on PostgreSQL, and an FTS5 shadow table kept in sync by
+triggers on SQLite. The DDL is attached to the destinations table so
+create_all builds it; migrations create it for existing databases.
+"""
+import logging
+
+from sqlalchemy import DDL, event, text
+
+from app.database import db
+from app.services.normalization import normalize_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'destinations_fts'
+
+# Columns indexed for search, in bm25 weight order
+SEARCH_COLUMNS = ('name', 'display_name', 'country')
+FTS_COLUMN_WEIGHTS = (10.0, 5.0, 1.0)
+
+SQLITE_CREATE_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, display_name, country,
+        content='destinations', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON destinations BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, display_name, country)
+        VALUES (new.id, new.name, new.display_name, new.country);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON destinations BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, display_name, country)
+        VALUES ('delete', old.id, old.name, old.display_name, old.country);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, display_name, country ON destinations BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, display_name, country)
+        VALUES ('delete', old.id, old.name, old.display_name, old.country);
+        INSERT INTO {FTS_TABLE}(rowid, name, display_name, country)
+        VALUES (new.id, new.name, new.display_name, new.country);
+    END
+    """,
+)
+
+SQLITE_DROP_DDL = (f"DROP TABLE IF EXISTS {FTS_TABLE}",)
+
+POSTGRES_CREATE_DDL = ("CREATE EXTENSION IF NOT EXISTS pg_trgm",) + tuple(
+    f"CREATE INDEX IF NOT EXISTS ix_destinations_{column}_trgm ON destinations USING gin ({column} gin_trgm_ops)"
+    for column in SEARCH_COLUMNS
+)
+
+def install(table):
+    """
+    Attach the search index DDL to the destinations table so that
+    create_all / drop_all build and remove it for the active dialect
+
+    Args:
+        table: The destinations Table
+    """
+    for statement in SQLITE_CREATE_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    for statement in SQLITE_DROP_DDL:
+        event.listen(table, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+    for statement in POSTGRES_CREATE_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+def search_ids(query, limit):
+    """
+    Find destination ids matching a query, best match first
+
+    Args:
+        query (str): The search text
+        limit (int): Maximum number of ids to return
+
+    Returns:
+        list: Destination ids in rank order, or None if the dialect has no
+        search index available (the caller should fall back to ILIKE)
+    """
+    dialect = db.engine.dialect.name
+    if not _index_available(dialect):
+        return None
+
+    if dialect == 'sqlite':
+        return _search_ids_fts(query, limit)
+    return _search_ids_trigram(query, limit)
+
+# Engines known to have the index; only positives are remembered so a
+# migration run while the app is up is picked up on the next search
+_available_engines = set()
+
+def _index_available(dialect):
+    engine_key = str(db.engine.url)
+    if engine_key in _available_engines:
+        return True
+
+    if dialect == 'sqlite':
+        check = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+        params = {'name': FTS_TABLE}
+    elif dialect == 'postgresql':
+        check = text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        params = {}
+    else:
+        return False
+
+    try:
+        with db.engine.connect() as conn:
+            available = conn.execute(check, params).first() is not None
+    except Exception as e:
+        logger.warning(f"Could not check for the destination search index: {str(e)}")
+        return False
+
+    if available:
+        _available_engines.add(engine_key)
+    else:
+        logger.warning(f"Destination search index missing on {dialect}; falling back to ILIKE")
+    return available
+
+def _search_ids_fts(query, limit):
+    tokens = normalize_text(query).split()
+    if not tokens:
+        return []
+
+    # Every token must match, the last one (still being typed) as a prefix
+    match = ' '.join(f'"{token}"' for token in tokens[:-1])
+    match = f'{match} "{tokens[-1]}"*'.strip()
+    weights = ', '.join(str(weight) for weight in FTS_COLUMN_WEIGHTS)
+
+    rows = db.session.execute(text(f"""
+        SELECT d.id
+        FROM {FTS_TABLE}
+        JOIN destinations d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :match
+        ORDER BY lower(d.name) = :exact DESC,
+                 bm25({FTS_TABLE}, {weights}),
+                 d.travel_popularity DESC
+        LIMIT :limit
+    """), {'match': match, 'exact': query.strip().lower(), 'limit': limit})
+    return [row.id for row in rows]
+
+def _search_ids_trigram(query, limit):
+    query = query.strip()
+    if not query:
+        return []
+
+    # The trigram GIN indexes serve ILIKE '%q%' directly; escape LIKE wildcards
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    rows = db.session.execute(text("""
+        SELECT id
+        FROM destinations
+        WHERE name ILIKE :pattern OR display_name ILIKE :pattern OR country ILIKE :pattern
+        ORDER BY lower(name) = lower(:query) DESC,
+                 similarity(name, :query) DESC,
+                 travel_popularity DESC NULLS LAST
+        LIMIT :limit
+    """), {'pattern': f'%{escaped}%', 'query': query, 'limit': limit})
+    return [row.id for row in rows]
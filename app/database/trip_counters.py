@@ -0,0 +1,113 @@
+"""
+Trip summary counters
+
+Trips carry denormalized recommendation, activity and contributor counts
+plus the time of their latest recommendation, so list pages can render
+from the trips table alone. Whenever a flush inserts, moves or deletes
+recommendations, the affected trips' counters are recomputed from the
+recommendations table in the same transaction, so they commit (or roll
+back) together with the rows they describe. Each refresh also bumps the
+trip's content_version, which keys caches of the rendered trip page.
+
+Bulk query.delete()/update() calls bypass the flush; the
+reconcile-trip-counters command repairs any drift that leaves behind.
+"""
+import logging
+
+from sqlalchemy import event, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.database.models import Recommendation, Trip
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = ('recommendation_count', 'activity_count', 'contributor_count', 'last_recommendation_at')
+
+# session.info key holding trip ids whose counters the current flush changed
+_PENDING_KEY = 'trip_counters_pending'
+
+def _counter_values():
+    """Correlated subqueries computing each counter for the trips row being updated"""
+    trips = Trip.__table__
+    recommendations = Recommendation.__table__
+    for_trip = recommendations.c.trip_id == trips.c.id
+
+    def aggregate(expression):
+        return select(expression).where(for_trip).scalar_subquery()
+
+    return {
+        'recommendation_count': aggregate(func.count(recommendations.c.id)),
+        'activity_count': aggregate(func.count(recommendations.c.activity_id.distinct())),
+        'contributor_count': aggregate(func.count(recommendations.c.author_id.distinct())),
+        'last_recommendation_at': aggregate(func.max(recommendations.c.created_at)),
+    }
+
+def refresh_trip_counters(connection, trip_ids):
+    """
+    Recompute the counters of the given trips
+
+    Args:
+        connection: Connection (or session) of the transaction to write in
+        trip_ids (iterable): Ids of the trips to refresh
+    """
+    trip_ids = sorted(set(trip_ids))
+    if not trip_ids:
+        return
+    trips = Trip.__table__
+    connection.execute(
+        update(trips)
+        .where(trips.c.id.in_(trip_ids))
+        .values(content_version=trips.c.content_version + 1, **_counter_values())
+    )
+
+def reconcile_trip_counters(connection):
+    """
+    Repair every trip whose counters disagree with its recommendations
+
+    Args:
+        connection: Connection of the transaction to write in
+
+    Returns:
+        int: Number of trips that were corrected
+    """
+    trips = Trip.__table__
+    values = _counter_values()
+    drifted = or_(*[
+        # IS DISTINCT FROM, so NULL vs a timestamp counts as drift
+        trips.c[column].is_distinct_from(expression) for column, expression in values.items()
+    ])
+    result = connection.execute(
+        update(trips).where(drifted).values(content_version=trips.c.content_version + 1, **values)
+    )
+    logger.info(f"Reconciled counters for {result.rowcount} trips")
+    return result.rowcount
+
+def _mark(target, trip_id):
+    session = inspect(target).session
+    if session is not None and trip_id is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(trip_id)
+
+@event.listens_for(Recommendation, 'after_insert')
+@event.listens_for(Recommendation, 'after_delete')
+def _recommendation_added_or_removed(mapper, connection, target):
+    _mark(target, target.trip_id)
+
+@event.listens_for(Recommendation, 'after_update')
+def _recommendation_updated(mapper, connection, target):
+    history = inspect(target).attrs.trip_id.history
+    for trip_id in list(history.deleted) + [target.trip_id]:
+        _mark(target, trip_id)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _refresh_pending_trips(session, flush_context):
+    trip_ids = session.info.pop(_PENDING_KEY, None)
+    if not trip_ids:
+        return
+
+    refresh_trip_counters(session.connection(), trip_ids)
+
+    # The UPDATE bypassed the ORM; reload counters on trips already in the session
+    for instance in session.identity_map.values():
+        if isinstance(instance, Trip) and instance.id in trip_ids:
+            session.expire(instance, list(COUNTER_COLUMNS) + ['content_version'])
@@ -0,0 +1,250 @@
+"""
+Trip view read model
+
+Loads what the trip page renders - recommendations grouped by activity,
+their authors, and the trip's contributors and categories - with a couple
+of joined queries, instead of lazy loading each recommendation's activity
+and author. Rows are immutable namedtuples so templates can't trigger
+further queries.
+
+Grouped activities are paged with a keyset cursor: groups are ordered by
+their first recommendation's id, and a page continues after the last
+group's first id, so pages stay stable while recommendations are added.
+
+Category and contributor facets, with the number of activities behind
+each, come from one aggregate query and are memoized per trip content
+version.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import String, case, cast, func, literal, select, union_all
+
+from app.database import db
+from app.database.models import Activity, Recommendation, User
+
+ActivityRow = namedtuple('ActivityRow', [
+    'id', 'name', 'category', 'website_url', 'latitude', 'longitude', 'google_place_id'
+])
+AuthorRow = namedtuple('AuthorRow', ['id', 'name', 'email'])
+RecommendationRow = namedtuple('RecommendationRow', ['id', 'description', 'author_id', 'author', 'created_at'])
+ActivityGroup = namedtuple('ActivityGroup', ['activity', 'recommendations'])
+ActivityPage = namedtuple('ActivityPage', ['groups', 'next_cursor'])
+CategoryFacet = namedtuple('CategoryFacet', ['value', 'count'])
+ContributorFacet = namedtuple('ContributorFacet', ['author', 'count'])
+TripFacets = namedtuple('TripFacets', ['categories', 'contributors'])
+TripView = namedtuple('TripView', [
+    'trip', 'groups', 'contributors', 'categories', 'facets', 'recommendation_count', 'next_cursor'
+])
+
+# Authors recorded for recommenders who left no name or email
+ANONYMOUS_EMAIL = 'anonymous@example.com'
+
+# Activities per page, on the trip page and in the activities API
+DEFAULT_PAGE_SIZE = 24
+
+# Facets of recently viewed trips, keyed by trip and content version
+FACET_MEMO_MAX_ENTRIES = 512
+_facet_memo = OrderedDict()
+_facet_memo_lock = threading.Lock()
+
+def load_activity_page(trip, after=None, limit=None, categories=(), contributor_ids=()):
+    """
+    Load one page of the trip's recommendations grouped by activity
+
+    Args:
+        trip: The Trip being viewed
+        after (int, optional): Cursor from the previous page's next_cursor
+        limit (int, optional): Maximum number of activities; all if None
+        categories (iterable): Only activities in these categories
+        contributor_ids (iterable): Only activities recommended by any of these users
+
+    Returns:
+        ActivityPage: groups (ActivityGroup per activity, in order of first
+        recommendation) and next_cursor (None on the last page)
+    """
+    first_id = func.min(Recommendation.id).label('first_id')
+    groups = (
+        select(Recommendation.activity_id, first_id)
+        .where(Recommendation.trip_id == trip.id)
+        .group_by(Recommendation.activity_id)
+        .order_by(first_id)
+    )
+    if categories:
+        groups = groups.join(Activity, Activity.id == Recommendation.activity_id).where(Activity.category.in_(list(categories)))
+    if contributor_ids:
+        by_contributor = case((Recommendation.author_id.in_(list(contributor_ids)), 1), else_=0)
+        groups = groups.having(func.max(by_contributor) == 1)
+    if after is not None:
+        groups = groups.having(first_id > after)
+    if limit is not None:
+        # One extra group tells us whether there is another page
+        groups = groups.limit(limit + 1)
+    groups = groups.subquery()
+
+    rows = db.session.execute(
+        select(
+            groups.c.first_id,
+            Recommendation.id, Recommendation.description, Recommendation.created_at,
+            Activity.id.label('activity_id'), Activity.name, Activity.category, Activity.website_url,
+            Activity.latitude, Activity.longitude, Activity.google_place_id,
+            User.id.label('author_id'), User.name.label('author_name'), User.email.label('author_email')
+        )
+        .select_from(groups)
+        .join(Recommendation, (Recommendation.activity_id == groups.c.activity_id) & (Recommendation.trip_id == trip.id))
+        .join(Activity, Activity.id == Recommendation.activity_id)
+        .join(User, User.id == Recommendation.author_id)
+        .order_by(groups.c.first_id, Recommendation.id)
+    ).all()
+
+    activities = {}
+    grouped = {}
+    authors = {}
+    first_ids = {}
+    for row in rows:
+        author = authors.get(row.author_id)
+        if author is None:
+            author = authors[row.author_id] = AuthorRow(row.author_id, row.author_name, row.author_email)
+
+        if row.activity_id not in activities:
+            activities[row.activity_id] = ActivityRow(
+                row.activity_id, row.name, row.category, row.website_url,
+                row.latitude, row.longitude, row.google_place_id
+            )
+            grouped[row.activity_id] = []
+            first_ids[row.activity_id] = row.first_id
+
+        grouped[row.activity_id].append(
+            RecommendationRow(row.id, row.description, row.author_id, author, row.created_at)
+        )
+
+    groups = [
+        ActivityGroup(activities[activity_id], tuple(recommendations))
+        for activity_id, recommendations in grouped.items()
+    ]
+    next_cursor = None
+    if limit is not None and len(groups) > limit:
+        groups = groups[:limit]
+        next_cursor = first_ids[groups[-1].activity.id]
+
+    return ActivityPage(tuple(groups), next_cursor)
+
+def load_trip_facets(trip):
+    """
+    Count the trip's activities per category and per contributor
+
+    Args:
+        trip: The Trip being viewed
+
+    Returns:
+        TripFacets: categories (CategoryFacet, by value) and contributors
+        (ContributorFacet, by author id), each counting distinct activities
+    """
+    # share_token keeps a reused trip id from matching an old entry
+    memo_key = (trip.id, trip.share_token, trip.content_version)
+    with _facet_memo_lock:
+        facets = _facet_memo.get(memo_key)
+        if facets is not None:
+            _facet_memo.move_to_end(memo_key)
+            return facets
+
+    activity_count = func.count(Recommendation.activity_id.distinct())
+    by_category = (
+        select(
+            literal('category').label('facet'), Activity.category.label('value'),
+            literal(None, String).label('name'), literal(None, String).label('email'),
+            activity_count.label('count')
+        )
+        .select_from(Recommendation)
+        .join(Activity, Activity.id == Recommendation.activity_id)
+        .where(Recommendation.trip_id == trip.id, Activity.category.is_not(None))
+        .group_by(Activity.category)
+    )
+    by_contributor = (
+        select(
+            literal('contributor').label('facet'), cast(User.id, String).label('value'),
+            User.name, User.email,
+            activity_count.label('count')
+        )
+        .select_from(Recommendation)
+        .join(User, User.id == Recommendation.author_id)
+        .where(Recommendation.trip_id == trip.id)
+        .group_by(User.id, User.name, User.email)
+    )
+    rows = db.session.execute(union_all(by_category, by_contributor)).all()
+
+    categories = sorted(
+        (CategoryFacet(row.value, row.count) for row in rows if row.facet == 'category'),
+        key=lambda facet: facet.value
+    )
+    contributors = sorted(
+        (ContributorFacet(AuthorRow(int(row.value), row.name, row.email), row.count)
+         for row in rows if row.facet == 'contributor'),
+        key=lambda facet: facet.author.id
+    )
+    facets = TripFacets(tuple(categories), tuple(contributors))
+
+    with _facet_memo_lock:
+        _facet_memo[memo_key] = facets
+        while len(_facet_memo) > FACET_MEMO_MAX_ENTRIES:
+            _facet_memo.popitem(last=False)
+    return facets
+
+def load_trip_view(trip, limit=None):
+    """
+    Build the trip page's data
+
+    Args:
+        trip: The Trip being viewed
+        limit (int, optional): Number of activities on the first page; all if None
+
+    Returns:
+        TripView: the first page of groups and its next_cursor, contributors
+        (AuthorRow, by id), categories (sorted), their facets and
+        recommendation_count
+    """
+    page = load_activity_page(trip, limit=limit)
+    facets = load_trip_facets(trip)
+
+    return TripView(
+        trip,
+        page.groups,
+        tuple(facet.author for facet in facets.contributors),
+        tuple(facet.value for facet in facets.categories),
+        facets,
+        trip.recommendation_count,
+        page.next_cursor
+    )
+
+def facets_to_dict(facets):
+    """JSON shape of TripFacets for the facets API"""
+    return {
+        'categories': [{'value': facet.value, 'count': facet.count} for facet in facets.categories],
+        'contributors': [
+            {'id': facet.author.id, 'name': author_label(facet.author), 'count': facet.count}
+            for facet in facets.contributors
+        ]
+    }
+
+def author_label(author):
+    """Name shown for a recommender, or None for an anonymous or unnamed one (never their email)"""
+    if author.email == ANONYMOUS_EMAIL:
+        return None
+    return author.name or None
+
+def group_to_dict(group):
+    """Compact JSON shape of an ActivityGroup, shared by the API and the page's first page"""
+    activity = group.activity
+    return {
+        'id': activity.id,
+        'name': activity.name,
+        'category': activity.category,
+        'website_url': activity.website_url,
+        'lat': activity.latitude,
+        'lng': activity.longitude,
+        'place_id': activity.google_place_id,
+        'recommendations': [
+            {'author_id': rec.author_id, 'author': author_label(rec.author), 'description': rec.description}
+            for rec in group.recommendations
+        ]
+    }
@@ -7,6 +7,8 @@ from .misc_routes import misc_bp
 from .testing_routes import testing_bp
 from .admin_routes import admin_bp
 from .destination_routes import destination_bp
+from .trip_api_routes import trip_api_bp
+from .job_api_routes import jobs_bp
 
 def init_app(app):
     """Initialize all route blueprints with the app"""
@@ -17,6 +19,8 @@ def init_app(app):
     app.register_blueprint(audio_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(destination_bp)
+    app.register_blueprint(trip_api_bp)
+    app.register_blueprint(jobs_bp)
     
     # Only register testing routes in development mode
     if app.config.get('FLASK_ENV') != 'production':
@@ -1,7 +1,18 @@
-from flask import Blueprint, render_template
+from flask import Blueprint, render_template, jsonify, current_app
 from app.database.models import Trip, Activity, Recommendation, User
 from sqlalchemy import func
 from app.database import db
+from app.services.destination_suggestion_service import DestinationSuggestionService
+from app.services.extraction_cache import ExtractionCache
+from app.services.fragment_cache import FragmentCache
+from app.services.http_client import client_stats
+from app.services.job_queue import JobQueue
+from app.services.list_parser import ListParser
+from app.services.map_cluster_service import MapClusterService
+from app.services.micro_batch import batch_stats
+from app.services.place_cache_service import PlaceCacheService
+from app.services.rate_limiter import limiter_stats
+from app.services.single_flight import flight_stats
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -31,4 +42,23 @@ def admin_dashboard():
         recommendations=recommendations,
         users=users,
         recommendation_counts=recommendation_counts
-    ) 
\ No newline at end of file
+    ) 
+
+@admin_bp.route('/admin/metrics/')
+def admin_metrics():
+    """Runtime counters for caches and external lookups, as JSON"""
+    destination_index = current_app.extensions.get('destination_index')
+    return jsonify({
+        'place_cache': PlaceCacheService.stats(),
+        'http_clients': client_stats(),
+        'rate_limiters': limiter_stats(),
+        'single_flight': flight_stats(),
+        'destination_index': destination_index.stats() if destination_index else None,
+        'fragment_cache': FragmentCache.stats(),
+        'map_clusters': MapClusterService.stats(),
+        'jobs': JobQueue.stats(),
+        'extraction_cache': ExtractionCache.stats(),
+        'list_parser': ListParser.stats(),
+        'destination_suggestions': DestinationSuggestionService.stats(),
+        'micro_batches': batch_stats()
+    })
@@ -1,7 +1,6 @@
 import os
 import json
 import base64
-import requests
 import traceback
 from datetime import datetime
 from io import BytesIO
@@ -9,6 +8,7 @@ from flask import Blueprint, render_template, redirect, url_for, request, flash,
 from app.database import db
 from app.database.models import Trip
 from app.services.ai_service import AIService
+from app.services.http_client import get_client
 
 audio_bp = Blueprint('audio', __name__)
 
@@ -55,20 +55,13 @@ def transcribe_audio():
         print(f"Using OpenAI API key starting with: {api_key[:8]}...")
         
         # Use OpenAI Whisper API for transcription
-        import requests
-        from io import BytesIO
-        
-        # Create in-memory file-like object
-        audio_file_object = BytesIO(audio_data)
-        audio_file_object.name = audio_file.filename  # Set name for content type detection
-        
         print("Sending request to OpenAI Whisper API (directly from memory)...")
         
-        # Send the request with the in-memory file
-        response = requests.post(
+        # Send the raw bytes rather than a file object so a retry re-sends the full upload
+        response = get_client('openai_audio').post(
             "https://api.openai.com/v1/audio/transcriptions",
             headers={"Authorization": f"Bearer {api_key}"},
-            files={"file": (audio_file.filename, audio_file_object, audio_file.content_type)},
+            files={"file": (audio_file.filename, audio_data, audio_file.content_type)},
             data={"model": "whisper-1"}
         )
         
@@ -2,8 +2,10 @@ import os
 from flask import Blueprint, request, jsonify, render_template, send_from_directory
 from app.database import db
 from app.database.models import Destination
-from app.services.google_places_service import GooglePlacesService
+from app.services.google_places_destinations import GooglePlacesDestinations
 from app.services.openstreetmap_service import OpenStreetMapService
+from app.services.destination_search_service import DestinationSearchService
+from app.services.destination_index import search_destinations
 import logging
 
 # Set up logger
@@ -33,30 +35,10 @@ def search_destinations_database():
     
     logger.info(f"Searching for destinations matching: '{query}'")
     
-    # Perform case-insensitive search on name, display_name, and country
-    destinations = Destination.query.filter(
-        db.or_(
-            Destination.name.ilike(f"%{query}%"),
-            Destination.display_name.ilike(f"%{query}%"),
-            Destination.country.ilike(f"%{query}%")
-        )
-    ).limit(10).all()
-    
-    logger.info(f"Found {len(destinations)} matching destinations")
-    
-    # Format the results
-    results = []
-    for dest in destinations:
-        results.append({
-            "id": dest.id,
-            "name": dest.name,
-            "display_name": dest.display_name,
-            "country": dest.country,
-            "type": dest.type,
-            "latitude": dest.latitude,
-            "longitude": dest.longitude,
-            "source": "database"
-        })
+    # Answered from the in-memory index, falling back to the database
+    results = search_destinations(query, limit=10)
+    
+    logger.info(f"Found {len(results)} matching destinations")
     
     return jsonify({
         "status": "success",
@@ -105,7 +87,7 @@ def search_destinations_google_places():
         ]
     else:
         # Use the actual Google Places API
-        results = GooglePlacesService.search_destinations(query)
+        results = GooglePlacesDestinations.search_destinations(query)
     
     logger.info(f"Returning {len(results)} Google Places API results")
     
@@ -165,6 +147,40 @@ def search_destinations_openstreetmap():
         "results": results
     }), 200
 
+@destination_bp.route('/api/destinations/search/', methods=['GET'])
+def search_destinations_federated():
+    """
+    API endpoint to search all destination sources in one request
+    Queries the database, Google Places and OpenStreetMap in parallel on the
+    server and returns one deduplicated, ranked result list
+    """
+    logger.info("=== FEDERATED DESTINATION SEARCH API CALLED ===")
+    
+    # Get query parameter
+    query = request.args.get('query', '').strip()
+    
+    if not query or len(query) < 2:
+        logger.info(f"Search rejected - query too short: '{query}'")
+        return jsonify({
+            "status": "error",
+            "message": "Query must be at least 2 characters",
+            "results": []
+        }), 400
+    
+    # Optional comma-separated subset of sources and result limit
+    sources = [source for source in request.args.get('sources', '').split(',') if source] or None
+    limit = request.args.get('limit', DestinationSearchService.DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), DestinationSearchService.MAX_LIMIT)
+    
+    logger.info(f"Searching all sources for destinations matching: '{query}'")
+    search = DestinationSearchService.search(query, sources=sources, limit=limit)
+    
+    return jsonify({
+        "status": "success",
+        "results": search['results'],
+        "sources": search['sources']
+    }), 200
+
 @destination_bp.route('/destination-search-test')
 def destination_search_test():
     """
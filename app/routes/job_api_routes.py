@@ -0,0 +1,118 @@
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from app.services.ai_service import AIService
+from app.services.job_queue import JobQueue, FINISHED
+import json
+import logging
+import threading
+import time
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Create blueprint
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+EVENT_POLL_SECONDS = 0.25
+
+@JobQueue.handler('extract_recommendations')
+def extract_recommendations_job(payload):
+    """Background job wrapper for AIService.extract_recommendations"""
+    if not current_app.config.get('EXTRACTION_STREAMING', True):
+        return AIService.extract_recommendations(payload['text'], payload['destination'])
+
+    # Publish each recommendation as it streams in so the waiting page can show it;
+    # long texts are extracted in parallel chunks, so items can come from several threads
+    report = JobQueue.progress_reporter()
+    streamed = []
+    lock = threading.Lock()
+    def on_item(item):
+        with lock:
+            streamed.append(item)
+            report(list(streamed))
+
+    return AIService.extract_recommendations(payload['text'], payload['destination'], on_item=on_item)
+
+@jobs_bp.route('/<token>/', methods=['GET'])
+def job_status(token):
+    """
+    API endpoint with a background job's status, for polling
+
+    Query parameters:
+        since: number of progress items the client already has; the
+            response's progress holds only the ones after it
+
+    The waiting page falls back to polling this when it can't use the
+    event stream below.
+    """
+    job = JobQueue.get(token)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+
+    since = max(request.args.get('since', 0, type=int), 0)
+    data = _job_to_dict(job)
+    data['progress'] = job['progress'][since:] if isinstance(job['progress'], list) else []
+
+    response = jsonify(data)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+def _job_to_dict(job):
+    """Public view of a job; final results and errors stay on the server"""
+    return {
+        "status": job['status'],
+        "done": job['status'] in FINISHED,
+        "position": job['position'],
+        "attempts": job['attempts'],
+        "items": len(job['progress']) if isinstance(job['progress'], list) else 0
+    }
+
+@jobs_bp.route('/<token>/events/', methods=['GET'])
+def job_events(token):
+    """
+    Server-sent events stream of a background job's status
+
+    Sends a 'status' event whenever the job's status or queue position
+    changes, and an 'item' event (with the item's index as the event id)
+    for each partial result the job reports. A stream holds one of the web
+    service's few gunicorn threads, so it is closed after
+    JOB_EVENTS_MAX_SECONDS; EventSource then reconnects and resumes after
+    Last-Event-ID (or the since query parameter on a first connection).
+    If the job was retried and its progress started over, a 'reset' event
+    restarts the numbering. The stream ends once the job has finished.
+    """
+    if JobQueue.get(token) is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+
+    since = request.headers.get('Last-Event-ID', request.args.get('since', '0'))
+    sent_items = int(since) if since.isdigit() else 0
+    max_seconds = current_app.config.get('JOB_EVENTS_MAX_SECONDS', 20)
+
+    def stream():
+        yield 'retry: 1000\n\n'
+        items = sent_items
+        last = None
+        deadline = time.monotonic() + max_seconds
+        while True:
+            job = JobQueue.get(token)
+            if job is None:
+                return
+            progress = job['progress'] if isinstance(job['progress'], list) else []
+            if len(progress) < items:
+                items = 0
+                yield 'id: 0\nevent: reset\ndata: {}\n\n'
+            for item in progress[items:]:
+                items += 1
+                yield f"id: {items}\nevent: item\ndata: {json.dumps(item)}\n\n"
+            data = _job_to_dict(job)
+            if data != last:
+                yield f"event: status\ndata: {json.dumps(data)}\n\n"
+                last = data
+            if job['status'] in FINISHED or time.monotonic() >= deadline:
+                return
+            time.sleep(EVENT_POLL_SECONDS)
+
+    response = Response(stream_with_context(stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-store'
+    # Stop proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
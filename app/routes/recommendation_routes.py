@@ -1,8 +1,9 @@
 import uuid
-from flask import Blueprint, render_template, redirect, url_for, request, flash, session, jsonify
+from flask import Blueprint, render_template, redirect, url_for, request, flash, session, jsonify, abort
 from app.database import db
 from app.database.models import User, Trip, Recommendation, Activity, TripSubscription
 from app.services.ai_service import AIService
+from app.services.job_queue import JobQueue
 import logging
 import traceback
 
@@ -32,51 +33,84 @@ def process_recommendation(slug):
         flash('Please add at least one recommendation', 'error')
         return redirect(url_for('recommendation.add_recommendation', slug=slug))
     
+    # Ensure trip_mode is explicitly passed from session
+    trip_mode = session.get('trip_mode', 'request_mode')
+    logger.info(f"TRIP MODE IN process_recommendation: '{trip_mode}'")
+    
+    # Store trip_mode in session again to ensure it persists
+    session['trip_mode'] = trip_mode
+    session.modified = True
+    logger.info(f"Re-stored trip_mode in session: '{trip_mode}', session modified flag set")
+    
+    # Get user_id to help determine if user is authenticated
+    user_id = session.get('user_id')
+    recommender_name = request.form.get('recommender_name', '').strip()
+    
+    logger.info(f"User ID: {user_id}, Recommender name: {recommender_name}")
+    
+    # For create_mode and authenticated users, pre-populate recommender_name
+    if trip_mode == 'create_mode' and user_id and not recommender_name:
+        user = User.query.get(user_id)
+        if user and user.name:
+            recommender_name = user.name
+            logger.info(f"Pre-populating recommender_name with '{recommender_name}' for create_mode user {user_id}")
+    
     try:
-        # Use AI service to extract structured recommendations
-        recommendations = AIService.extract_recommendations(unstructured_text, trip.destination)
-        
-        # If no recommendations were extracted, redirect back
-        if not recommendations:
-            flash('We couldn\'t identify any recommendations in your text. Please try again.', 'error')
-            return redirect(url_for('recommendation.add_recommendation', slug=slug))
-        
-        # Ensure trip_mode is explicitly passed from session
-        trip_mode = session.get('trip_mode', 'request_mode')
-        logger.info(f"TRIP MODE IN process_recommendation: '{trip_mode}'")
-        
-        # Store trip_mode in session again to ensure it persists
-        session['trip_mode'] = trip_mode
-        session.modified = True
-        logger.info(f"Re-stored trip_mode in session: '{trip_mode}', session modified flag set")
-        
-        # Get user_id to help determine if user is authenticated
-        user_id = session.get('user_id')
-        recommender_name = request.form.get('recommender_name', '').strip()
-        
-        logger.info(f"User ID: {user_id}, Recommender name: {recommender_name}")
-        
-        # For create_mode and authenticated users, pre-populate recommender_name
-        if trip_mode == 'create_mode' and user_id and not recommender_name:
-            user = User.query.get(user_id)
-            if user and user.name:
-                recommender_name = user.name
-                logger.info(f"Pre-populating recommender_name with '{recommender_name}' for create_mode user {user_id}")
-            
-        logger.info(f"Rendering confirm_recommendations.html with trip_mode='{trip_mode}'")
+        # Extraction is slow, so it runs as a background job; the status page
+        # below waits for it and then shows the confirmation form
+        token = JobQueue.enqueue('extract_recommendations', {
+            'text': unstructured_text,
+            'destination': trip.destination,
+            'trip_id': trip.id,
+            'recommender_name': recommender_name
+        })
+    except Exception as e:
+        logger.error(f"Error queueing recommendation extraction: {str(e)}")
+        logger.error(f"Exception traceback: {traceback.format_exc()}")
+        flash('There was an error processing your recommendations. Please try again.', 'error')
+        return redirect(url_for('recommendation.add_recommendation', slug=slug))
+    
+    logger.info(f"Queued extraction job {token} for trip {slug}")
+    return redirect(url_for('recommendation.confirm_recommendations', slug=slug, token=token))
+
+@recommendation_bp.route('/trip/<slug>/process/<token>/', methods=['GET'])
+def confirm_recommendations(slug, token):
+    """Wait for an extraction job, then show its recommendations for confirmation"""
+    trip = Trip.query.filter_by(slug=slug).first_or_404()
+    job = JobQueue.get(token)
+    if job is None or job['kind'] != 'extract_recommendations' or (job['payload'] or {}).get('trip_id') != trip.id:
+        abort(404)
+    
+    if job['status'] in ('queued', 'running'):
         return render_template(
-            'confirm_recommendations.html',
+            'processing_recommendations.html',
             trip=trip,
-            extracted_recommendations=recommendations,
-            recommender_name=recommender_name,
-            trip_mode=trip_mode,  # Explicitly pass trip_mode
-            user_authenticated=bool(user_id)  # Pass authentication status
+            status_url=url_for('jobs.job_status', token=token),
+            events_url=url_for('jobs.job_events', token=token)
         )
-    except Exception as e:
-        logger.error(f"Error processing recommendations: {str(e)}")
-        logger.error(f"Exception traceback: {traceback.format_exc()}")
+    
+    if job['status'] == 'failed':
+        logger.error(f"Extraction job {token} failed: {job['error']}")
         flash('There was an error processing your recommendations. Please try again.', 'error')
         return redirect(url_for('recommendation.add_recommendation', slug=slug))
+    
+    recommendations = job['result']
+    
+    # If no recommendations were extracted, redirect back
+    if not recommendations:
+        flash('We couldn\'t identify any recommendations in your text. Please try again.', 'error')
+        return redirect(url_for('recommendation.add_recommendation', slug=slug))
+    
+    trip_mode = session.get('trip_mode', 'request_mode')
+    logger.info(f"Rendering confirm_recommendations.html with trip_mode='{trip_mode}'")
+    return render_template(
+        'confirm_recommendations.html',
+        trip=trip,
+        extracted_recommendations=recommendations,
+        recommender_name=job['payload'].get('recommender_name', ''),
+        trip_mode=trip_mode,  # Explicitly pass trip_mode
+        user_authenticated=bool(session.get('user_id'))  # Pass authentication status
+    )
 
 @recommendation_bp.route('/trip/<slug>/save/', methods=['POST'])
 def save_recommendations(slug):
@@ -134,14 +168,35 @@ def save_recommendations(slug):
             flash('Please provide your name', 'error')
             return redirect(url_for('recommendation.process_recommendation', slug=slug))
         
-        # If not logged in, use the anonymous user or create temporary user
+        # Get destination context for better Google Places API matching
+        destination_context = {}
+        if trip.destination_display_name:
+            destination_context['search_vicinity'] = trip.destination_display_name
+        if trip.destination_country:
+            destination_context['destination_country'] = trip.destination_country
+        
+        logger.info(f"Using destination context: {destination_context}")
+        
+        # Find or create the Activities for all valid indices in one batch
+        activities = Activity.resolve_many(
+            [{
+                'name': recommendations[i],
+                'category': place_types[i] if i < len(place_types) and place_types[i] else None,
+                'website_url': website_urls[i] if i < len(website_urls) and website_urls[i] else None
+            } for i in valid_indices],
+            **destination_context  # Pass destination context to improve Google Places matching
+        )
+        
+        # If not logged in, use the anonymous user or create temporary user. This
+        # comes after the place lookups: once the user is flushed this session
+        # holds SQLite's write lock, and the place cache writes on its own connection
         if not user_id:
             # If the recommender provided a name, create a temporary user with that name
             if recommender_name:
                 temp_email = f"temp_{uuid.uuid4().hex[:8]}@example.com"
                 temp_user = User(email=temp_email, name=recommender_name)
                 db.session.add(temp_user)
-                db.session.commit()
+                db.session.flush()
                 user_id = temp_user.id
                 logger.info(f"Created temporary user '{recommender_name}' with ID {user_id}")
             else:
@@ -154,29 +209,10 @@ def save_recommendations(slug):
                 user_id = anon_user.id
                 logger.info(f"Using anonymous user with ID {user_id}")
         
-        # Get destination context for better Google Places API matching
-        destination_context = {}
-        if trip.destination_display_name:
-            destination_context['search_vicinity'] = trip.destination_display_name
-        if trip.destination_country:
-            destination_context['destination_country'] = trip.destination_country
-        
-        logger.info(f"Using destination context: {destination_context}")
-        
         # Create recommendations - only for valid indices
         created_recommendations = []
-        for i in valid_indices:
+        for i, activity in zip(valid_indices, activities):
             rec_name = recommendations[i]
-            logger.info(f"Processing recommendation: {rec_name}")
-            
-            # First find or create the Activity
-            activity = Activity.get_or_create(
-                name=rec_name,
-                category=place_types[i] if i < len(place_types) and place_types[i] else None,
-                website_url=website_urls[i] if i < len(website_urls) and website_urls[i] else None,
-                **destination_context  # Pass destination context to improve Google Places matching
-            )
-            
             logger.info(f"Activity for '{rec_name}': ID={activity.id}, place_id={activity.google_place_id or 'None'}")
             
             # Then create the Recommendation which links this Activity to the Trip
@@ -190,6 +226,7 @@ def save_recommendations(slug):
             db.session.add(recommendation)
             created_recommendations.append(recommendation)
         
+        # One commit for the activities, recommendations and any temporary user
         db.session.commit()
         logger.info(f"Saved {len(created_recommendations)} recommendations for trip {slug}")
         
@@ -205,6 +242,8 @@ def save_recommendations(slug):
             logger.info(f"Using REQUEST_MODE redirect to thank you page: {url_for('trip.thank_you_page', slug=trip.slug)}")
             return redirect(url_for('trip.thank_you_page', slug=trip.slug))
     except Exception as e:
+        # Nothing from this submission was committed; discard the flushed rows
+        db.session.rollback()
         logger.error(f"Error saving recommendations: {str(e)}")
         logger.error(f"Exception traceback: {traceback.format_exc()}")
         flash('There was an error saving your recommendations. Please try again.', 'error')
@@ -0,0 +1,119 @@
+import hashlib
+from flask import Blueprint, request, jsonify
+from app.database.models import Trip
+from app.database.trip_view import DEFAULT_PAGE_SIZE, load_activity_page, load_trip_facets, group_to_dict, facets_to_dict
+from app.services.map_cluster_service import MapClusterService
+import logging
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Create blueprint
+trip_api_bp = Blueprint('trip_api', __name__, url_prefix='/api/trips')
+
+MAX_PAGE_SIZE = 100
+
+@trip_api_bp.route('/<slug>/activities/', methods=['GET'])
+def list_trip_activities(slug):
+    """
+    API endpoint listing a trip's recommended activities, grouped by activity
+
+    Query parameters:
+        cursor: next_cursor from the previous page
+        limit: activities per page (default 24, at most 100)
+        category: only these categories (repeatable)
+        contributor: only activities recommended by these user ids (repeatable)
+    """
+    trip = Trip.query.filter_by(slug=slug).first_or_404()
+
+    try:
+        cursor = int(request.args['cursor']) if request.args.get('cursor') else None
+        limit = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        categories, contributor_ids = _filters()
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "cursor, limit and contributor must be integers"
+        }), 400
+
+    page = load_activity_page(
+        trip,
+        after=cursor,
+        limit=limit,
+        categories=categories,
+        contributor_ids=contributor_ids
+    )
+
+    response = jsonify({
+        "status": "success",
+        "activities": [group_to_dict(group) for group in page.groups],
+        "next_cursor": page.next_cursor
+    })
+    return _versioned(response, trip)
+
+@trip_api_bp.route('/<slug>/facets/', methods=['GET'])
+def trip_facets(slug):
+    """
+    API endpoint with the trip's category and contributor filters, each with
+    the number of activities it matches
+    """
+    trip = Trip.query.filter_by(slug=slug).first_or_404()
+
+    response = jsonify({
+        "status": "success",
+        "activity_count": trip.activity_count,
+        **facets_to_dict(load_trip_facets(trip))
+    })
+    return _versioned(response, trip)
+
+@trip_api_bp.route('/<slug>/markers/', methods=['GET'])
+def trip_markers(slug):
+    """
+    API endpoint with the trip's activities as GeoJSON map markers
+
+    Query parameters:
+        zoom: map zoom level; nearby markers are clustered below zoom 17
+        bbox: west,south,east,north of the visible map, to only return what's in view
+        category, contributor: same filters as the activities endpoint
+    """
+    trip = Trip.query.filter_by(slug=slug).first_or_404()
+
+    try:
+        zoom = int(request.args['zoom']) if request.args.get('zoom') else None
+        bbox = None
+        if request.args.get('bbox'):
+            bbox = tuple(float(value) for value in request.args['bbox'].split(','))
+            if len(bbox) != 4:
+                raise ValueError('bbox needs four values')
+        categories, contributor_ids = _filters()
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "zoom and contributor must be integers and bbox west,south,east,north"
+        }), 400
+
+    collection = MapClusterService.markers(
+        trip,
+        zoom=zoom,
+        bbox=bbox,
+        categories=categories,
+        contributor_ids=contributor_ids
+    )
+    response = jsonify(collection)
+    response.mimetype = 'application/geo+json'
+    return _versioned(response, trip)
+
+def _filters():
+    """Category and contributor filters from the query string (ValueError on bad ids)"""
+    categories = [value for value in request.args.getlist('category') if value]
+    contributor_ids = [int(value) for value in request.args.getlist('contributor')]
+    return categories, contributor_ids
+
+def _versioned(response, trip):
+    """Tag a response with the trip's content version so repeat requests get 304s"""
+    # Responses only change when the trip's content does
+    response.set_etag(hashlib.sha256(
+        f"{trip.id}|{trip.content_version}|{request.path}|{request.query_string.decode()}".encode('utf-8')
+    ).hexdigest()[:32])
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
@@ -1,10 +1,14 @@
+import hashlib
 import os
 import uuid
 from datetime import datetime
-from flask import Blueprint, render_template, redirect, url_for, request, flash, session, abort, jsonify
+from flask import Blueprint, render_template, redirect, url_for, request, flash, session, abort, jsonify, g, current_app, make_response
+from werkzeug.http import is_resource_modified
 from app.database import db
 from app.database.models import User, Trip
+from app.database.trip_view import DEFAULT_PAGE_SIZE, author_label, group_to_dict, load_trip_view
 from app.services.ai_service import AIService
+from app.services.fragment_cache import FragmentCache
 
 trip_bp = Blueprint('trip', __name__, url_prefix='/trip')
 
@@ -12,13 +16,65 @@ trip_bp = Blueprint('trip', __name__, url_prefix='/trip')
 def view_trip(slug):
     trip = Trip.query.filter_by(slug=slug).first_or_404()
     
+    # The page depends on the trip's content, its own fields and who is looking
+    # (owner controls, nav), so repeat visits revalidate against all three
+    user_id = g.user.id if g.user else 0
+    # The shared destination info card changes when its suggestions are refreshed
+    suggestions_refreshed_at = trip.destination_suggestion.refreshed_at if trip.destination_suggestion_id else None
+    etag = hashlib.sha256(
+        f"{trip.id}|{trip.content_version}|{trip.updated_at}|{suggestions_refreshed_at}|{user_id}".encode('utf-8')
+    ).hexdigest()[:32]
+    last_modified = max(filter(None, [trip.created_at, trip.updated_at, trip.last_recommendation_at, suggestions_refreshed_at]))
+    
+    # Pending flash messages are rendered into the page, so it can't be a 304
+    if '_flashes' not in session and not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        return _add_validators(response, etag, last_modified)
+    
     # Ensure Google Maps API key is loaded
     api_key = os.environ.get('GOOGLE_MAPS_API_KEY', '')
     if not api_key:
         print("WARNING: GOOGLE_MAPS_API_KEY environment variable is not set!")
     
     config = {'GOOGLE_MAPS_API_KEY': api_key}
-    return render_template('trip.html', trip=trip, config=config)
+    
+    def render_recommendations():
+        # Only the first page of activities is rendered; the rest is fetched
+        # from the activities API as the visitor scrolls
+        trip_view = load_trip_view(trip, limit=DEFAULT_PAGE_SIZE)
+        return render_template(
+            'components/trip/_recommendations_section.html',
+            trip=trip,
+            trip_view=trip_view,
+            first_page=[group_to_dict(group) for group in trip_view.groups],
+            author_label=author_label
+        )
+    
+    # The recommendations list is the same for every visitor until someone adds
+    # to the trip; share_token in the scope keeps a reused id from matching.
+    # The name is bumped when the markup changes so shared entries rendered by
+    # older code aren't served (v2: contributor labels no longer show emails)
+    recommendations_html = FragmentCache.get_or_render(
+        f"trip:{trip.id}:{trip.share_token}",
+        trip.content_version,
+        'recommendations.v2',
+        render_recommendations
+    )
+    response = make_response(render_template(
+        'trip.html',
+        trip=trip,
+        recommendations_html=recommendations_html,
+        config=config
+    ))
+    return _add_validators(response, etag, last_modified)
+
+def _add_validators(response, etag, last_modified):
+    """Attach ETag/Last-Modified and make browsers revalidate before reuse"""
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    # Private: the page varies by the logged-in user
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 @trip_bp.route('/<slug>/thank-you/')
 def thank_you_page(slug):
@@ -2,7 +2,7 @@ import uuid
 from flask import Blueprint, render_template, redirect, url_for, request, flash, session
 from app.database import db
 from app.database.models import User, Trip
-from app.services.ai_service import AIService
+from app.services.destination_suggestion_service import DestinationSuggestionService
 from datetime import datetime
 from flask import current_app
 import logging
@@ -224,9 +224,10 @@ def create_trip_for_user(user, destination, traveler_name):
         slug = f"{base_slug}-{counter}"
         counter += 1
     
-    # Get destination information from OpenAI
+    # Get destination information (shared across trips, from OpenAI on a cache miss)
     try:
-        destinations = AIService.get_destination_suggestions(destination)
+        suggestion = DestinationSuggestionService.get(destination)
+        destinations = suggestion['suggestions'] if suggestion else None
         main_destination = destinations[0] if destinations else None
     except Exception as e:
         # Log the error but continue with trip creation
@@ -244,7 +245,11 @@ def create_trip_for_user(user, destination, traveler_name):
     
     # Add destination information if available
     if main_destination:
-        trip.destination_info = destinations
+        if suggestion['id']:
+            trip.destination_suggestion_id = suggestion['id']
+            trip.destination_id = suggestion['destination_id']
+        else:
+            trip.destination_info = destinations
         trip.destination_display_name = main_destination.get('name')
         trip.destination_country = main_destination.get('country')
     
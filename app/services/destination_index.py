@@ -0,0 +1,258 @@
+"""
+Destination Index
+
+Per-worker in-memory prefix index for destination autocomplete, answering
+/api/destinations/database/ from memory. Nothing is loaded at startup: the
+first search a web worker serves starts a background load, so CLI commands,
+the job worker and tests never hold the index. It is kept fresh by polling
+rows whose updated_at moved since the last refresh, and searches fall back
+to the database until it is ready or when it can't hold every destination.
+
+Loads and refreshes build a new DestinationSnapshot off to the side and
+swap it in with one assignment, so searches never wait on them. The number
+of destinations loaded is capped by DESTINATION_INDEX_MAX_ENTRIES.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import event, func, select
+
+from app.database import db
+from app.database.models import Destination
+from app.services.destination_snapshot import DestinationSnapshot, make_record, to_result
+from app.services.normalization import normalize_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+class DestinationIndex:
+    """In-memory prefix index over destination names for one app"""
+
+    DEFAULT_REFRESH_SECONDS = 30
+    DEFAULT_REBUILD_SECONDS = 3600
+    DEFAULT_MAX_ENTRIES = 50000
+
+    # A refresh that changes more rows than this reloads everything instead
+    INCREMENTAL_MAX_CHANGES = 500
+
+    # Rows are re-read from slightly before the watermark so a row committed
+    # late with an earlier updated_at isn't missed; re-applying is harmless
+    REFRESH_OVERLAP = timedelta(minutes=5)
+
+    # Bumped by mapper events when this process writes a destination
+    _local_generation = 0
+    _generation_lock = threading.Lock()
+
+    def __init__(self, app):
+        self.app = app
+        self.refresh_seconds = app.config.get('DESTINATION_INDEX_REFRESH_SECONDS', self.DEFAULT_REFRESH_SECONDS)
+        self.rebuild_seconds = app.config.get('DESTINATION_INDEX_REBUILD_SECONDS', self.DEFAULT_REBUILD_SECONDS)
+        self.max_entries = app.config.get('DESTINATION_INDEX_MAX_ENTRIES', self.DEFAULT_MAX_ENTRIES)
+
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()  # One load or refresh at a time
+        self._stats_lock = threading.Lock()
+        self._seen_generation = DestinationIndex._local_generation
+        self._last_refresh = float('-inf')
+        self._last_rebuild = 0.0
+        self._stats = {'queries': 0, 'fallbacks': 0, 'refreshes': 0, 'rebuilds': 0, 'errors': 0}
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Create the app's index; it loads on the first search
+
+        Args:
+            app: The Flask app
+
+        Returns:
+            DestinationIndex: The index, also stored in app.extensions, or
+            None when disabled or testing
+        """
+        if not app.config.get('DESTINATION_INDEX_ENABLED', True) or app.testing:
+            return None
+        index = cls(app)
+        app.extensions['destination_index'] = index
+        return index
+
+    def rebuild(self):
+        """Load every destination (up to max_entries) into a fresh snapshot"""
+        started = time.monotonic()
+        generation = DestinationIndex._local_generation
+        table = Destination.__table__
+
+        try:
+            with db.engine.connect() as conn:
+                row_count, max_id = self._table_stats(conn)
+                rows = conn.execute(
+                    self._select_rows()
+                    .order_by(table.c.travel_popularity.desc().nulls_last(),
+                              table.c.population.desc().nulls_last(),
+                              table.c.id)
+                    .limit(self.max_entries)
+                ).all()
+        except Exception as e:
+            logger.warning(f"Could not build destination index: {str(e)}")
+            self._count('errors')
+            self._last_refresh = time.monotonic()
+            return False
+
+        snapshot = DestinationSnapshot.from_rows(rows, row_count, max_id)
+        self._snapshot = snapshot
+        self._seen_generation = generation
+        self._last_refresh = self._last_rebuild = time.monotonic()
+        self._count('rebuilds')
+        logger.info(f"Built destination index: {len(snapshot.records)} destinations, {len(snapshot.keys)} keys "
+                    f"in {int((time.monotonic() - started) * 1000)}ms")
+        return True
+
+    def refresh(self, force=False):
+        """
+        Apply destinations changed since the last refresh
+
+        Runs at most every refresh_seconds unless this process has written
+        destinations since (or force is set). The updated_at feed can't show
+        deletions, so the row count is checked against the loaded count plus
+        the rows the feed shows above the loaded max(id): any difference
+        means rows were deleted (or inserted without an updated_at), and the
+        index is rebuilt instead, as it is when too many rows changed.
+        """
+        if not force and not self._due():
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # Another thread is already refreshing
+        try:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() - self._last_rebuild >= self.rebuild_seconds:
+                self.rebuild()
+                return
+
+            generation = DestinationIndex._local_generation
+            table = Destination.__table__
+            try:
+                with db.engine.connect() as conn:
+                    row_count, max_id = self._table_stats(conn)
+                    query = self._select_rows()
+                    if snapshot.watermark is not None:
+                        query = query.where(table.c.updated_at >= snapshot.watermark - self.REFRESH_OVERLAP)
+                    rows = conn.execute(query).all()
+            except Exception as e:
+                logger.warning(f"Could not refresh destination index: {str(e)}")
+                self._count('errors')
+                self._last_refresh = time.monotonic()
+                return
+
+            inserted = sum(1 for row in rows if row.id > (snapshot.max_id or 0))
+            changed = [record for record in map(make_record, rows)
+                       if snapshot.records.get(record.id) != record]
+            if row_count != snapshot.row_count + inserted or len(changed) > self.INCREMENTAL_MAX_CHANGES:
+                logger.info("Destinations were deleted or changed in bulk; rebuilding destination index")
+                self.rebuild()
+                return
+
+            watermark = max(filter(None, [snapshot.watermark] + [row.updated_at for row in rows]), default=None)
+            self._snapshot = snapshot.with_changes(changed, row_count, max_id, watermark)
+            if changed:
+                logger.info(f"Applied {len(changed)} destination changes to the index")
+            self._seen_generation = generation
+            self._last_refresh = time.monotonic()
+            self._count('refreshes')
+        finally:
+            self._refresh_lock.release()
+
+    def search(self, query, limit=10):
+        """
+        Search the index
+
+        Args:
+            query (str): The search text
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Search result dicts (same shape as Destination.to_search_result),
+            or None if the index can't answer and the database should be used
+        """
+        if self._due() and not self._refresh_lock.locked():
+            threading.Thread(target=self._refresh_in_app, name='destination-index-refresh', daemon=True).start()
+
+        snapshot = self._snapshot
+        normalized = normalize_text(query)
+        if snapshot is None or not normalized:
+            return None
+
+        self._count('queries')
+        records = snapshot.search(normalized, limit)
+
+        # A capped index may be missing matches for sparse queries
+        if not snapshot.complete and len(records) < limit:
+            self._count('fallbacks')
+            return None
+
+        return [to_result(record) for record in records]
+
+    def stats(self):
+        """Return index size and counters"""
+        snapshot = self._snapshot
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            'ready': snapshot is not None,
+            'complete': bool(snapshot and snapshot.complete),
+            'destinations': len(snapshot.records) if snapshot else 0,
+            'keys': len(snapshot.keys) if snapshot else 0,
+        })
+        return stats
+
+    def _due(self):
+        return (self._seen_generation != DestinationIndex._local_generation
+                or time.monotonic() - self._last_refresh >= self.refresh_seconds)
+
+    def _refresh_in_app(self):
+        with self.app.app_context():
+            self.refresh()
+
+    @staticmethod
+    def _table_stats(conn):
+        table = Destination.__table__
+        return tuple(conn.execute(select(func.count(), func.max(table.c.id)).select_from(table)).one())
+
+    @staticmethod
+    def _select_rows():
+        table = Destination.__table__
+        return select(table.c.id, table.c.name, table.c.display_name, table.c.country, table.c.type,
+                      table.c.latitude, table.c.longitude, table.c.travel_popularity, table.c.population,
+                      table.c.updated_at)
+
+    def _count(self, counter):
+        with self._stats_lock:
+            self._stats[counter] += 1
+
+def search_destinations(query, limit=10):
+    """
+    Search destinations from memory, falling back to the database
+
+    Args:
+        query (str): The search text
+        limit (int): Maximum number of results
+
+    Returns:
+        list: Search result dicts
+    """
+    index = current_app.extensions.get('destination_index')
+    if index is not None and current_app.config.get('DESTINATION_INDEX_ENABLED', True):
+        results = index.search(query, limit)
+        if results is not None:
+            return results
+
+    return [destination.to_search_result() for destination in Destination.search(query, limit=limit)]
+
+@event.listens_for(Destination, 'after_insert')
+@event.listens_for(Destination, 'after_update')
+@event.listens_for(Destination, 'after_delete')
+def _destination_changed(mapper, connection, target):
+    # Make this worker's next search start picking up its own writes
+    with DestinationIndex._generation_lock:
+        DestinationIndex._local_generation += 1
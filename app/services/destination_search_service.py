@@ -0,0 +1,173 @@
+"""
+Destination Search Service
+
+Federated destination search: queries our database and Google Places in
+parallel on the server, each under its own deadline, then dedupes and ranks
+the combined results. OpenStreetMap is a fallback for when the database
+finds (almost) nothing. Backs /api/destinations/search/ so
+the browser makes one request per query instead of one per source.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import current_app
+
+from app.services.destination_index import search_destinations as search_database
+from app.services.google_places_destinations import GooglePlacesDestinations
+from app.services.normalization import normalize_text
+from app.services.openstreetmap_service import OpenStreetMapService
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Bounded pool shared by all federated searches in this worker
+_search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='destination-search')
+
+class DestinationSearchService:
+    """Searches all destination sources at once and merges the results"""
+
+    # Sources in priority order: earlier sources win when results are duplicates
+    SOURCES = ('database', 'google_places', 'openstreetmap')
+
+    # Seconds each source may take, measured from the start of the search
+    SOURCE_DEADLINES = {
+        'database': 1.0,
+        'google_places': 3.5,
+        'openstreetmap': 3.0,
+    }
+
+    # External sources also return streets and landmarks; only keep these
+    EXTERNAL_RESULT_TYPES = ('city', 'country')
+
+    DEFAULT_LIMIT = 8
+    MAX_LIMIT = 20
+
+    # OpenStreetMap is only asked when the database has fewer hits than this
+    OSM_FALLBACK_MIN_DATABASE_RESULTS = 3
+
+    @classmethod
+    def search(cls, query, sources=None, limit=DEFAULT_LIMIT):
+        """
+        Search the requested sources in parallel. OpenStreetMap only runs
+        (if OSM_FALLBACK_ENABLED) when the database returns fewer than
+        OSM_FALLBACK_MIN_DATABASE_RESULTS (or limit, if smaller) results.
+
+        Args:
+            query (str): The search query
+            sources (list, optional): Subset of SOURCES to query (defaults to all)
+            limit (int): Maximum number of merged results
+
+        Returns:
+            dict: 'results' (ranked, deduplicated list, each with 'source' and
+            'source_latency_ms') and 'sources' (status, count and latency per source)
+        """
+        sources = [source for source in cls.SOURCES if source in (sources or cls.SOURCES)]
+        app = current_app._get_current_object()
+        started = time.monotonic()
+
+        # OpenStreetMap is rate limited, so it only fills in when local results are nearly empty
+        osm_enabled = 'openstreetmap' in sources and app.config.get('OSM_FALLBACK_ENABLED', True)
+        futures = {
+            source: _search_executor.submit(cls._run_source, app, source, query)
+            for source in sources
+            if source != 'openstreetmap' or (osm_enabled and 'database' not in sources)
+        }
+
+        results_by_source = {}
+        source_stats = {}
+        for source in sources:
+            future = futures.get(source)
+            if future is None:
+                source_stats[source] = {'status': 'skipped', 'count': 0, 'latency_ms': None}
+                continue
+
+            remaining = cls.SOURCE_DEADLINES[source] - (time.monotonic() - started)
+            try:
+                results, elapsed_ms = future.result(timeout=max(remaining, 0))
+            except TimeoutError:
+                future.cancel()
+                logger.warning(f"Destination source {source} missed its {cls.SOURCE_DEADLINES[source]}s deadline for: {query}")
+                source_stats[source] = {'status': 'timeout', 'count': 0, 'latency_ms': None}
+            except Exception as e:
+                logger.error(f"Destination source {source} failed for {query}: {str(e)}")
+                source_stats[source] = {'status': 'error', 'count': 0, 'latency_ms': None}
+            else:
+                for result in results:
+                    result['source_latency_ms'] = elapsed_ms
+                results_by_source[source] = results
+                source_stats[source] = {'status': 'ok', 'count': len(results), 'latency_ms': elapsed_ms}
+
+            osm_threshold = min(limit, cls.OSM_FALLBACK_MIN_DATABASE_RESULTS)
+            if source == 'database' and osm_enabled and len(results_by_source.get('database', [])) < osm_threshold:
+                futures['openstreetmap'] = _search_executor.submit(cls._run_source, app, 'openstreetmap', query)
+
+        merged = cls._rank(query, cls._dedupe(results_by_source, sources))
+        logger.info(f"Federated destination search for '{query}' returned {len(merged)} results from {source_stats}")
+
+        return {
+            'results': merged[:limit],
+            'sources': source_stats
+        }
+
+    @classmethod
+    def _run_source(cls, app, source, query):
+        """Run one source inside an app context and time it"""
+        started = time.monotonic()
+        with app.app_context():
+            if source == 'database':
+                results = search_database(query, limit=10)
+            elif source == 'google_places':
+                results = GooglePlacesDestinations.search_destinations(query)
+            else:
+                results = OpenStreetMapService.search_destinations(query)
+
+        if source != 'database':
+            results = [result for result in results if result.get('type') in cls.EXTERNAL_RESULT_TYPES]
+
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        return results, elapsed_ms
+
+    @staticmethod
+    def _dedupe_keys(result):
+        """Every identity a result can be matched on"""
+        keys = []
+        if result.get('google_place_id'):
+            keys.append(('google_place_id', result['google_place_id']))
+        if result.get('osm_id'):
+            keys.append(('osm_id', str(result['osm_id'])))
+        keys.append(('name', normalize_text(result.get('name')), normalize_text(result.get('country'))))
+        return keys
+
+    @classmethod
+    def _dedupe(cls, results_by_source, sources):
+        """Drop results already seen from a higher-priority source"""
+        seen = set()
+        unique = []
+        for source in sources:
+            for result in results_by_source.get(source, []):
+                keys = cls._dedupe_keys(result)
+                if any(key in seen for key in keys):
+                    continue
+                seen.update(keys)
+                unique.append(result)
+        return unique
+
+    @classmethod
+    def _rank(cls, query, results):
+        """
+        Order results: exact name matches, then name prefix matches, then the
+        rest; ties keep source priority and each source's own order
+        """
+        normalized_query = normalize_text(query)
+
+        def match_rank(result):
+            name = normalize_text(result.get('name'))
+            if name == normalized_query:
+                return 0
+            if name.startswith(normalized_query):
+                return 1
+            return 2
+
+        # sorted() is stable, so the deduped order breaks ties
+        return sorted(results, key=match_rank)
@@ -0,0 +1,162 @@
+"""
+Destination Snapshot
+
+Immutable prefix index over a set of destinations, the data DestinationIndex
+answers searches from. Keys live in a single sorted list with a parallel
+array of destination ids and are searched with bisect. Each destination
+contributes one key per word boundary of its normalized name, display name
+and country, so "yo" finds "New York" and "new yo" does too; keys are
+interned, as many destinations share them. Changes produce a new snapshot
+instead of modifying one that searches may be reading.
+"""
+import bisect
+import copy
+import sys
+from array import array
+from collections import namedtuple
+
+from app.services.normalization import normalize_text
+
+# Compact per-destination record held in memory
+IndexedDestination = namedtuple('IndexedDestination', [
+    'id', 'name', 'display_name', 'country', 'type', 'latitude', 'longitude',
+    'travel_popularity', 'population', 'normalized_name'
+])
+
+class DestinationSnapshot:
+    """Sorted keys, destination records and the table's row count and max id they were loaded against"""
+
+    # Short prefixes match many keys, so answers are memoized until the memo fills up
+    MEMO_MAX_ENTRIES = 2048
+
+    def __init__(self, records, entries, row_count, max_id, watermark):
+        """
+        Args:
+            records (dict): IndexedDestination by id
+            entries (list): (key, id) pairs; sorted in place
+            row_count (int): Destinations in the table when loaded
+            max_id (int): Highest destination id in the table when loaded
+            watermark (datetime): Latest updated_at among the loaded rows
+        """
+        # Mostly-sorted input (an old snapshot plus a few changes) sorts in about linear time
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.ids = array('q', (dest_id for _, dest_id in entries))
+        self.records = records
+        self.row_count = row_count
+        self.max_id = max_id
+        self.complete = len(records) >= row_count
+        self.watermark = watermark
+        self.memo = {}
+
+    @classmethod
+    def from_rows(cls, rows, row_count, max_id):
+        """Build a snapshot from destination rows (id, name, ..., updated_at)"""
+        records = {}
+        entries = []
+        for row in rows:
+            record = make_record(row)
+            records[record.id] = record
+            entries.extend((key, record.id) for key in keys_for(record))
+        watermark = max((row.updated_at for row in rows if row.updated_at), default=None)
+        return cls(records, entries, row_count, max_id, watermark)
+
+    def with_changes(self, changed, row_count, max_id, watermark):
+        """
+        A copy with changed records replaced or added
+
+        Args:
+            changed (list): IndexedDestination records that differ from this snapshot's
+            row_count (int): Destinations in the table now
+            max_id (int): Highest destination id in the table now
+            watermark (datetime): Latest updated_at seen
+
+        Returns:
+            DestinationSnapshot: The new snapshot; this one is left as it was
+        """
+        if not changed:
+            # Same records, so the keys and the memo can be shared
+            snapshot = copy.copy(self)
+            snapshot.row_count = row_count
+            snapshot.max_id = max_id
+            snapshot.complete = len(self.records) >= row_count
+            snapshot.watermark = watermark
+            return snapshot
+
+        changed_ids = {record.id for record in changed}
+        records = dict(self.records)
+        entries = [entry for entry in zip(self.keys, self.ids) if entry[1] not in changed_ids]
+        for record in changed:
+            records[record.id] = record
+            entries.extend((key, record.id) for key in keys_for(record))
+        return DestinationSnapshot(records, entries, row_count, max_id, watermark)
+
+    def search(self, prefix, limit):
+        """
+        Records with a key starting with prefix, best matches first
+
+        Args:
+            prefix (str): Normalized search text
+            limit (int): Maximum number of records
+
+        Returns:
+            list: IndexedDestination records
+        """
+        memo_key = (prefix, limit)
+        records = self.memo.get(memo_key)
+        if records is None:
+            records = self._rank(prefix, self._match(prefix))[:limit]
+            if len(self.memo) >= self.MEMO_MAX_ENTRIES:
+                self.memo.clear()
+            self.memo[memo_key] = records
+        return records
+
+    def _match(self, prefix):
+        ids = set()
+        for position in range(bisect.bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[position].startswith(prefix):
+                break
+            ids.add(self.ids[position])
+        return [self.records[dest_id] for dest_id in ids]
+
+    @staticmethod
+    def _rank(prefix, records):
+        def rank(record):
+            if record.normalized_name == prefix:
+                match = 0
+            elif record.normalized_name.startswith(prefix):
+                match = 1
+            else:
+                match = 2
+            return (match, -(record.travel_popularity or 0), -(record.population or 0), record.normalized_name)
+
+        return sorted(records, key=rank)
+
+def make_record(row):
+    """The in-memory record for a destination row"""
+    return IndexedDestination(
+        row.id, row.name, row.display_name, row.country, row.type, row.latitude, row.longitude,
+        row.travel_popularity, row.population, normalize_text(row.name)
+    )
+
+def keys_for(record):
+    """Every word-boundary suffix of the record's normalized name, display name and country"""
+    keys = set()
+    for value in (record.normalized_name, normalize_text(record.display_name), normalize_text(record.country)):
+        words = value.split()
+        for i in range(len(words)):
+            keys.add(sys.intern(' '.join(words[i:])))
+    return keys
+
+def to_result(record):
+    """Search result dict for a record, same shape as Destination.to_search_result"""
+    return {
+        "id": record.id,
+        "name": record.name,
+        "display_name": record.display_name,
+        "country": record.country,
+        "type": record.type,
+        "latitude": record.latitude,
+        "longitude": record.longitude,
+        "source": "database"
+    }
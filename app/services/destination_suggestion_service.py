@@ -0,0 +1,213 @@
+"""
+Destination Suggestion Service
+
+Shared cache for AI destination suggestions, one destination_suggestions
+row per normalized query, so popular destinations are only asked about
+once. Trips reference the row instead of keeping their own copy. Entries
+older than DESTINATION_SUGGESTIONS_MAX_AGE_DAYS are still served, while a
+background job fetches fresh suggestions; without a job worker (an inline
+JobQueue) they are served as they are. Cache reads and writes run on
+their own connection so they never commit or roll back the caller's
+session.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import insert, select, update
+
+from app.database import db
+from app.database.models import Destination, DestinationSuggestion
+from app.services.ai_service import AIService, FALLBACK_DESTINATION_DESCRIPTION
+from app.services.job_queue import JobQueue
+from app.services.normalization import normalize_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+suggestions_table = DestinationSuggestion.__table__
+
+class DestinationSuggestionService:
+    """Get destination suggestions from the shared cache, asking OpenAI on a miss"""
+
+    DEFAULT_MAX_AGE_DAYS = 30
+    # A refresh that hasn't finished in this long is requested again
+    REFRESH_RETRY_HOURS = 1
+
+    _stats_lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0, 'stale_hits': 0, 'refreshes': 0, 'errors': 0}
+
+    @classmethod
+    def get(cls, query):
+        """
+        Get suggestions for a destination query
+
+        Args:
+            query (str): The user-entered destination
+
+        Returns:
+            dict: id (None if the suggestions couldn't be cached),
+            destination_id and suggestions; None for an empty query
+        """
+        normalized_query = normalize_text(query)[:255]
+        if not normalized_query:
+            return None
+
+        entry = cls._read(normalized_query)
+        if entry is not None:
+            if cls._is_stale(entry):
+                cls._count('stale_hits')
+                cls._request_refresh(entry)
+            else:
+                cls._count('hits')
+            return entry
+
+        cls._count('misses')
+        suggestions = AIService.get_destination_suggestions(query)
+        if not cls._is_cacheable(suggestions):
+            return {'id': None, 'destination_id': None, 'suggestions': suggestions}
+
+        now = datetime.utcnow()
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(suggestions_table).values(
+                    normalized_query=normalized_query,
+                    query=query.strip()[:255],
+                    destination_id=cls._match_destination(conn, normalized_query, suggestions),
+                    suggestions=suggestions,
+                    hit_count=0,
+                    created_at=now,
+                    refreshed_at=now
+                ))
+        except Exception as e:
+            # Usually another worker cached the same query first
+            logger.warning(f"Destination suggestion write failed for {query}: {str(e)}")
+            cls._count('errors')
+
+        return cls._read(normalized_query, count_hit=False) or {'id': None, 'destination_id': None, 'suggestions': suggestions}
+
+    @classmethod
+    def refresh(cls, normalized_query):
+        """
+        Fetch fresh suggestions for a cached query
+
+        Args:
+            normalized_query (str): The entry's normalized query
+
+        Returns:
+            bool: True if the entry was updated
+        """
+        entry = cls._read(normalized_query, count_hit=False)
+        if entry is None:
+            return False
+
+        suggestions = AIService.get_destination_suggestions(entry['query'])
+        now = datetime.utcnow()
+        with db.engine.begin() as conn:
+            values = {'refresh_requested_at': None}
+            if cls._is_cacheable(suggestions):
+                values.update(
+                    suggestions=suggestions,
+                    refreshed_at=now,
+                    destination_id=cls._match_destination(conn, normalized_query, suggestions) or entry['destination_id']
+                )
+            conn.execute(update(suggestions_table).where(suggestions_table.c.id == entry['id']).values(**values))
+
+        cls._count('refreshes')
+        logger.info(f"Refreshed destination suggestions for {normalized_query}")
+        return 'suggestions' in values
+
+    @classmethod
+    def stats(cls):
+        """Return cache counters for this process"""
+        with cls._stats_lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def _count(cls, name):
+        with cls._stats_lock:
+            cls._stats[name] += 1
+
+    @classmethod
+    def _read(cls, normalized_query, count_hit=True):
+        try:
+            with db.engine.begin() as conn:
+                row = conn.execute(
+                    select(suggestions_table).where(suggestions_table.c.normalized_query == normalized_query)
+                ).mappings().first()
+                if row is None:
+                    return None
+                if count_hit:
+                    conn.execute(
+                        update(suggestions_table)
+                        .where(suggestions_table.c.id == row['id'])
+                        .values(hit_count=suggestions_table.c.hit_count + 1)
+                    )
+        except Exception as e:
+            logger.warning(f"Destination suggestion read failed for {normalized_query}: {str(e)}")
+            cls._count('errors')
+            return None
+        return dict(row)
+
+    @classmethod
+    def _is_stale(cls, entry):
+        max_age = timedelta(days=current_app.config.get('DESTINATION_SUGGESTIONS_MAX_AGE_DAYS', cls.DEFAULT_MAX_AGE_DAYS))
+        return entry['refreshed_at'] < datetime.utcnow() - max_age
+
+    @classmethod
+    def _request_refresh(cls, entry):
+        """Queue one refresh job per stale entry"""
+        if current_app.config.get('JOB_QUEUE_INLINE', True):
+            # An inline job would hold up the trip being created on an OpenAI call
+            return
+
+        now = datetime.utcnow()
+        retry_before = now - timedelta(hours=cls.REFRESH_RETRY_HOURS)
+        pending = suggestions_table.c.refresh_requested_at
+        try:
+            # Only the request that sets refresh_requested_at queues the job
+            with db.engine.begin() as conn:
+                claimed = conn.execute(
+                    update(suggestions_table)
+                    .where(suggestions_table.c.id == entry['id'])
+                    .where(pending.is_(None) | (pending < retry_before))
+                    .values(refresh_requested_at=now)
+                ).rowcount
+            if claimed:
+                JobQueue.enqueue('refresh_destination_suggestions', {'normalized_query': entry['normalized_query']})
+        except Exception as e:
+            logger.warning(f"Couldn't queue destination suggestion refresh for {entry['normalized_query']}: {str(e)}")
+            cls._count('errors')
+
+    @staticmethod
+    def _is_cacheable(suggestions):
+        """Placeholder answers from unparseable responses are worth asking again"""
+        return bool(suggestions) and suggestions[0].get('description') != FALLBACK_DESTINATION_DESCRIPTION
+
+    @staticmethod
+    def _match_destination(conn, normalized_query, suggestions):
+        """Id of the Destination row for the top suggestion, when it's unambiguous"""
+        top = suggestions[0]
+        name = normalize_text(top.get('name')) or normalized_query
+        country = normalize_text(top.get('country'))
+
+        destinations = Destination.__table__
+        candidates = conn.execute(
+            select(destinations.c.id, destinations.c.country)
+            .where(destinations.c.normalized_name == name)
+            .order_by(destinations.c.population.desc())
+            .limit(20)
+        ).all()
+        for candidate in candidates:
+            if country and normalize_text(candidate.country) == country:
+                return candidate.id
+        # Without a country to tell them apart, only a unique name is safe to link
+        if not country and len(candidates) == 1:
+            return candidates[0].id
+        return None
+
+@JobQueue.handler('refresh_destination_suggestions')
+def refresh_destination_suggestions_job(payload):
+    """Background job wrapper for DestinationSuggestionService.refresh"""
+    return DestinationSuggestionService.refresh(payload['normalized_query'])
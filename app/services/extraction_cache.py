@@ -0,0 +1,160 @@
+"""
+Extraction Cache
+
+Database-backed cache for AI recommendation extraction. Entries are keyed
+by a digest of the submitted text (with whitespace collapsed), the
+normalized destination, the model and the prompt version, so an edit to
+the prompt template starts a fresh set of keys and old entries simply age
+out. The table is capped at EXTRACTION_CACHE_MAX_ENTRIES, evicting the
+least recently used entries first. Cache reads and writes run on their own
+connection so they never commit or roll back the caller's session.
+"""
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, update
+
+from app.database import db
+from app.database.models import ExtractionCacheEntry
+from app.services.normalization import normalize_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+', re.UNICODE)
+
+class ExtractionCache:
+    """Shared cache of extracted recommendations, keyed by the submitted text"""
+
+    DEFAULT_MAX_ENTRIES = 5000
+
+    _stats_lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'errors': 0}
+
+    @staticmethod
+    def normalize_submission(text):
+        """
+        Normalize submitted text for keying
+
+        Only Unicode form and whitespace are normalized: case and punctuation
+        can change what gets extracted (names, URLs), so they are kept.
+
+        Args:
+            text (str): The submitted recommendation text
+
+        Returns:
+            str: Normalized text
+        """
+        return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+
+    @classmethod
+    def make_key(cls, text, destination, model, prompt_version):
+        """
+        Build the cache key for an extraction
+
+        Returns:
+            str: Hex sha256 digest of the normalized request
+        """
+        parts = [model, prompt_version, normalize_text(destination), cls.normalize_submission(text)]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def get(cls, text, destination, model, prompt_version):
+        """
+        Look up cached recommendations for a submission
+
+        Returns:
+            list: Cached recommendations, or None on a miss
+        """
+        cache_key = cls.make_key(text, destination, model, prompt_version)
+        table = ExtractionCacheEntry.__table__
+
+        try:
+            with db.engine.begin() as conn:
+                row = conn.execute(
+                    select(table.c.id, table.c.recommendations).where(table.c.cache_key == cache_key)
+                ).first()
+
+                if row is None:
+                    cls._count('misses')
+                    return None
+
+                conn.execute(
+                    update(table)
+                    .where(table.c.id == row.id)
+                    .values(hit_count=table.c.hit_count + 1, last_used_at=datetime.utcnow())
+                )
+        except Exception as e:
+            logger.warning(f"Extraction cache read failed: {str(e)}")
+            cls._count('errors')
+            return None
+
+        logger.info(f"Extraction cache hit for {destination}: {len(row.recommendations)} recommendations")
+        cls._count('hits')
+        return row.recommendations
+
+    @classmethod
+    def set(cls, text, destination, model, prompt_version, recommendations):
+        """
+        Store extracted recommendations, evicting the least recently used
+        entries if the table is over its cap
+
+        Args:
+            text (str): The submitted recommendation text
+            destination (str): The trip destination used for extraction
+            model (str): Model that did the extraction
+            prompt_version (str): Digest of the prompt template
+            recommendations (list): Extracted recommendation dictionaries
+        """
+        cache_key = cls.make_key(text, destination, model, prompt_version)
+        table = ExtractionCacheEntry.__table__
+        now = datetime.utcnow()
+        max_entries = current_app.config.get('EXTRACTION_CACHE_MAX_ENTRIES', cls.DEFAULT_MAX_ENTRIES)
+
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(delete(table).where(table.c.cache_key == cache_key))
+                conn.execute(insert(table).values(
+                    cache_key=cache_key,
+                    model=model,
+                    prompt_version=prompt_version,
+                    destination=normalize_text(destination)[:255] or None,
+                    text_length=len(text or ''),
+                    recommendations=recommendations,
+                    hit_count=0,
+                    created_at=now,
+                    last_used_at=now
+                ))
+
+                excess = conn.execute(select(func.count()).select_from(table)).scalar() - max_entries
+                evicted = 0
+                if excess > 0:
+                    oldest = select(table.c.id).order_by(table.c.last_used_at, table.c.id).limit(excess)
+                    evicted = conn.execute(delete(table).where(table.c.id.in_(oldest.scalar_subquery()))).rowcount
+        except Exception as e:
+            # Another worker may have written the same key first; either way the cache is best-effort
+            logger.warning(f"Extraction cache write failed: {str(e)}")
+            cls._count('errors')
+            return
+
+        cls._count('writes')
+        if evicted:
+            with cls._stats_lock:
+                cls._stats['evictions'] += evicted
+            logger.info(f"Evicted {evicted} least recently used extraction cache entries")
+
+    @classmethod
+    def stats(cls):
+        """Return cache counters for this process"""
+        with cls._stats_lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def _count(cls, name):
+        with cls._stats_lock:
+            cls._stats[name] += 1
@@ -0,0 +1,118 @@
+"""
+Extraction Pipeline
+
+How a submission's text is turned into OpenAI extraction requests: long
+texts are split into chunks extracted concurrently, short texts can share
+a batched request with others arriving at the same time, and the results
+are merged so each place appears once. The requests themselves are made by
+ExtractionRequests.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app.services.extraction_requests import ExtractionRequests
+from app.services.micro_batch import UNBATCHED, get_batcher
+from app.services.normalization import normalize_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Texts longer than this are split and extracted in parallel, this many requests at a time
+DEFAULT_CHUNK_CHARS = 3000
+DEFAULT_EXTRACTION_CONCURRENCY = 4
+
+# Short texts can share one request with others arriving within the window
+DEFAULT_BATCH_MAX_CHARS = 500
+DEFAULT_BATCH_MAX_ITEMS = 8
+DEFAULT_BATCH_WINDOW_MS = 50
+
+class ExtractionPipeline:
+    """Chunking, batching and merging around extraction requests"""
+
+    @classmethod
+    def extract_chunks(cls, chunks, destination, on_item=None):
+        """
+        Extract recommendations from the chunks of a long text concurrently
+
+        Args:
+            chunks (list): Pieces of the text, from split_text
+            destination (str): The destination city/location for context
+            on_item (callable, optional): As for AIService.extract_recommendations;
+                called from the request threads
+
+        Returns:
+            tuple: (recommendations, complete) merged across chunks in chunk order;
+            complete only if every chunk parsed cleanly
+        """
+        max_workers = min(len(chunks), current_app.config.get('EXTRACTION_MAX_CONCURRENCY', DEFAULT_EXTRACTION_CONCURRENCY))
+        logger.info(f"Extracting {len(chunks)} chunks with up to {max_workers} concurrent requests")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda chunk: ExtractionRequests.request(chunk, destination, on_item=on_item),
+                chunks
+            ))
+
+        recommendations = cls.merge_recommendations(rec for chunk_recs, _ in results for rec in chunk_recs)
+        logger.info(f"Merged {sum(len(chunk_recs) for chunk_recs, _ in results)} chunk results into {len(recommendations)} recommendations")
+        return recommendations, all(complete for _, complete in results)
+
+    @classmethod
+    def extract_batched(cls, text, destination):
+        """
+        Extract a short text as part of a batch with other concurrent submissions
+
+        Waits at most EXTRACTION_BATCH_WINDOW_MS for others to join before the
+        batch is sent.
+
+        Returns:
+            list: The recommendations, or UNBATCHED if batching is off, the text
+            is too long, no other submission joined or the batch couldn't be
+            parsed for this text; the caller then makes its own request
+        """
+        config = current_app.config
+        if not config.get('EXTRACTION_BATCHING', False):
+            return UNBATCHED
+        if len(text) > config.get('EXTRACTION_BATCH_MAX_CHARS', DEFAULT_BATCH_MAX_CHARS):
+            return UNBATCHED
+
+        return get_batcher('openai.extract_recommendations').submit(
+            (text, destination),
+            ExtractionRequests.request_batch,
+            max_items=config.get('EXTRACTION_BATCH_MAX_ITEMS', DEFAULT_BATCH_MAX_ITEMS),
+            max_wait=config.get('EXTRACTION_BATCH_WINDOW_MS', DEFAULT_BATCH_WINDOW_MS) / 1000
+        )
+
+    @staticmethod
+    def merge_recommendations(recommendations):
+        """
+        Combine recommendations of the same place (by normalized name), keeping
+        the first one's fields, filling in blanks and joining distinct descriptions
+
+        Args:
+            recommendations (iterable): Recommendation dictionaries, in order
+
+        Returns:
+            list: One dictionary per place, in order of first mention
+        """
+        merged = {}
+        for rec in recommendations:
+            if not isinstance(rec, dict):
+                continue
+            # Unnamed items can't be matched, so they are kept as they are
+            key = normalize_text(rec.get('name')) or f"#{len(merged)}"
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = dict(rec)
+                continue
+
+            for field in ('type', 'website_url'):
+                if not existing.get(field) and rec.get(field):
+                    existing[field] = rec[field]
+
+            description = (rec.get('description') or '').strip()
+            if description and description not in (existing.get('description') or ''):
+                existing['description'] = f"{existing['description']} {description}" if existing.get('description') else description
+        return list(merged.values())
@@ -0,0 +1,294 @@
+"""
+Extraction Requests
+
+The OpenAI side of recommendation extraction: the prompts, one request per
+text (optionally streamed, passing each recommendation on as soon as it has
+been generated), one request for several short texts at once, and parsing
+completions back into recommendation lists, falling back to the raw text
+when the model's answer isn't JSON.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import traceback
+
+from app.services.http_client import get_client
+from app.services.json_stream import JSONArrayStreamParser
+from app.services.micro_batch import UNBATCHED
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Pooled client with OpenAI-specific timeouts and retries
+http = get_client('openai')
+
+CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+EXTRACTION_MODEL = "gpt-3.5-turbo"  # Fallback to a more reliable model
+EXTRACTION_SYSTEM_PROMPT = "You are a helpful assistant that extracts structured recommendations from text."
+EXTRACTION_PROMPT_TEMPLATE = """
+Extract specific recommendations for places to visit in {destination} from the following text.
+For each recommendation, provide:
+1. The name of the place or activity
+2. The type of place (restaurant, museum, park, etc.)
+3. Any website URL mentioned (or leave blank)
+4. A brief description based on what was mentioned
+
+Text: {text}
+
+Output the information as a JSON array of objects with keys: name, type, website_url, description
+"""
+# Several short submissions in one request, each in its own <document> element
+EXTRACTION_BATCH_PROMPT_TEMPLATE = """
+Each document below is a separate set of recommendations for places to visit in the destination given on its tag.
+Extract the recommendations from each document on its own, never mixing documents.
+For each recommendation, provide:
+1. The name of the place or activity
+2. The type of place (restaurant, museum, park, etc.)
+3. Any website URL mentioned (or leave blank)
+4. A brief description based on what was mentioned
+
+{documents}
+
+Output a single JSON object mapping each document id (as a string) to a JSON array of objects with keys: name, type, website_url, description
+"""
+EXTRACTION_BATCH_DOCUMENT_TEMPLATE = """<document id="{id}" destination="{destination}">
+{text}
+</document>"""
+# Part of the extraction cache key, so editing the prompt retires old cached results
+EXTRACTION_PROMPT_VERSION = hashlib.sha256(
+    (EXTRACTION_SYSTEM_PROMPT + EXTRACTION_PROMPT_TEMPLATE + EXTRACTION_BATCH_PROMPT_TEMPLATE).encode('utf-8')
+).hexdigest()[:12]
+
+class ExtractionRequests:
+    """OpenAI chat completions that extract recommendations from text"""
+
+    @classmethod
+    def request(cls, text, destination, on_item=None):
+        """
+        Ask OpenAI to extract recommendations from text
+
+        With on_item, the completion is streamed and each recommendation is
+        passed to on_item as soon as it has been generated; the returned list
+        is parsed from the full completion either way.
+
+        Returns:
+            tuple: (recommendations, complete) where complete is False if the
+            response couldn't be parsed and a fallback was returned
+        """
+        logger.info(f"Extracting recommendations for destination: {destination}")
+        logger.info(f"Input text length: {len(text)} characters")
+        logger.info(f"Text sample: '{text[:100]}...' (truncated)")
+
+        data = cls._chat_data(EXTRACTION_PROMPT_TEMPLATE.format(destination=destination, text=text))
+        try:
+            logger.info(f"Sending request to OpenAI API using model: {data['model']}")
+            if on_item is not None:
+                content = cls._stream_completion(data, on_item)
+            else:
+                content = cls._complete(data)
+
+            logger.info(f"OpenAI response content: '{content[:100]}...' (truncated)")
+
+            return cls._parse_extraction(content, text, destination)
+        except Exception as e:
+            logger.error(f"Error in AI recommendation extraction: {e}")
+            logger.error(traceback.format_exc())
+            raise
+
+    @classmethod
+    def request_batch(cls, submissions):
+        """
+        Ask OpenAI to extract recommendations from several texts in one request
+
+        Args:
+            submissions (list): (text, destination) tuples
+
+        Returns:
+            list: One recommendation list per submission, in order, or
+            UNBATCHED for any submission missing from the response
+        """
+        documents = "\n".join(
+            EXTRACTION_BATCH_DOCUMENT_TEMPLATE.format(id=i, destination=destination.replace('"', "'"), text=text)
+            for i, (text, destination) in enumerate(submissions, start=1)
+        )
+        logger.info(f"Sending batch of {len(submissions)} extractions to OpenAI API using model: {EXTRACTION_MODEL}")
+        content = cls._complete(cls._chat_data(EXTRACTION_BATCH_PROMPT_TEMPLATE.format(documents=documents)))
+
+        start_idx = content.find("{")
+        end_idx = content.rfind("}") + 1
+        if start_idx < 0 or end_idx <= start_idx:
+            raise ValueError("Batch response did not contain a JSON object")
+        by_document = json.loads(content[start_idx:end_idx])
+        if not isinstance(by_document, dict):
+            raise ValueError("Batch response was not a JSON object")
+
+        results = []
+        for i in range(1, len(submissions) + 1):
+            recs = by_document.get(str(i))
+            if isinstance(recs, list) and all(isinstance(rec, dict) for rec in recs):
+                results.append(recs)
+            else:
+                logger.warning(f"Batch response had no usable result for document {i}")
+                results.append(UNBATCHED)
+        logger.info(f"Batch extracted {sum(len(r) for r in results if r is not UNBATCHED)} recommendations")
+        return results
+
+    @staticmethod
+    def _headers():
+        """Request headers with the OpenAI credentials from the environment"""
+        api_key = os.environ.get("OPENAI_API_KEY")
+        organization_id = os.environ.get("ORGANIZATION_ID")
+
+        # Check if API key is configured
+        if not api_key:
+            error_msg = "No OpenAI API key found. Please set the OPENAI_API_KEY environment variable."
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+        # Add organization ID to headers if available
+        if organization_id:
+            headers["OpenAI-Organization"] = organization_id
+        return headers
+
+    @staticmethod
+    def _chat_data(prompt):
+        """Chat completion request body for an extraction prompt"""
+        return {
+            "model": EXTRACTION_MODEL,
+            "messages": [
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+        }
+
+    @classmethod
+    def _complete(cls, data):
+        """
+        Run a chat completion
+
+        Returns:
+            str: The completion text
+        """
+        response = http.post(CHAT_COMPLETIONS_URL, headers=cls._headers(), json=data)
+
+        logger.info(f"Received response from OpenAI API: status={response.status_code}")
+
+        cls._raise_for_error(response.status_code, response.text)
+
+        result = response.json()
+
+        cls._raise_for_error(error=result.get("error"))
+
+        return result["choices"][0]["message"]["content"]
+
+    @staticmethod
+    def _raise_for_error(status_code=200, text=None, error=None):
+        """Raise for a non-200 response or an error object in the response body"""
+        if status_code != 200:
+            logger.error(f"OpenAI API Error: Status code {status_code}, Response: {text}")
+            raise Exception(f"OpenAI API Error: Status code {status_code}, Response: {text}")
+        if error:
+            logger.error(f"OpenAI API Error: {error}")
+            raise Exception(f"OpenAI API Error: {error.get('message', 'Unknown error') if isinstance(error, dict) else error}")
+
+    @classmethod
+    def _stream_completion(cls, data, on_item):
+        """
+        Run a chat completion as a token stream
+
+        Args:
+            data (dict): Chat completion request body
+            on_item (callable): Called with each recommendation object as soon
+                as its closing brace has streamed in
+
+        Returns:
+            str: The full completion text
+        """
+        response = http.post(
+            CHAT_COMPLETIONS_URL,
+            headers=cls._headers(),
+            json=dict(data, stream=True),
+            stream=True
+        )
+        logger.info(f"Streaming response from OpenAI API: status={response.status_code}")
+
+        cls._raise_for_error(response.status_code, response.text)
+
+        parser = JSONArrayStreamParser()
+        parts = []
+        try:
+            # Server-sent events, one "data: {...}" chunk per line
+            for line in response.iter_lines():
+                line = line.decode('utf-8')
+                if not line.startswith('data: '):
+                    continue
+                event = line[len('data: '):]
+                if event == '[DONE]':
+                    break
+
+                chunk = json.loads(event)
+                cls._raise_for_error(error=chunk.get("error"))
+
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if not delta:
+                    continue
+                parts.append(delta)
+                for item in parser.feed(delta):
+                    on_item(item)
+        finally:
+            response.close()
+
+        logger.info(f"Streamed {parser.parsed} recommendations")
+        return ''.join(parts)
+
+    @staticmethod
+    def _parse_extraction(content, text, destination):
+        """
+        Parse the recommendations out of a completion
+
+        Returns:
+            tuple: (recommendations, complete) as for request
+        """
+        def fallback(description):
+            return [{"name": f"Recommendations for {destination}", "type": "", "website_url": "", "description": description}], False
+
+        # Extract JSON from the response - might need to handle different response formats
+        start_idx = content.find("[")
+        end_idx = content.rfind("]") + 1
+        if start_idx < 0 or end_idx <= start_idx:
+            logger.error(f"Failed to extract JSON from OpenAI response, no JSON array in: {content}")
+            return fallback(content if content else text)
+
+        json_str = content[start_idx:end_idx]
+        try:
+            extracted_data = json.loads(json_str)
+            logger.info(f"Successfully parsed JSON data: {len(extracted_data)} recommendations extracted")
+            return extracted_data, True
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parsing error: {e}")
+            logger.error(f"Problem JSON string: {json_str}")
+
+        # Fall back to any individual JSON objects that name a place
+        extracted_objects = []
+        for match in re.finditer(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', content):
+            try:
+                obj = json.loads(match.group(0))
+            except json.JSONDecodeError:
+                continue
+            if isinstance(obj, dict) and 'name' in obj:
+                extracted_objects.append(obj)
+        if extracted_objects:
+            logger.info(f"Fallback parsing found {len(extracted_objects)} recommendations")
+            return extracted_objects, False
+
+        # If that failed too, keep the full text as a single recommendation
+        logger.info("Creating fallback recommendation with the full raw text")
+        return fallback(text)
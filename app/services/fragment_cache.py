@@ -0,0 +1,151 @@
+"""
+Fragment Cache
+
+Caches rendered template fragments keyed by (scope, version, name), where
+the version changes whenever the underlying content does (e.g.
+Trip.content_version), so entries never need explicit invalidation. Each
+worker keeps a bounded LRU of FRAGMENT_CACHE_MAX_ENTRIES fragments; with
+FRAGMENT_CACHE_SHARED set, fragments are also stored in the
+rendered_fragments table so one worker's render serves the others.
+Shared reads and writes run on their own connection so they never commit
+or roll back the caller's session.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+from markupsafe import Markup
+from sqlalchemy import delete, insert, or_, select
+
+from app.database import db
+from app.database.models import RenderedFragment
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+class FragmentCache:
+    """Per-worker LRU of rendered fragments with an optional shared store"""
+
+    DEFAULT_MAX_ENTRIES = 256
+
+    _lock = threading.Lock()
+    _entries = OrderedDict()  # (scope, version, name) -> rendered markup
+    _stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'renders': 0, 'evictions': 0, 'errors': 0}
+
+    @classmethod
+    def get_or_render(cls, scope, version, name, render):
+        """
+        Return a cached fragment, rendering and storing it on a miss
+
+        Args:
+            scope (str): Owner of the fragment, e.g. 'trip:12:<share token>'
+            version (int): Content version of the owner
+            name (str): Which fragment of the owner, e.g. 'recommendations'
+            render (callable): Produces the fragment's HTML
+
+        Returns:
+            Markup: The rendered fragment
+        """
+        key = (scope, version, name)
+        with cls._lock:
+            content = cls._entries.get(key)
+            if content is not None:
+                cls._entries.move_to_end(key)
+                cls._stats['hits'] += 1
+                return content
+
+        content = cls._read_shared(key) if cls._shared() else None
+        if content is not None:
+            cls._count('shared_hits')
+        else:
+            cls._count('misses')
+            content = Markup(render())
+            cls._count('renders')
+            if cls._shared():
+                cls._write_shared(key, content)
+
+        cls._remember(key, content)
+        return content
+
+    @classmethod
+    def clear(cls):
+        """Drop this worker's in-memory fragments"""
+        with cls._lock:
+            cls._entries.clear()
+
+    @classmethod
+    def stats(cls):
+        """Return this worker's counters and LRU size"""
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['entries'] = len(cls._entries)
+        lookups = stats['hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['shared_hits']) / lookups, 3) if lookups else None
+        stats['shared'] = cls._shared()
+        return stats
+
+    @staticmethod
+    def make_key(scope, version, name):
+        """Hex sha256 digest identifying a fragment in the shared store"""
+        return hashlib.sha256(f"{scope}|{version}|{name}".encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _remember(cls, key, content):
+        max_entries = current_app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', cls.DEFAULT_MAX_ENTRIES)
+        with cls._lock:
+            cls._entries[key] = content
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > max_entries:
+                cls._entries.popitem(last=False)
+                cls._stats['evictions'] += 1
+
+    @classmethod
+    def _read_shared(cls, key):
+        table = RenderedFragment.__table__
+        try:
+            with db.engine.connect() as conn:
+                content = conn.execute(
+                    select(table.c.content).where(table.c.cache_key == cls.make_key(*key))
+                ).scalar()
+        except Exception as e:
+            logger.warning(f"Fragment cache read failed for {key[0]}: {str(e)}")
+            cls._count('errors')
+            return None
+        return Markup(content) if content is not None else None
+
+    @classmethod
+    def _write_shared(cls, key, content):
+        scope, version, name = key
+        cache_key = cls.make_key(scope, version, name)
+        table = RenderedFragment.__table__
+        try:
+            with db.engine.begin() as conn:
+                # Older versions of the scope can never be served again
+                conn.execute(delete(table).where(or_(
+                    table.c.cache_key == cache_key,
+                    (table.c.scope == scope) & (table.c.version < version)
+                )))
+                conn.execute(insert(table).values(
+                    cache_key=cache_key,
+                    scope=scope,
+                    version=version,
+                    name=name,
+                    content=str(content),
+                    created_at=datetime.utcnow()
+                ))
+        except Exception as e:
+            # Another worker may have stored the same fragment first
+            logger.warning(f"Fragment cache write failed for {scope}: {str(e)}")
+            cls._count('errors')
+
+    @staticmethod
+    def _shared():
+        return current_app.config.get('FRAGMENT_CACHE_SHARED', False)
+
+    @classmethod
+    def _count(cls, counter):
+        with cls._lock:
+            cls._stats[counter] += 1
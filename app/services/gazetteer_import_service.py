@@ -0,0 +1,215 @@
+"""
+Gazetteer Import Service
+
+Loads cities from a local gazetteer dump (GeoNames cities/allCountries
+TSV, or a Natural Earth style populated places CSV) into the destinations
+table, so city-level destination search can be served without calling
+Nominatim. Files are streamed and written in chunks, upserting on
+Destination.external_id so re-running an import updates rows in place.
+"""
+import csv
+import gzip
+import io
+import logging
+import zipfile
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.database import db
+from app.database.models import Destination
+from app.services.normalization import normalize_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Column positions in the GeoNames geoname table dumps
+GEONAMES_COLUMNS = {
+    'id': 0,
+    'name': 1,
+    'latitude': 4,
+    'longitude': 5,
+    'feature_class': 6,
+    'country_code': 8,
+    'population': 14,
+}
+
+# Accepted header names (lowercased) for each field in CSV dumps
+CSV_FIELD_ALIASES = {
+    'id': ('geonameid', 'ne_id', 'wikidataid', 'id'),
+    'name': ('name', 'nameascii', 'city'),
+    'country': ('country', 'adm0name', 'sov0name'),
+    'country_code': ('country_code', 'iso_a2', 'adm0_a3'),
+    'latitude': ('latitude', 'lat'),
+    'longitude': ('longitude', 'lon', 'lng'),
+    'population': ('population', 'pop_max'),
+}
+
+# Columns overwritten when an imported destination already exists
+UPSERT_COLUMNS = ('name', 'normalized_name', 'display_name', 'country', 'type', 'latitude', 'longitude', 'population', 'updated_at')
+
+class GazetteerImportService:
+    """Streams a gazetteer dump into the destinations table"""
+
+    FORMATS = ('geonames', 'csv')
+    DEFAULT_CHUNK_SIZE = 1000
+
+    @classmethod
+    def import_file(cls, path, file_format='geonames', source='geonames', country_info_path=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE, min_population=0):
+        """
+        Import cities from a gazetteer file
+
+        Args:
+            path (str): Path to the dump (.txt/.tsv/.csv, optionally .gz or .zip)
+            file_format (str): 'geonames' for GeoNames TSV, 'csv' for a headed CSV
+            source (str): Prefix for external ids, e.g. 'geonames' -> 'geonames:2988507'
+            country_info_path (str, optional): GeoNames countryInfo.txt used to turn
+                ISO country codes into country names
+            chunk_size (int): Rows written per statement
+            min_population (int): Skip places with a smaller population
+
+        Returns:
+            dict: Counts of rows 'read', 'imported' and 'skipped'
+        """
+        if file_format not in cls.FORMATS:
+            raise ValueError(f"Unknown gazetteer format: {file_format}")
+
+        country_names = cls.load_country_names(country_info_path) if country_info_path else {}
+        counts = {'read': 0, 'imported': 0, 'skipped': 0}
+        chunk = []
+
+        with cls._open_text(path) as handle:
+            rows = cls._geonames_rows(handle) if file_format == 'geonames' else cls._csv_rows(handle)
+            for place in rows:
+                counts['read'] += 1
+                values = cls._destination_values(place, source, country_names, min_population)
+                if values is None:
+                    counts['skipped'] += 1
+                    continue
+
+                chunk.append(values)
+                if len(chunk) >= chunk_size:
+                    counts['imported'] += cls._upsert_chunk(chunk)
+                    chunk = []
+
+        if chunk:
+            counts['imported'] += cls._upsert_chunk(chunk)
+
+        logger.info(f"Imported gazetteer {path}: {counts}")
+        return counts
+
+    @staticmethod
+    def load_country_names(path):
+        """
+        Read ISO code -> country name from a GeoNames countryInfo.txt
+
+        Returns:
+            dict: Country names keyed by ISO alpha-2 code
+        """
+        names = {}
+        with GazetteerImportService._open_text(path) as handle:
+            for line in handle:
+                if line.startswith('#') or not line.strip():
+                    continue
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) > 4:
+                    names[fields[0]] = fields[4]
+        return names
+
+    @classmethod
+    def _upsert_chunk(cls, chunk):
+        """Insert a chunk of destinations, updating rows whose external_id already exists"""
+        dialect = db.engine.dialect.name
+        table = Destination.__table__
+
+        if dialect == 'postgresql':
+            statement = postgresql.insert(table)
+        elif dialect == 'sqlite':
+            statement = sqlite.insert(table)
+        else:
+            raise RuntimeError(f"Gazetteer import does not support the {dialect} dialect")
+
+        statement = statement.on_conflict_do_update(
+            index_elements=['external_id'],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}
+        )
+
+        with db.engine.begin() as conn:
+            conn.execute(statement, chunk)
+        return len(chunk)
+
+    @classmethod
+    def _destination_values(cls, place, source, country_names, min_population):
+        """Turn a parsed gazetteer row into destinations column values (None to skip)"""
+        name = (place.get('name') or '').strip()
+        external_id = (place.get('id') or '').strip()
+        if not name or not external_id:
+            return None
+
+        # GeoNames dumps mix in mountains, rivers etc; only keep populated places
+        feature_class = place.get('feature_class')
+        if feature_class is not None and feature_class != 'P':
+            return None
+
+        population = cls._to_number(place.get('population'), int) or 0
+        if population < min_population:
+            return None
+
+        country_code = (place.get('country_code') or '').strip().upper() or None
+        country = (place.get('country') or '').strip() or country_names.get(country_code) or country_code
+
+        now = datetime.utcnow()
+        return {
+            'external_id': f"{source}:{external_id}"[:100],
+            'name': name[:255],
+            'normalized_name': normalize_text(name)[:255],
+            'display_name': (f"{name}, {country}" if country else name)[:255],
+            'country': country[:100] if country else None,
+            'type': 'city',
+            'latitude': cls._to_number(place.get('latitude'), float),
+            'longitude': cls._to_number(place.get('longitude'), float),
+            'population': population or None,
+            'created_at': now,
+            'updated_at': now,
+        }
+
+    @staticmethod
+    def _geonames_rows(handle):
+        # GeoNames fields are tab separated and never quoted
+        for fields in csv.reader(handle, delimiter='\t', quoting=csv.QUOTE_NONE):
+            if len(fields) <= GEONAMES_COLUMNS['population']:
+                continue
+            yield {field: fields[position] for field, position in GEONAMES_COLUMNS.items()}
+
+    @staticmethod
+    def _csv_rows(handle):
+        reader = csv.DictReader(handle)
+        headers = {header.lower(): header for header in (reader.fieldnames or [])}
+        columns = {}
+        for field, aliases in CSV_FIELD_ALIASES.items():
+            for alias in aliases:
+                if alias in headers:
+                    columns[field] = headers[alias]
+                    break
+
+        for row in reader:
+            yield {field: row.get(header) for field, header in columns.items()}
+
+    @staticmethod
+    def _open_text(path):
+        """Open a plain, gzipped or zipped (first file inside) text file"""
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8', newline='')
+        if path.endswith('.zip'):
+            archive = zipfile.ZipFile(path)
+            member = next(name for name in archive.namelist() if not name.endswith('/'))
+            return io.TextIOWrapper(archive.open(member), encoding='utf-8', newline='')
+        return open(path, encoding='utf-8', newline='')
+
+    @staticmethod
+    def _to_number(value, number_type):
+        try:
+            return number_type(value) if value not in (None, '') else None
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,102 @@
+"""
+Google Places Batch
+
+Concurrent fan-outs over GooglePlacesService: resolving several place names
+at once, and fetching Place Details for several place_ids under one overall
+deadline. Both run on bounded per-process executors whose threads start
+lazily, after any fork.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import current_app
+
+from app.services.google_places_service import GooglePlacesService
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Bounded pool for fanning out Place Details lookups
+_details_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='places-details')
+
+# Bounded pool for resolving several place names at once in find_places
+_lookup_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix='places-lookup')
+
+class GooglePlacesBatch:
+    """Run several Google Places lookups at once"""
+
+    # Overall time budget in seconds for a Place Details fan-out
+    DETAILS_FANOUT_DEADLINE = 3.0
+
+    @classmethod
+    def find_places(cls, lookups, **kwargs):
+        """
+        Find several places concurrently
+
+        Args:
+            lookups (list): (name, category) tuples to resolve
+            **kwargs: Search context shared by every lookup (search_vicinity, destination_country)
+
+        Returns:
+            list: Place data (or None) for each lookup, in the same order
+        """
+        if not lookups:
+            return []
+
+        app = current_app._get_current_object()
+
+        def find_in_app_context(name, category):
+            with app.app_context():
+                return GooglePlacesService.find_place(name, category, **kwargs)
+
+        futures = [_lookup_executor.submit(find_in_app_context, name, category) for name, category in lookups]
+        places = []
+        for (name, _), future in zip(lookups, futures):
+            try:
+                places.append(future.result())
+            except Exception as e:
+                logger.error(f"Error resolving {name} with Google Places: {str(e)}")
+                places.append(None)
+        return places
+
+    @classmethod
+    def get_place_details(cls, place_ids, api_key):
+        """
+        Fetch Place Details for several place_ids in parallel
+
+        Lookups share one overall deadline, so the total wait is roughly the
+        slowest call rather than the sum.
+
+        Args:
+            place_ids (list): Place IDs in the order results should be returned
+            api_key (str): Google Maps API key
+
+        Returns:
+            list: Place details in the same order as place_ids, omitting any
+            that failed or missed the deadline
+        """
+        if not place_ids:
+            return []
+
+        deadline = cls.DETAILS_FANOUT_DEADLINE
+        futures = [
+            _details_executor.submit(GooglePlacesService.get_place_details, place_id, api_key, deadline=deadline)
+            for place_id in place_ids
+        ]
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            logger.warning(f"Dropping {len(not_done)} of {len(futures)} PlaceDetails lookups that missed the {deadline}s deadline")
+
+        results = []
+        for place_id, future in zip(place_ids, futures):
+            if future not in done:
+                continue
+            if future.exception():
+                logger.warning(f"PlaceDetails lookup failed for place_id {place_id}: {future.exception()}")
+                continue
+            if future.result():
+                results.append(future.result())
+        return results
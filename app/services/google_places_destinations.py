@@ -0,0 +1,152 @@
+"""
+Google Places Destinations
+
+Destination search against the Google Places Autocomplete API, used by the
+destination search endpoints next to the local database and OpenStreetMap.
+Predictions are resolved to destinations through a Place Details fan-out.
+"""
+import os
+import logging
+from urllib.parse import urlencode
+from app.services.google_places_batch import GooglePlacesBatch
+from app.services.http_client import get_client
+from app.services.normalization import normalize_text
+from app.services.single_flight import get_flight
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Pooled client with Places-specific timeouts and retries
+http = get_client('google_places')
+
+class GooglePlacesDestinations:
+    """Search Google Places for destinations"""
+    
+    @classmethod
+    def search_destinations(cls, query):
+        """
+        Search for destinations using Google Places API
+        
+        Args:
+            query (str): The search query for destinations
+            
+        Returns:
+            list: List of destination dictionaries with standardized format
+        """
+        # Get API key from environment
+        api_key = os.environ.get('GOOGLE_MAPS_API_KEY')
+        if not api_key:
+            logger.warning("GOOGLE_MAPS_API_KEY not set in environment variables")
+            return []
+        
+        # Identical concurrent searches in this worker share one autocomplete call
+        return get_flight('google_places.search_destinations').do(
+            normalize_text(query), lambda: cls._search_destinations(query, api_key), timeout=http.deadline
+        )
+    
+    @classmethod
+    def _search_destinations(cls, query, api_key):
+        """Run an autocomplete search and resolve the predictions to destinations"""
+        logger.info(f"Searching destinations using Google Places API for: {query}")
+        
+        try:
+            # Use the autocomplete API which is optimized for destination search
+            base_url = "https://maps.googleapis.com/maps/api/place/autocomplete/json"
+            
+            params = {
+                'input': query,
+                'types': '(cities)',  # Focus on cities, regions, and countries
+                'key': api_key
+            }
+            
+            url = f"{base_url}?{urlencode(params)}"
+            logger.info(f"Making Places Autocomplete API request for: {query}")
+            
+            response = http.get(url)
+            data = response.json()
+            
+            # Log the response status
+            logger.info(f"Places Autocomplete API response status: {data.get('status')}")
+            
+            if data.get('status') != 'OK':
+                if data.get('error_message'):
+                    logger.warning(f"Places Autocomplete API error: {data.get('error_message')}")
+                return []
+            
+            predictions = data.get('predictions', [])
+            logger.info(f"Found {len(predictions)} predictions from Places Autocomplete API")
+            
+            # Get details for the top 5 predictions concurrently
+            place_ids = [prediction.get('place_id') for prediction in predictions[:5] if prediction.get('place_id')]
+            
+            results = []
+            for place_details in GooglePlacesBatch.get_place_details(place_ids, api_key):
+                # Extract relevant information and format according to our standard
+                destination = cls._format_place_as_destination(place_details)
+                if destination:
+                    results.append(destination)
+            
+            logger.info(f"Returning {len(results)} formatted destination results")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error in Google Places API destination search: {str(e)}")
+            return []
+    
+    @classmethod
+    def _format_place_as_destination(cls, place_details):
+        """
+        Format Google Places API result as a destination
+        
+        Args:
+            place_details (dict): Place details from Google Places API
+            
+        Returns:
+            dict: Formatted destination dictionary
+        """
+        if not place_details:
+            return None
+            
+        # Extract country and country code from address components
+        country = None
+        country_code = None
+        address_components = place_details.get('address_components', [])
+        for component in address_components:
+            if 'country' in component.get('types', []):
+                country = component.get('long_name')
+                country_code = component.get('short_name')
+                break
+        
+        # Get location data
+        geometry = place_details.get('geometry', {})
+        location = geometry.get('location', {})
+        
+        # Determine the type of place based on the types
+        types = place_details.get('types', [])
+        place_type = None
+        if 'locality' in types or 'administrative_area_level_3' in types:
+            place_type = 'city'
+        elif 'administrative_area_level_1' in types:
+            place_type = 'region'
+        elif 'country' in types:
+            place_type = 'country'
+        else:
+            place_type = 'place'
+        
+        # Create a display name that includes the country
+        name = place_details.get('name', '')
+        formatted_address = place_details.get('formatted_address', '')
+        display_name = formatted_address if formatted_address else name
+        
+        return {
+            'id': None,  # External results don't have database IDs
+            'name': name,
+            'display_name': display_name,
+            'country': country,
+            'country_code': country_code,
+            'type': place_type,
+            'latitude': location.get('lat'),
+            'longitude': location.get('lng'),
+            'google_place_id': place_details.get('place_id'),
+            'source': 'google_places'
+        }
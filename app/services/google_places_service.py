@@ -6,10 +6,12 @@ This service is used by the Activity model to standardize place data.
 """
 import os
 import logging
-import requests
 import json
 from urllib.parse import urlencode
 from dotenv import load_dotenv
+from app.services.http_client import get_client
+from app.services.place_cache_service import PlaceCacheService
+from app.services.single_flight import MISSING, get_flight
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,9 +19,21 @@ load_dotenv()
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Pooled client with Places-specific timeouts and retries
+http = get_client('google_places')
+
+# Statuses meaning the lookup ran and genuinely found nothing
+NO_MATCH_STATUSES = ('OK', 'ZERO_RESULTS')
+
+class GooglePlacesError(Exception):
+    """Raised when a Places API call fails, as opposed to finding no match"""
+
 class GooglePlacesService:
     """Service for interacting with Google Places API"""
     
+    # Provider name used for shared place cache entries
+    CACHE_PROVIDER = 'google_places'
+    
     @classmethod
     def find_place(cls, name, category=None, **kwargs):
         """
@@ -49,160 +63,84 @@ class GooglePlacesService:
         if kwargs.get('destination_country'):
             logger.info(f"Destination country: {kwargs.get('destination_country')}")
         
-        try:
-            # First try the Find Place API for exact matches
-            place_id = cls._find_place_id(name, api_key, **kwargs)
-            
-            # If we found a place_id, get the details
-            if place_id:
-                logger.info(f"Found place_id for {name}: {place_id}")
-                return cls._get_place_details(place_id, api_key)
-                
-            # If no exact match, try a broader search with the Places Text Search API
-            search_query = name
-            
-            # Add category to search if provided
-            if category:
-                search_query = f"{name} {category}"
-                
-            # Add vicinity/location context if available
-            search_vicinity = kwargs.get('search_vicinity')
-            destination_country = kwargs.get('destination_country')
-            
-            if search_vicinity:
-                search_query = f"{search_query} {search_vicinity}"
-            elif destination_country:
-                search_query = f"{search_query} {destination_country}"
-            
-            logger.info(f"No exact match found, trying text search with: {search_query}")    
-            return cls._text_search_place(search_query, api_key)
-                
-        except Exception as e:
-            logger.error(f"Error in Google Places API: {str(e)}")
+        # Serve repeat lookups from the shared cache without touching the network
+        cache_context = {
+            'category': category,
+            'search_vicinity': kwargs.get('search_vicinity'),
+            'destination_country': kwargs.get('destination_country')
+        }
+        cached_place = PlaceCacheService.get(cls.CACHE_PROVIDER, name, **cache_context)
+        if cached_place:
+            return cached_place
+        
+        # Names that recently found nothing in this vicinity are not retried until the entry expires
+        if PlaceCacheService.is_known_miss(cls.CACHE_PROVIDER, name, **cache_context):
+            logger.info(f"Skipping Google Places lookup for known miss: {name}")
             return None
-    
-    @classmethod
-    def search_destinations(cls, query):
-        """
-        Search for destinations using Google Places API
         
-        Args:
-            query (str): The search query for destinations
+        def lookup_and_cache():
+            try:
+                place = cls._lookup_place(name, category, api_key, **kwargs)
+            except Exception as e:
+                # Failed calls are not cached so the next request retries them
+                logger.error(f"Error in Google Places API: {str(e)}")
+                return None
             
-        Returns:
-            list: List of destination dictionaries with standardized format
-        """
-        # Get API key from environment
-        api_key = os.environ.get('GOOGLE_MAPS_API_KEY')
-        if not api_key:
-            logger.warning("GOOGLE_MAPS_API_KEY not set in environment variables")
-            return []
+            place = PlaceCacheService.trim_place_details(place)
+            if place:
+                PlaceCacheService.set(cls.CACHE_PROVIDER, name, place, **cache_context)
+            else:
+                PlaceCacheService.record_miss(cls.CACHE_PROVIDER, name, **cache_context)
+            return place
         
-        logger.info(f"Searching destinations using Google Places API for: {query}")
+        def cached_result():
+            cached = PlaceCacheService.get(cls.CACHE_PROVIDER, name, **cache_context)
+            if cached:
+                return cached
+            if PlaceCacheService.is_known_miss(cls.CACHE_PROVIDER, name, **cache_context):
+                return None
+            return MISSING
         
-        try:
-            # Use the autocomplete API which is optimized for destination search
-            base_url = "https://maps.googleapis.com/maps/api/place/autocomplete/json"
-            
-            params = {
-                'input': query,
-                'types': '(cities)',  # Focus on cities, regions, and countries
-                'key': api_key
-            }
-            
-            url = f"{base_url}?{urlencode(params)}"
-            logger.info(f"Making Places Autocomplete API request for: {query}")
-            
-            response = requests.get(url)
-            data = response.json()
-            
-            # Log the response status
-            logger.info(f"Places Autocomplete API response status: {data.get('status')}")
-            
-            if data.get('status') != 'OK':
-                if data.get('error_message'):
-                    logger.warning(f"Places Autocomplete API error: {data.get('error_message')}")
-                return []
-            
-            predictions = data.get('predictions', [])
-            logger.info(f"Found {len(predictions)} predictions from Places Autocomplete API")
-            
-            results = []
-            # Get details for each prediction
-            for prediction in predictions[:5]:  # Limit to top 5 results
-                place_id = prediction.get('place_id')
-                if place_id:
-                    place_details = cls._get_place_details(place_id, api_key)
-                    if place_details:
-                        # Extract relevant information and format according to our standard
-                        destination = cls._format_place_as_destination(place_details)
-                        if destination:
-                            results.append(destination)
-            
-            logger.info(f"Returning {len(results)} formatted destination results")
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error in Google Places API destination search: {str(e)}")
-            return []
+        # Friends submitting the same place at once share one lookup, across workers too
+        cache_key = PlaceCacheService.make_key(cls.CACHE_PROVIDER, name, **cache_context)
+        return get_flight('google_places.find_place').do(
+            cache_key, lookup_and_cache, recheck=cached_result, timeout=http.deadline
+        )
     
     @classmethod
-    def _format_place_as_destination(cls, place_details):
+    def _lookup_place(cls, name, category, api_key, **kwargs):
         """
-        Format Google Places API result as a destination
+        Resolve a place over the network: Find Place first, then Text Search
         
-        Args:
-            place_details (dict): Place details from Google Places API
-            
-        Returns:
-            dict: Formatted destination dictionary
+        Returns None only when both searches found no match; API failures
+        raise GooglePlacesError so they are not mistaken for a miss.
         """
-        if not place_details:
-            return None
-            
-        # Extract country and country code from address components
-        country = None
-        country_code = None
-        address_components = place_details.get('address_components', [])
-        for component in address_components:
-            if 'country' in component.get('types', []):
-                country = component.get('long_name')
-                country_code = component.get('short_name')
-                break
+        # First try the Find Place API for exact matches
+        place_id = cls._find_place_id(name, api_key, **kwargs)
         
-        # Get location data
-        geometry = place_details.get('geometry', {})
-        location = geometry.get('location', {})
+        # If we found a place_id, get the details
+        if place_id:
+            logger.info(f"Found place_id for {name}: {place_id}")
+            return cls._get_required_place_details(place_id, api_key)
+            
+        # If no exact match, try a broader search with the Places Text Search API
+        search_query = name
         
-        # Determine the type of place based on the types
-        types = place_details.get('types', [])
-        place_type = None
-        if 'locality' in types or 'administrative_area_level_3' in types:
-            place_type = 'city'
-        elif 'administrative_area_level_1' in types:
-            place_type = 'region'
-        elif 'country' in types:
-            place_type = 'country'
-        else:
-            place_type = 'place'
+        # Add category to search if provided
+        if category:
+            search_query = f"{name} {category}"
+            
+        # Add vicinity/location context if available
+        search_vicinity = kwargs.get('search_vicinity')
+        destination_country = kwargs.get('destination_country')
         
-        # Create a display name that includes the country
-        name = place_details.get('name', '')
-        formatted_address = place_details.get('formatted_address', '')
-        display_name = formatted_address if formatted_address else name
+        if search_vicinity:
+            search_query = f"{search_query} {search_vicinity}"
+        elif destination_country:
+            search_query = f"{search_query} {destination_country}"
         
-        return {
-            'id': None,  # External results don't have database IDs
-            'name': name,
-            'display_name': display_name,
-            'country': country,
-            'country_code': country_code,
-            'type': place_type,
-            'latitude': location.get('lat'),
-            'longitude': location.get('lng'),
-            'google_place_id': place_details.get('place_id'),
-            'source': 'google_places'
-        }
+        logger.info(f"No exact match found, trying text search with: {search_query}")    
+        return cls._text_search_place(search_query, api_key)
     
     @classmethod
     def _find_place_id(cls, name, api_key, **kwargs):
@@ -228,7 +166,7 @@ class GooglePlacesService:
         url = f"{base_url}?{urlencode(params)}"
         logger.info(f"Making FindPlace API request for: {name}")
         
-        response = requests.get(url)
+        response = http.get(url)
         data = response.json()
         
         # Log the response status
@@ -244,11 +182,14 @@ class GooglePlacesService:
                     logger.warning(f"Error message: {data.get('error_message')}")
             elif not data.get('candidates'):
                 logger.info(f"FindPlace API returned no candidates for: {name}")
+        
+        if data.get('status') not in NO_MATCH_STATUSES:
+            raise GooglePlacesError(f"FindPlace API status {data.get('status')}")
             
         return None
     
     @classmethod
-    def _get_place_details(cls, place_id, api_key):
+    def get_place_details(cls, place_id, api_key, deadline=None):
         """Get detailed information about a place using the Place Details API"""
         base_url = "https://maps.googleapis.com/maps/api/place/details/json"
         
@@ -261,7 +202,7 @@ class GooglePlacesService:
         url = f"{base_url}?{urlencode(params)}"
         logger.info(f"Making PlaceDetails API request for place_id: {place_id}")
         
-        response = requests.get(url)
+        response = http.get(url, deadline=deadline)
         data = response.json()
         
         # Log the response status
@@ -289,7 +230,7 @@ class GooglePlacesService:
         url = f"{base_url}?{urlencode(params)}"
         logger.info(f"Making TextSearch API request for query: {query}")
         
-        response = requests.get(url)
+        response = http.get(url)
         data = response.json()
         
         # Log the response status
@@ -300,7 +241,7 @@ class GooglePlacesService:
             place_id = data['results'][0].get('place_id')
             if place_id:
                 logger.info(f"Using first result with place_id: {place_id}")
-                return cls._get_place_details(place_id, api_key)
+                return cls._get_required_place_details(place_id, api_key)
         else:
             if data.get('status') != 'OK':
                 logger.warning(f"TextSearch API returned non-OK status: {data.get('status')}")
@@ -308,5 +249,16 @@ class GooglePlacesService:
                     logger.warning(f"Error message: {data.get('error_message')}")
             elif not data.get('results'):
                 logger.info(f"TextSearch API returned no results for query: {query}")
+        
+        if data.get('status') not in NO_MATCH_STATUSES:
+            raise GooglePlacesError(f"TextSearch API status {data.get('status')}")
                 
-        return None 
\ No newline at end of file
+        return None
+    
+    @classmethod
+    def _get_required_place_details(cls, place_id, api_key):
+        """Get place details for a known place_id, raising if the Details call fails"""
+        place_details = cls.get_place_details(place_id, api_key)
+        if not place_details:
+            raise GooglePlacesError(f"PlaceDetails API returned no result for place_id: {place_id}")
+        return place_details 
\ No newline at end of file
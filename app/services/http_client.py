@@ -0,0 +1,229 @@
+"""
+HTTP Client
+
+Shared outbound HTTP client for external services (Google Places, Nominatim,
+OpenAI, Resend). Each service gets one pooled requests.Session per worker
+process, so connections are kept alive between calls, plus its own connect
+and read timeouts, a bounded retry budget with jittered exponential backoff,
+and an overall per-request deadline.
+"""
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Per-service settings. Timeouts are in seconds; deadline bounds the whole call
+# including retries. Connect timeouts are always retried; other failures and
+# retryable statuses are only retried for methods listed in retry_methods.
+# retry_read_timeouts=False keeps a timed-out request from being sent again
+# when the server may still have done (and billed for) the work.
+SERVICE_PROFILES = {
+    'google_places': {
+        'connect_timeout': 3.05,
+        'read_timeout': 10,
+        'deadline': 15,
+        'max_retries': 2,
+        'retry_methods': ('GET',),
+    },
+    'nominatim': {
+        'connect_timeout': 3.05,
+        'read_timeout': 10,
+        'deadline': 12,
+        # The nominatim rate limiter grants one request per search; a retry would be a second
+        'max_retries': 0,
+        'retry_methods': (),
+    },
+    'openai': {
+        'connect_timeout': 5,
+        'read_timeout': 60,
+        'deadline': 90,
+        'max_retries': 2,
+        'retry_methods': ('POST',),
+        'retry_read_timeouts': False,
+    },
+    'openai_audio': {
+        'connect_timeout': 5,
+        'read_timeout': 90,
+        'deadline': 100,
+        'max_retries': 1,
+        'retry_methods': ('POST',),
+        'retry_read_timeouts': False,
+    },
+    'resend': {
+        'connect_timeout': 5,
+        'read_timeout': 10,
+        'deadline': 15,
+        'max_retries': 1,
+        'retry_methods': (),  # Don't risk sending the same email twice
+    },
+}
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when a request's overall deadline runs out"""
+
+class HttpClient:
+    """Pooled HTTP client for a single external service"""
+
+    BACKOFF_BASE = 0.25
+    BACKOFF_MAX = 4.0
+
+    def __init__(self, service, connect_timeout, read_timeout, deadline, max_retries,
+                 retry_methods=(), retry_read_timeouts=True, pool_maxsize=10):
+        self.service = service
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.retry_methods = tuple(retry_methods)
+        self.retry_read_timeouts = retry_read_timeouts
+        self.pool_maxsize = pool_maxsize
+
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'deadline_exceeded': 0}
+
+    @property
+    def session(self):
+        """The pooled session, created lazily so each worker process gets its own"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_maxsize, max_retries=0)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, deadline=None, **kwargs):
+        """
+        Send a request with the service's timeouts, retries and deadline
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            deadline (float, optional): Overall time budget in seconds, overriding the service default
+            **kwargs: Passed through to requests (params, headers, json, files, stream...)
+
+        Returns:
+            requests.Response: The final response (which may still be a retryable
+            status if the retry budget ran out)
+
+        Raises:
+            DeadlineExceeded: If the deadline ran out before a response arrived
+            requests.RequestException: If the final attempt failed
+        """
+        method = method.upper()
+        budget = self.deadline if deadline is None else deadline
+        expires_at = time.monotonic() + budget
+        attempt = 0
+
+        while True:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                self._count('deadline_exceeded')
+                raise DeadlineExceeded(f"{self.service} request exceeded its {budget}s deadline: {method} {url}")
+
+            timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+            self._count('requests')
+
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A connect timeout never reached the server; other failures might have
+                retryable = isinstance(e, requests.ConnectTimeout) or (
+                    method in self.retry_methods
+                    and (self.retry_read_timeouts or not isinstance(e, requests.ReadTimeout))
+                )
+                if attempt >= self.max_retries or not retryable:
+                    self._count('failures')
+                    raise
+                logger.warning(f"{self.service} request failed ({e.__class__.__name__}), retrying: {method} {url}")
+                delay = self._backoff(attempt)
+            else:
+                if (response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries
+                        or method not in self.retry_methods):
+                    return response
+                logger.warning(f"{self.service} returned {response.status_code}, retrying: {method} {url}")
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                if delay >= expires_at - time.monotonic():
+                    # No time left to retry; hand the error response to the caller
+                    return response
+                response.close()
+
+            self._sleep_before_retry(delay, expires_at)
+            attempt += 1
+
+    def stats(self):
+        """Return this client's request counters"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _backoff(self, attempt):
+        # Full jitter: spreads retries from concurrent workers apart
+        return random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * (2 ** attempt)))
+
+    def _sleep_before_retry(self, delay, expires_at):
+        remaining = expires_at - time.monotonic()
+        if delay >= remaining:
+            # Sleeping would leave no time for the retry itself
+            self._count('deadline_exceeded')
+            raise DeadlineExceeded(f"{self.service} retry budget exhausted by its deadline")
+        self._count('retries')
+        time.sleep(delay)
+
+    @staticmethod
+    def _retry_after(response):
+        value = response.headers.get('Retry-After')
+        try:
+            return min(float(value), HttpClient.BACKOFF_MAX) if value is not None else None
+        except ValueError:
+            return None
+
+    def _count(self, counter):
+        with self._stats_lock:
+            self._stats[counter] += 1
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(service):
+    """
+    Get the shared client for a service
+
+    Args:
+        service (str): A key of SERVICE_PROFILES
+
+    Returns:
+        HttpClient: The process-wide client for that service
+    """
+    client = _clients.get(service)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(service)
+            if client is None:
+                client = HttpClient(service, **SERVICE_PROFILES[service])
+                _clients[service] = client
+    return client
+
+def client_stats():
+    """Return request counters for every client created in this process"""
+    return {service: client.stats() for service, client in _clients.items()}
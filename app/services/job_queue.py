@@ -0,0 +1,279 @@
+"""
+Job Queue
+
+Database-backed queue for slow work that shouldn't hold a web thread, such
+as AI extraction. The web process enqueues a job and hands the client its
+token; a worker process (`flask run-worker`, see JobWorker) claims queued
+jobs oldest first and runs the handler registered for the job's kind. A
+claim is a single conditional UPDATE, so several workers can share the
+table, and a running job whose worker died is picked up again once its
+lease expires.
+
+With JOB_QUEUE_INLINE set (the default, for development without a worker)
+jobs run in the enqueuing request instead. Queue reads and writes use their
+own connection so they never commit or roll back the caller's session.
+"""
+import logging
+import secrets
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, insert, or_, and_, select, update
+
+from app.database import db
+from app.database.models import BackgroundJob
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+jobs = BackgroundJob.__table__
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+FINISHED = (SUCCEEDED, FAILED)
+
+def claimable(lease_expired=None):
+    """Condition for queued jobs, plus running ones started before lease_expired"""
+    if lease_expired is None:
+        return jobs.c.status == QUEUED
+    return or_(jobs.c.status == QUEUED, and_(jobs.c.status == RUNNING, jobs.c.started_at < lease_expired))
+
+class JobQueue:
+    """Enqueue, claim and run background jobs"""
+
+    # Finished jobs sampled for the timing metrics
+    TIMING_SAMPLE_SIZE = 200
+
+    _handlers = {}  # kind -> callable(payload) returning a JSON-serializable result
+    _current = threading.local()  # The job this thread is running, for report_progress
+    _lock = threading.Lock()
+    _stats = {'enqueued': 0, 'run': 0, 'succeeded': 0, 'failed': 0, 'run_seconds': 0.0, 'max_run_seconds': 0.0}
+
+    @classmethod
+    def handler(cls, kind):
+        """
+        Register the function that runs jobs of a kind
+
+        Args:
+            kind (str): Job kind, e.g. 'extract_recommendations'
+
+        Returns:
+            callable: Decorator that registers and returns the function
+        """
+        def register(func):
+            cls._handlers[kind] = func
+            return func
+        return register
+
+    @classmethod
+    def enqueue(cls, kind, payload=None):
+        """
+        Add a job to the queue
+
+        Args:
+            kind (str): Registered job kind
+            payload (dict, optional): Arguments for the handler
+
+        Returns:
+            str: Token for following the job
+        """
+        if kind not in cls._handlers:
+            raise ValueError(f"No job handler registered for '{kind}'")
+
+        token = secrets.token_hex(16)
+        with db.engine.begin() as conn:
+            job_id = conn.execute(
+                insert(jobs).values(
+                    token=token,
+                    kind=kind,
+                    payload=payload,
+                    status=QUEUED,
+                    attempts=0,
+                    created_at=datetime.utcnow()
+                )
+            ).inserted_primary_key[0]
+        cls._count('enqueued')
+        logger.info(f"Enqueued {kind} job {job_id}")
+
+        if current_app.config.get('JOB_QUEUE_INLINE', True):
+            job = cls.claim_job(job_id, 'inline')
+            if job is not None:
+                cls.run(job)
+        return token
+
+    @classmethod
+    def get(cls, token):
+        """
+        Look up a job by token
+
+        Args:
+            token (str): Token returned by enqueue
+
+        Returns:
+            dict: The job's columns plus its place in the queue, or None if unknown
+        """
+        with db.engine.connect() as conn:
+            row = conn.execute(select(jobs).where(jobs.c.token == token)).mappings().first()
+            if row is None:
+                return None
+            job = dict(row)
+            job['position'] = None
+            if job['status'] == QUEUED:
+                job['position'] = conn.execute(
+                    select(func.count()).select_from(jobs)
+                    .where(jobs.c.status == QUEUED, jobs.c.id < job['id'])
+                ).scalar()
+        return job
+
+    @classmethod
+    def claim_job(cls, job_id, worker_id, lease_expired=None):
+        """
+        Mark one job running for a worker, unless someone else got it first
+
+        Args:
+            job_id (int): The job to claim
+            worker_id (str): Name of the claiming worker
+            lease_expired (datetime, optional): Also take the job over if it is
+                running but was started before this
+
+        Returns:
+            dict: The claimed job's columns, or None if it wasn't claimable
+        """
+        with db.engine.begin() as conn:
+            claimed = conn.execute(
+                update(jobs)
+                .where(jobs.c.id == job_id, claimable(lease_expired))
+                .values(
+                    status=RUNNING,
+                    locked_by=worker_id,
+                    started_at=datetime.utcnow(),
+                    attempts=jobs.c.attempts + 1,
+                    progress=None
+                )
+            ).rowcount
+            if not claimed:
+                return None
+            return dict(conn.execute(select(jobs).where(jobs.c.id == job_id)).mappings().one())
+
+    @classmethod
+    def run(cls, job):
+        """
+        Run a claimed job and record its result or error
+
+        Args:
+            job (dict): Job returned by claim_job
+        """
+        handler = cls._handlers.get(job['kind'])
+        started = time.monotonic()
+        cls._current.job = job
+        try:
+            if handler is None:
+                raise ValueError(f"No job handler registered for '{job['kind']}'")
+            result = handler(job['payload'] or {})
+            status, error = SUCCEEDED, None
+        except Exception as e:
+            logger.error(f"Job {job['id']} ({job['kind']}) failed: {e}")
+            logger.error(traceback.format_exc())
+            result, status, error = None, FAILED, str(e)
+        finally:
+            cls._current.job = None
+        elapsed = time.monotonic() - started
+
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(jobs)
+                .where(jobs.c.id == job['id'], jobs.c.locked_by == job['locked_by'])
+                .values(status=status, result=result, error=error, finished_at=datetime.utcnow())
+            )
+
+        with cls._lock:
+            cls._stats['run'] += 1
+            cls._stats[status] += 1
+            cls._stats['run_seconds'] += elapsed
+            cls._stats['max_run_seconds'] = max(cls._stats['max_run_seconds'], elapsed)
+        logger.info(f"Job {job['id']} ({job['kind']}) {status} in {elapsed:.2f}s")
+
+    @classmethod
+    def report_progress(cls, progress):
+        """
+        Record partial results of the job this thread is running, for clients
+        following it (e.g. recommendations extracted so far)
+
+        Args:
+            progress: JSON-serializable partial result, replacing any earlier one
+        """
+        cls.progress_reporter()(progress)
+
+    @classmethod
+    def progress_reporter(cls):
+        """
+        Bind report_progress to the job this thread is running, for handlers
+        that report from helper threads (which have no job or app context)
+
+        Returns:
+            callable: Takes the progress to record; does nothing outside a job
+        """
+        job = getattr(cls._current, 'job', None)
+        if job is None:
+            return lambda progress: None
+        engine = db.engine
+
+        def report(progress):
+            with engine.begin() as conn:
+                conn.execute(
+                    update(jobs)
+                    .where(jobs.c.id == job['id'], jobs.c.locked_by == job['locked_by'])
+                    .values(progress=progress)
+                )
+        return report
+
+    @classmethod
+    def stats(cls):
+        """
+        Queue depth and job timings
+
+        Depth and timings come from the table, so they cover every worker;
+        'process' counts only the jobs run by this process.
+        """
+        now = datetime.utcnow()
+        with db.engine.connect() as conn:
+            depth = dict(conn.execute(
+                select(jobs.c.status, func.count()).group_by(jobs.c.status)
+            ).all())
+            oldest_queued = conn.execute(
+                select(func.min(jobs.c.created_at)).where(jobs.c.status == QUEUED)
+            ).scalar()
+            recent = conn.execute(
+                select(jobs.c.created_at, jobs.c.started_at, jobs.c.finished_at)
+                .where(jobs.c.status.in_(FINISHED), jobs.c.started_at.is_not(None))
+                .order_by(jobs.c.id.desc())
+                .limit(cls.TIMING_SAMPLE_SIZE)
+            ).all()
+
+        waits = [(row.started_at - row.created_at).total_seconds() for row in recent if row.created_at]
+        runs = [(row.finished_at - row.started_at).total_seconds() for row in recent if row.finished_at]
+        with cls._lock:
+            process = dict(cls._stats)
+
+        return {
+            'depth': {status: depth.get(status, 0) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)},
+            'oldest_queued_seconds': round((now - oldest_queued).total_seconds(), 3) if oldest_queued else None,
+            'recent': {
+                'jobs': len(recent),
+                'avg_wait_seconds': round(sum(waits) / len(waits), 3) if waits else None,
+                'max_wait_seconds': round(max(waits), 3) if waits else None,
+                'avg_run_seconds': round(sum(runs) / len(runs), 3) if runs else None,
+                'max_run_seconds': round(max(runs), 3) if runs else None,
+            },
+            'process': process,
+        }
+
+    @classmethod
+    def _count(cls, name):
+        with cls._lock:
+            cls._stats[name] += 1
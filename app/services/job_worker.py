@@ -0,0 +1,129 @@
+"""
+Job Worker
+
+The loop behind `flask run-worker`: claims the oldest runnable job from the
+JobQueue table, runs it in a fresh app context and sleeps when the queue is
+empty. Jobs whose worker stopped responding are retried once their lease
+expires, or failed once they have used up their attempts, and finished jobs
+are purged after JOB_QUEUE_RETENTION_HOURS.
+"""
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, select, update
+
+from app.database import db
+from app.services.job_queue import FAILED, FINISHED, RUNNING, JobQueue, claimable, jobs
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+class JobWorker:
+    """Claim and run queued jobs"""
+
+    DEFAULT_LEASE_SECONDS = 300
+    DEFAULT_MAX_ATTEMPTS = 3
+
+    @classmethod
+    def work(cls, worker_id=None, poll_interval=0.5, max_jobs=None, burst=False):
+        """
+        Run jobs until stopped
+
+        Args:
+            worker_id (str, optional): Name recorded on claimed jobs; defaults to host:pid
+            poll_interval (float): Seconds to sleep when the queue is empty
+            max_jobs (int, optional): Stop after running this many jobs
+            burst (bool): Stop as soon as the queue is empty
+
+        Returns:
+            int: Number of jobs run
+        """
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        app = current_app._get_current_object()
+        retention = timedelta(hours=current_app.config.get('JOB_QUEUE_RETENTION_HOURS', 24))
+        next_purge = 0.0
+        ran = 0
+        logger.info(f"Job worker {worker_id} started")
+
+        while max_jobs is None or ran < max_jobs:
+            if time.monotonic() >= next_purge:
+                cls.purge(datetime.utcnow() - retention)
+                next_purge = time.monotonic() + 3600
+
+            job = cls.claim_next(worker_id)
+            if job is None:
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+            # Each job gets its own app context, and so its own db.session,
+            # which is removed when the job ends instead of carrying over
+            with app.app_context():
+                JobQueue.run(job)
+            ran += 1
+
+        logger.info(f"Job worker {worker_id} stopping after {ran} jobs")
+        return ran
+
+    @classmethod
+    def claim_next(cls, worker_id):
+        """
+        Claim the oldest runnable job for a worker
+
+        Queued jobs come first; a running job is only taken over once its
+        lease has expired. Jobs that have used up their attempts are failed.
+
+        Args:
+            worker_id (str): Name of the claiming worker
+
+        Returns:
+            dict: The claimed job's columns, or None if there is nothing to run
+        """
+        config = current_app.config
+        lease_expired = datetime.utcnow() - timedelta(seconds=config.get('JOB_QUEUE_LEASE_SECONDS', cls.DEFAULT_LEASE_SECONDS))
+        max_attempts = config.get('JOB_QUEUE_MAX_ATTEMPTS', cls.DEFAULT_MAX_ATTEMPTS)
+
+        with db.engine.begin() as conn:
+            abandoned = conn.execute(
+                update(jobs)
+                .where(jobs.c.status == RUNNING, jobs.c.started_at < lease_expired, jobs.c.attempts >= max_attempts)
+                .values(status=FAILED, error='Worker stopped responding', finished_at=datetime.utcnow())
+            ).rowcount
+        if abandoned:
+            logger.warning(f"Failed {abandoned} jobs abandoned by their workers")
+
+        # Another worker may win the race for a job; try the next one
+        for _ in range(5):
+            with db.engine.connect() as conn:
+                job_id = conn.execute(
+                    select(jobs.c.id).where(claimable(lease_expired)).order_by(jobs.c.id).limit(1)
+                ).scalar()
+            if job_id is None:
+                return None
+            job = JobQueue.claim_job(job_id, worker_id, lease_expired)
+            if job is not None:
+                return job
+        return None
+
+    @staticmethod
+    def purge(finished_before):
+        """
+        Delete finished jobs
+
+        Args:
+            finished_before (datetime): Only jobs finished before this
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        with db.engine.begin() as conn:
+            deleted = conn.execute(
+                delete(jobs).where(jobs.c.status.in_(FINISHED), jobs.c.finished_at < finished_before)
+            ).rowcount
+        if deleted:
+            logger.info(f"Purged {deleted} finished jobs")
+        return deleted
@@ -0,0 +1,80 @@
+"""
+JSON Stream Parsing
+
+Incremental parser for a JSON array of objects that arrives a few
+characters at a time, e.g. a streamed chat completion. Each object is
+returned as soon as its closing brace arrives, so callers can show results
+while the rest of the array is still being generated. Text before the
+opening bracket (such as a model's preamble) is skipped.
+"""
+import json
+import logging
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+class JSONArrayStreamParser:
+    """Yields the objects of a streamed JSON array as each one closes"""
+
+    def __init__(self):
+        self._buffer = []  # Characters of the object being read
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.parsed = 0
+
+    def feed(self, chunk):
+        """
+        Consume the next piece of the stream
+
+        Args:
+            chunk (str): Next characters of the stream
+
+        Returns:
+            list: Objects completed by this chunk, in order
+        """
+        completed = []
+        for char in chunk:
+            if not self._in_array:
+                self._in_array = char == '['
+                continue
+
+            if self._depth == 0:
+                # Between objects: only an opening brace starts the next one
+                if char == '{':
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode(''.join(self._buffer))
+                    self._buffer = []
+                    if item is not None:
+                        completed.append(item)
+        return completed
+
+    def _decode(self, text):
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping unparseable streamed object: '{text[:100]}'")
+            return None
+        if not isinstance(item, dict):
+            return None
+        self.parsed += 1
+        return item
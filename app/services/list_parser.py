@@ -0,0 +1,128 @@
+"""
+Recommendation List Parser
+
+Many submissions are already a list: one place per line, optionally
+bulleted or numbered, optionally followed by " - description". Those are
+parsed here without an AI round trip. Every line has to carry an explicit
+list signal (a bullet or number, a URL or a " - description"), so short
+notes like "Thanks!" aren't saved as places; each line is then scored on
+how much it looks like a list entry (a short name, no sentence
+punctuation, a bullet or capitalized start) and the submission's
+confidence is its weakest line's score. Only submissions at or above
+EXTRACTION_LIST_MIN_CONFIDENCE are returned, everything else goes on to
+OpenAI as before.
+"""
+import logging
+import re
+import threading
+
+from flask import current_app
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+_BULLET_RE = re.compile(r'^(?:[-*•·–—>]|\d{1,3}[.)])\s+')
+_DESCRIPTION_SEPARATOR_RE = re.compile(r'\s+[-–—]\s+')
+_URL_RE = re.compile(r'(?:https?://|www\.)\S+', re.IGNORECASE)
+_SENTENCE_RE = re.compile(r'[.!?;]$|[.!?]\s|,\s|\b(?:and|or|try|go|should)\s', re.IGNORECASE)
+
+class ListParser:
+    """Deterministic extraction of list-shaped recommendation text"""
+
+    DEFAULT_MIN_CONFIDENCE = 0.8
+    MAX_NAME_WORDS = 6
+    MAX_NAME_CHARS = 60
+
+    _stats_lock = threading.Lock()
+    _stats = {'attempts': 0, 'hits': 0}
+
+    @classmethod
+    def extract(cls, text):
+        """
+        Parse text as a list of recommendations if it confidently is one
+
+        Args:
+            text (str): The submitted recommendation text
+
+        Returns:
+            list: Recommendation dictionaries (name, type, website_url,
+            description), or None if the text should go to the AI service
+        """
+        if not current_app.config.get('EXTRACTION_LIST_PARSER', True):
+            return None
+
+        recommendations, confidence = cls.parse(text)
+        hit = confidence >= current_app.config.get('EXTRACTION_LIST_MIN_CONFIDENCE', cls.DEFAULT_MIN_CONFIDENCE)
+        with cls._stats_lock:
+            cls._stats['attempts'] += 1
+            cls._stats['hits'] += int(hit)
+
+        logger.info(f"List parser confidence {confidence:.2f} for {len(recommendations)} items ({'used' if hit else 'skipped'})")
+        return recommendations if hit else None
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Split text into one recommendation per line and score the result
+
+        Args:
+            text (str): The submitted recommendation text
+
+        Returns:
+            tuple: (recommendations, confidence) with confidence between 0 and 1,
+            the lowest line score; 0 for fewer than two entries, since a single
+            line is as likely a sentence
+        """
+        lines = [line.strip() for line in (text or '').splitlines() if line.strip()]
+        # A heading like "Our Tokyo favourites:" isn't an entry
+        if len(lines) > 2 and lines[0].endswith(':') and not _BULLET_RE.match(lines[0]):
+            lines = lines[1:]
+        if len(lines) < 2:
+            return [], 0.0
+
+        recommendations = []
+        scores = []
+        for line in lines:
+            recommendation, score = cls._parse_line(line)
+            recommendations.append(recommendation)
+            scores.append(score)
+        return recommendations, min(scores)
+
+    @classmethod
+    def stats(cls):
+        """Return parser counters for this process, with the share of submissions it answered"""
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+        stats['hit_rate'] = round(stats['hits'] / stats['attempts'], 3) if stats['attempts'] else None
+        return stats
+
+    @classmethod
+    def _parse_line(cls, line):
+        """Parse one list entry, returning (recommendation, score); 0 without a list signal"""
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            line = line[bullet.end():]
+
+        urls = _URL_RE.findall(line)
+        website_url = urls[0].rstrip('.,;)') if urls else ''
+        if website_url and not website_url.lower().startswith('http'):
+            website_url = f"https://{website_url}"
+        line = _URL_RE.sub('', line).strip()
+
+        parts = _DESCRIPTION_SEPARATOR_RE.split(line, maxsplit=1)
+        name = parts[0].strip(' :-–—')
+        description = parts[1].strip() if len(parts) > 1 else ''
+
+        recommendation = {'name': name, 'type': '', 'website_url': website_url, 'description': description}
+        if not (bullet or website_url or description):
+            return recommendation, 0.0
+
+        score = 0.0
+        if name and len(name) <= cls.MAX_NAME_CHARS and len(name.split()) <= cls.MAX_NAME_WORDS:
+            score += 0.5
+        if name and not _SENTENCE_RE.search(name):
+            score += 0.25
+        if bullet or name[:1].isupper() or name[:1].isdigit():
+            score += 0.25
+
+        return recommendation, score
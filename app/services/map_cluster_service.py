@@ -0,0 +1,227 @@
+"""
+Map Cluster Service
+
+Serves a trip's activities as GeoJSON for the trip map, clustered on the
+server so big guides don't put hundreds of markers in the browser. Points
+are bucketed on a Web Mercator grid that gets finer with each zoom level
+(CELLS_PER_TILE cells across each 256px map tile); every occupied cell
+becomes one cluster at its members' centroid. All zoom tiers for a trip
+are computed together and memoized per trip content version, so a map
+panning and zooming only costs a bbox filter per request.
+"""
+import logging
+import math
+import threading
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import case, func, select
+
+from app.database import db
+from app.database.models import Activity, Recommendation
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+MapPoint = namedtuple('MapPoint', ['id', 'name', 'category', 'place_id', 'lat', 'lng', 'recommendation_count', 'description'])
+ClusterTiers = namedtuple('ClusterTiers', ['tiers', 'points', 'missing', 'bbox'])
+
+class MapClusterService:
+    """Builds and caches clustered GeoJSON for trip maps"""
+
+    # Above this zoom every point is returned on its own
+    MAX_CLUSTER_ZOOM = 16
+    # Grid cells across one 256px tile, i.e. clusters are roughly 64px apart
+    CELLS_PER_TILE = 4
+    # Coordinates are rounded to ~10cm, which is plenty for markers
+    COORDINATE_PRECISION = 6
+
+    TIER_MEMO_MAX_ENTRIES = 128
+    _lock = threading.Lock()
+    _memo = OrderedDict()  # (trip id, share token, version, filters) -> ClusterTiers
+    _stats = {'hits': 0, 'builds': 0}
+
+    @classmethod
+    def markers(cls, trip, zoom=None, bbox=None, categories=(), contributor_ids=()):
+        """
+        Get the trip's map markers as a GeoJSON FeatureCollection
+
+        Args:
+            trip: The Trip whose activities to map
+            zoom (int, optional): Map zoom level; points are unclustered if None
+                or above MAX_CLUSTER_ZOOM
+            bbox (tuple, optional): (west, south, east, north) of the visible
+                map; west > east means the view crosses the antimeridian
+            categories (iterable): Only activities in these categories
+            contributor_ids (iterable): Only activities recommended by these users
+
+        Returns:
+            dict: FeatureCollection whose bbox covers every located activity
+            and whose missing lists activities without coordinates
+        """
+        tiers = cls._tiers(trip, tuple(sorted(categories)), tuple(sorted(contributor_ids)))
+
+        if zoom is None or zoom > cls.MAX_CLUSTER_ZOOM:
+            features = [cls._point_feature(point) for point in tiers.points]
+        else:
+            features = tiers.tiers[max(0, zoom)]
+
+        if bbox is not None:
+            features = [feature for feature in features if cls._in_bbox(feature['geometry']['coordinates'], bbox)]
+
+        return {
+            'type': 'FeatureCollection',
+            'bbox': tiers.bbox,
+            'features': features,
+            'missing': tiers.missing,
+        }
+
+    @classmethod
+    def stats(cls):
+        """Return tier cache counters for this process"""
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['entries'] = len(cls._memo)
+        return stats
+
+    @classmethod
+    def _tiers(cls, trip, categories, contributor_ids):
+        # share_token keeps a reused trip id from matching an old entry
+        memo_key = (trip.id, trip.share_token, trip.content_version, categories, contributor_ids)
+        with cls._lock:
+            tiers = cls._memo.get(memo_key)
+            if tiers is not None:
+                cls._memo.move_to_end(memo_key)
+                cls._stats['hits'] += 1
+                return tiers
+
+        tiers = cls._build(cls._load_points(trip, categories, contributor_ids))
+
+        with cls._lock:
+            cls._memo[memo_key] = tiers
+            cls._stats['builds'] += 1
+            while len(cls._memo) > cls.TIER_MEMO_MAX_ENTRIES:
+                cls._memo.popitem(last=False)
+        return tiers
+
+    @staticmethod
+    def _load_points(trip, categories, contributor_ids):
+        """One aggregate row per recommended activity"""
+        query = (
+            select(
+                Activity.id, Activity.name, Activity.category, Activity.google_place_id,
+                Activity.latitude, Activity.longitude,
+                func.count(Recommendation.id).label('recommendation_count'),
+                # Any one of the notes, for the map's info panel
+                func.max(Recommendation.description).label('description')
+            )
+            .select_from(Recommendation)
+            .join(Activity, Activity.id == Recommendation.activity_id)
+            .where(Recommendation.trip_id == trip.id)
+            .group_by(Activity.id, Activity.name, Activity.category, Activity.google_place_id,
+                      Activity.latitude, Activity.longitude)
+            .order_by(func.min(Recommendation.id))
+        )
+        if categories:
+            query = query.where(Activity.category.in_(categories))
+        if contributor_ids:
+            by_contributor = case((Recommendation.author_id.in_(contributor_ids), 1), else_=0)
+            query = query.having(func.max(by_contributor) == 1)
+
+        return [MapPoint(*row) for row in db.session.execute(query).all()]
+
+    @classmethod
+    def _build(cls, rows):
+        points = []
+        missing = []
+        for point in rows:
+            # 0,0 is what failed lookups used to store; treat it as unknown
+            if point.lat is None or point.lng is None or (point.lat == 0 and point.lng == 0):
+                missing.append(point.name)
+            else:
+                points.append(point)
+
+        bbox = None
+        if points:
+            bbox = [
+                round(min(point.lng for point in points), cls.COORDINATE_PRECISION),
+                round(min(point.lat for point in points), cls.COORDINATE_PRECISION),
+                round(max(point.lng for point in points), cls.COORDINATE_PRECISION),
+                round(max(point.lat for point in points), cls.COORDINATE_PRECISION),
+            ]
+
+        projected = [(point, cls._project(point.lat, point.lng)) for point in points]
+        tiers = [cls._cluster(projected, zoom) for zoom in range(cls.MAX_CLUSTER_ZOOM + 1)]
+        logger.info(f"Built {len(tiers)} map cluster tiers for {len(points)} points")
+        return ClusterTiers(tiers, points, missing, bbox)
+
+    @classmethod
+    def _cluster(cls, projected, zoom):
+        """Bucket points into grid cells at this zoom; single-point cells stay points"""
+        cells_across = (2 ** zoom) * cls.CELLS_PER_TILE
+        cells = OrderedDict()
+        for point, (x, y) in projected:
+            cell = (min(int(x * cells_across), cells_across - 1), min(int(y * cells_across), cells_across - 1))
+            cells.setdefault(cell, []).append(point)
+
+        features = []
+        for members in cells.values():
+            if len(members) == 1:
+                features.append(cls._point_feature(members[0]))
+            else:
+                features.append(cls._cluster_feature(members))
+        return features
+
+    @classmethod
+    def _point_feature(cls, point):
+        return {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': cls._coordinates(point.lng, point.lat)},
+            'properties': {
+                'id': point.id,
+                'name': point.name,
+                'category': point.category,
+                'place_id': point.place_id,
+                'recommendation_count': point.recommendation_count,
+                'description': point.description,
+            },
+        }
+
+    @classmethod
+    def _cluster_feature(cls, members):
+        lngs = [point.lng for point in members]
+        lats = [point.lat for point in members]
+        precision = cls.COORDINATE_PRECISION
+        return {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': cls._coordinates(sum(lngs) / len(lngs), sum(lats) / len(lats))},
+            # Lets the client zoom straight to the cluster's extent
+            'bbox': [round(min(lngs), precision), round(min(lats), precision),
+                     round(max(lngs), precision), round(max(lats), precision)],
+            'properties': {
+                'cluster': True,
+                'point_count': len(members),
+            },
+        }
+
+    @classmethod
+    def _coordinates(cls, lng, lat):
+        return [round(lng, cls.COORDINATE_PRECISION), round(lat, cls.COORDINATE_PRECISION)]
+
+    @staticmethod
+    def _project(lat, lng):
+        """Web Mercator position of a coordinate, as fractions (0-1) of the world"""
+        lat = max(min(lat, 85.05112878), -85.05112878)
+        sin_lat = math.sin(math.radians(lat))
+        x = (lng + 180.0) / 360.0
+        y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+        return min(max(x, 0.0), 1.0), min(max(y, 0.0), 1.0)
+
+    @staticmethod
+    def _in_bbox(coordinates, bbox):
+        lng, lat = coordinates
+        west, south, east, north = bbox
+        if not south <= lat <= north:
+            return False
+        if west <= east:
+            return west <= lng <= east
+        return lng >= west or lng <= east
@@ -0,0 +1,146 @@
+"""
+Micro Batching
+
+Collects small concurrent calls into one batched call. The first caller
+to arrive leads a batch: it waits up to max_wait seconds (or until
+max_items callers have joined), takes the batch and runs it once for
+everyone, handing each caller its own result. Callers that arrived while
+a batch was already full wait for the next one, led by the oldest of them.
+Batching never adds more than max_wait to a call: the leader sends
+whatever it has when the window closes.
+
+A caller gets UNBATCHED back when it ended up alone or when the batch
+failed (or had no result for it), and should then make its own call.
+"""
+import logging
+import threading
+import time
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Returned to callers that should fall back to an individual call
+UNBATCHED = object()
+
+class _Waiter:
+    """A caller waiting for its batch's result (or to lead the next batch)"""
+
+    def __init__(self, item):
+        self.item = item
+        self.lead = False
+        self.done = False
+        self.result = UNBATCHED
+        self.wake = threading.Event()
+
+class MicroBatcher:
+    """A named group of batchable calls"""
+
+    def __init__(self, name):
+        self.name = name
+        self._pending = []
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._stats = {'batches': 0, 'batched_items': 0, 'unbatched': 0, 'failed_batches': 0, 'max_batch_size': 0}
+
+    def submit(self, item, run_batch, max_items, max_wait):
+        """
+        Add a call to the next batch and wait for its result
+
+        Args:
+            item: This caller's input
+            run_batch (callable): Takes a list of inputs and returns a list of
+                results in the same order (UNBATCHED for any it couldn't do)
+            max_items (int): Send the batch as soon as it has this many calls
+            max_wait (float): Longest time, in seconds, to wait for more calls
+
+        Returns:
+            This caller's result, or UNBATCHED
+        """
+        waiter = _Waiter(item)
+        with self._cond:
+            self._pending.append(waiter)
+            if len(self._pending) == 1:
+                waiter.lead = True
+            elif len(self._pending) >= max_items:
+                self._cond.notify_all()
+
+        while not waiter.done:
+            if waiter.lead:
+                self._lead(run_batch, max_items, max_wait)
+            else:
+                waiter.wake.wait()
+                waiter.wake.clear()
+        return waiter.result
+
+    def stats(self):
+        """Return this group's counters for this process"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        return stats
+
+    def _lead(self, run_batch, max_items, max_wait):
+        deadline = time.monotonic() + max_wait
+        with self._cond:
+            while len(self._pending) < max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = self._pending[:max_items]
+            del self._pending[:max_items]
+            # Whoever is left over leads the next batch
+            if self._pending:
+                self._pending[0].lead = True
+                self._pending[0].wake.set()
+
+            if len(batch) == 1:
+                self._stats['unbatched'] += 1
+            else:
+                self._stats['batches'] += 1
+                self._stats['batched_items'] += len(batch)
+                self._stats['max_batch_size'] = max(self._stats['max_batch_size'], len(batch))
+
+        results = [UNBATCHED] * len(batch)
+        if len(batch) > 1:
+            logger.info(f"Running {self.name} batch of {len(batch)} calls")
+            try:
+                batch_results = run_batch([waiter.item for waiter in batch])
+                if len(batch_results) != len(batch):
+                    raise ValueError(f"Expected {len(batch)} results, got {len(batch_results)}")
+                results = batch_results
+            except Exception as e:
+                logger.warning(f"{self.name} batch failed, falling back to individual calls: {str(e)}")
+                with self._lock:
+                    self._stats['failed_batches'] += 1
+
+        for waiter, result in zip(batch, results):
+            waiter.result = result
+            waiter.done = True
+            waiter.wake.set()
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+def get_batcher(name):
+    """
+    Get the shared micro-batcher for a kind of call
+
+    Args:
+        name (str): Group name, e.g. 'openai.extract_recommendations'
+
+    Returns:
+        MicroBatcher: The process-wide group
+    """
+    batcher = _batchers.get(name)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(name)
+            if batcher is None:
+                batcher = _batchers[name] = MicroBatcher(name)
+    return batcher
+
+def batch_stats():
+    """Return counters for every micro-batcher created in this process"""
+    return {name: batcher.stats() for name, batcher in _batchers.items()}
@@ -0,0 +1,37 @@
+"""
+Text Normalization
+
+Shared helpers for turning free-text names and queries into stable keys.
+Used for cache keys and name matching so "Café de Flore" and
+"cafe  de flore" resolve to the same entry.
+"""
+import re
+import unicodedata
+
+# Anything that isn't a letter, digit or whitespace is treated as a separator
+_PUNCTUATION_RE = re.compile(r'[^\w\s]|_', re.UNICODE)
+_WHITESPACE_RE = re.compile(r'\s+', re.UNICODE)
+
+def normalize_text(value):
+    """
+    Normalize a name or query for matching
+
+    Casefolds, strips accents, replaces punctuation with spaces and
+    collapses whitespace.
+
+    Args:
+        value (str): The text to normalize
+
+    Returns:
+        str: Normalized text ('' for empty input)
+    """
+    if not value:
+        return ''
+
+    # Decompose accented characters and drop the combining marks
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+    text = stripped.casefold()
+    text = _PUNCTUATION_RE.sub(' ', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
@@ -6,13 +6,17 @@ This service is used to find destination information as an alternative data sour
 """
 import os
 import logging
-import requests
-import time
 from urllib.parse import urlencode
+from app.services.http_client import get_client
+from app.services.place_cache_service import PlaceCacheService
+from app.services.rate_limiter import get_limiter
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Pooled client with Nominatim-specific timeouts and retries
+http = get_client('nominatim')
+
 class OpenStreetMapService:
     """Service for interacting with OpenStreetMap Nominatim API"""
     
@@ -22,8 +26,8 @@ class OpenStreetMapService:
     # User agent required by Nominatim's usage policy
     USER_AGENT = "RecApp/1.0 (https://recommendations.app)"
     
-    # Rate limiting - Nominatim requires max 1 request per second
-    last_request_time = 0
+    # Provider name used for shared place cache entries
+    CACHE_PROVIDER = 'openstreetmap'
     
     @classmethod
     def search_destinations(cls, query):
@@ -38,9 +42,21 @@ class OpenStreetMapService:
         """
         logger.info(f"Searching destinations using OpenStreetMap for: {query}")
         
+        cached = PlaceCacheService.get(cls.CACHE_PROVIDER, query)
+        if cached is not None:
+            return cached
+        
+        # Queries that recently found nothing skip both the rate limiter and the network
+        if PlaceCacheService.is_known_miss(cls.CACHE_PROVIDER, query):
+            logger.info(f"Skipping Nominatim lookup for known miss: {query}")
+            return []
+        
         try:
-            # Respect rate limiting (1 request per second)
-            cls._respect_rate_limit()
+            # Nominatim allows 1 request per second across all our workers;
+            # when over budget, serve whatever we have cached rather than wait
+            if not get_limiter('nominatim').acquire():
+                logger.info(f"Nominatim rate limited, serving from cache for: {query}")
+                return PlaceCacheService.get(cls.CACHE_PROVIDER, query, include_expired=True) or []
             
             # Set up parameters for the Nominatim API
             params = {
@@ -59,8 +75,7 @@ class OpenStreetMapService:
             # Add user agent to comply with Nominatim usage policy
             headers = {'User-Agent': cls.USER_AGENT}
             
-            response = requests.get(url, headers=headers)
-            cls.last_request_time = time.time()
+            response = http.get(url, headers=headers)
             
             if response.status_code != 200:
                 logger.warning(f"Nominatim API returned non-200 status: {response.status_code}")
@@ -76,6 +91,11 @@ class OpenStreetMapService:
                 if destination:
                     results.append(destination)
             
+            if results:
+                PlaceCacheService.set(cls.CACHE_PROVIDER, query, results)
+            else:
+                PlaceCacheService.record_miss(cls.CACHE_PROVIDER, query)
+            
             logger.info(f"Returning {len(results)} formatted destination results")
             return results
             
@@ -174,17 +194,3 @@ class OpenStreetMapService:
         
         # Default
         return 'place'
-    
-    @classmethod
-    def _respect_rate_limit(cls):
-        """
-        Ensure we respect Nominatim's rate limit policy (1 request per second)
-        """
-        current_time = time.time()
-        time_since_last_request = current_time - cls.last_request_time
-        
-        # If less than 1 second has passed since the last request, wait
-        if time_since_last_request < 1.0:
-            sleep_time = 1.0 - time_since_last_request
-            logger.debug(f"Rate limiting: Sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time) 
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Place Cache Service
+
+Database-backed cache for external place lookups. Resolved places live in
+the place_cache table and expire after PLACE_CACHE_TTL_DAYS; lookups that
+found nothing live in place_lookup_misses with the shorter
+PLACE_NEGATIVE_CACHE_TTL_HOURS. Both tables are shared by every app worker.
+Cache reads and writes run on their own connection so they never commit or
+roll back the caller's session. Reads never write: hits are only counted
+in-process (see stats()), so a cache hit doesn't queue on SQLite's write lock.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select
+
+from app.database import db
+from app.database.models import PlaceCacheEntry, PlaceLookupMiss
+from app.services.normalization import normalize_text
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Place detail fields kept in the cache (geometry is reduced to its location)
+TRIMMED_PLACE_FIELDS = ('place_id', 'name', 'formatted_address', 'website', 'address_components', 'types')
+
+class PlaceCacheService:
+    """Shared cache for resolved places, keyed by the normalized lookup"""
+
+    DEFAULT_TTL_DAYS = 30
+    DEFAULT_NEGATIVE_TTL_HOURS = 24
+
+    # Known misses are also memoized in-process so repeats skip the database
+    NEGATIVE_MEMO_MAX_ENTRIES = 5000
+    _negative_memo = OrderedDict()  # cache_key -> expires_at
+
+    # Per-process counters, exposed through stats()
+    _stats_lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0, 'writes': 0, 'errors': 0, 'negative_hits': 0, 'negative_writes': 0}
+
+    @classmethod
+    def make_key(cls, provider, name, category=None, search_vicinity=None, destination_country=None):
+        """
+        Build the cache key for a lookup
+
+        Args:
+            provider (str): Lookup provider, e.g. 'google_places'
+            name (str): Name of the place
+            category (str, optional): Type of place
+            search_vicinity (str, optional): Vicinity used to bias the search
+            destination_country (str, optional): Country used to bias the search
+
+        Returns:
+            str: Hex sha256 digest of the normalized lookup
+        """
+        parts = [provider] + [normalize_text(part) for part in (name, category, search_vicinity, destination_country)]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def get(cls, provider, name, category=None, search_vicinity=None, destination_country=None,
+            include_expired=False):
+        """
+        Look up a cached place
+
+        Args:
+            include_expired (bool): Also return entries past their TTL that
+                haven't been evicted yet, for when a fresh lookup isn't possible
+
+        Returns:
+            dict: Cached place data if a matching entry exists, None otherwise
+        """
+        cache_key = cls.make_key(provider, name, category, search_vicinity, destination_country)
+        table = PlaceCacheEntry.__table__
+        query = select(table.c.place_data).where(table.c.cache_key == cache_key)
+        if not include_expired:
+            query = query.where(table.c.expires_at > datetime.utcnow())
+
+        try:
+            with db.engine.connect() as conn:
+                row = conn.execute(query).first()
+        except Exception as e:
+            logger.warning(f"Place cache read failed for {name}: {str(e)}")
+            cls._count('errors')
+            return None
+
+        if row is None:
+            cls._count('misses')
+            return None
+
+        logger.info(f"Place cache hit for {provider}: {name}")
+        cls._count('hits')
+        return row.place_data
+
+    @classmethod
+    def set(cls, provider, name, place_data, category=None, search_vicinity=None, destination_country=None):
+        """
+        Store a resolved place, replacing any existing entry for the same lookup
+
+        Args:
+            provider (str): Lookup provider, e.g. 'google_places'
+            name (str): Name of the place that was looked up
+            place_data (dict): Place data to cache (should already be trimmed)
+        """
+        cache_key = cls.make_key(provider, name, category, search_vicinity, destination_country)
+        table = PlaceCacheEntry.__table__
+        now = datetime.utcnow()
+        ttl_days = current_app.config.get('PLACE_CACHE_TTL_DAYS', cls.DEFAULT_TTL_DAYS)
+
+        values = {
+            'cache_key': cache_key,
+            'provider': provider,
+            'query_name': normalize_text(name)[:255],
+            'category': normalize_text(category)[:50] or None,
+            'search_vicinity': normalize_text(search_vicinity)[:255] or None,
+            'destination_country': normalize_text(destination_country)[:100] or None,
+            'place_id': place_data.get('place_id') if isinstance(place_data, dict) else None,
+            'place_data': place_data,
+            'expires_at': now + timedelta(days=ttl_days),
+            'created_at': now,
+        }
+
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(delete(table).where(table.c.cache_key == cache_key))
+                conn.execute(insert(table).values(**values))
+        except Exception as e:
+            # Another worker may have written the same key first; either way the cache is best-effort
+            logger.warning(f"Place cache write failed for {name}: {str(e)}")
+            cls._count('errors')
+            return
+
+        cls._count('writes')
+
+    @classmethod
+    def is_known_miss(cls, provider, name, category=None, search_vicinity=None, destination_country=None):
+        """
+        Check whether this lookup recently found nothing
+
+        Returns:
+            bool: True if a live negative cache entry exists
+        """
+        cache_key = cls.make_key(provider, name, category, search_vicinity, destination_country)
+        now = datetime.utcnow()
+
+        with cls._stats_lock:
+            memo_expires_at = cls._negative_memo.get(cache_key)
+            if memo_expires_at is not None:
+                if memo_expires_at > now:
+                    cls._stats['negative_hits'] += 1
+                    return True
+                del cls._negative_memo[cache_key]
+
+        table = PlaceLookupMiss.__table__
+        try:
+            with db.engine.connect() as conn:
+                row = conn.execute(
+                    select(table.c.expires_at).where(table.c.cache_key == cache_key, table.c.expires_at > now)
+                ).first()
+        except Exception as e:
+            logger.warning(f"Negative cache read failed for {name}: {str(e)}")
+            cls._count('errors')
+            return False
+
+        if row is None:
+            return False
+
+        logger.info(f"Negative cache hit for {provider}: {name}")
+        cls._remember_miss(cache_key, row.expires_at)
+        cls._count('negative_hits')
+        return True
+
+    @classmethod
+    def record_miss(cls, provider, name, category=None, search_vicinity=None, destination_country=None):
+        """
+        Remember that a lookup found nothing, for PLACE_NEGATIVE_CACHE_TTL_HOURS
+        """
+        cache_key = cls.make_key(provider, name, category, search_vicinity, destination_country)
+        table = PlaceLookupMiss.__table__
+        now = datetime.utcnow()
+        ttl_hours = current_app.config.get('PLACE_NEGATIVE_CACHE_TTL_HOURS', cls.DEFAULT_NEGATIVE_TTL_HOURS)
+        expires_at = now + timedelta(hours=ttl_hours)
+
+        cls._remember_miss(cache_key, expires_at)
+
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(delete(table).where(table.c.cache_key == cache_key))
+                conn.execute(insert(table).values(
+                    cache_key=cache_key,
+                    provider=provider,
+                    query_name=normalize_text(name)[:255],
+                    search_vicinity=normalize_text(search_vicinity or destination_country)[:255] or None,
+                    expires_at=expires_at,
+                    created_at=now
+                ))
+        except Exception as e:
+            logger.warning(f"Negative cache write failed for {name}: {str(e)}")
+            cls._count('errors')
+            return
+
+        logger.info(f"Recorded negative cache entry for {provider}: {name}")
+        cls._count('negative_writes')
+
+    @classmethod
+    def evict_expired(cls, now=None):
+        """
+        Delete expired positive and negative cache entries
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = now or datetime.utcnow()
+        evicted = 0
+
+        with db.engine.begin() as conn:
+            for table in (PlaceCacheEntry.__table__, PlaceLookupMiss.__table__):
+                result = conn.execute(delete(table).where(table.c.expires_at <= now))
+                evicted += result.rowcount
+
+        with cls._stats_lock:
+            cls._negative_memo.clear()
+
+        logger.info(f"Evicted {evicted} expired place cache entries")
+        return evicted
+
+    @classmethod
+    def stats(cls):
+        """
+        Return cache counters for this process plus the shared entry count
+
+        Returns:
+            dict: Positive and negative cache counters, hit_rate and entry counts
+        """
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+
+        try:
+            with db.engine.connect() as conn:
+                stats['entries'] = conn.execute(select(func.count()).select_from(PlaceCacheEntry.__table__)).scalar()
+                stats['negative_entries'] = conn.execute(select(func.count()).select_from(PlaceLookupMiss.__table__)).scalar()
+        except Exception as e:
+            logger.warning(f"Could not count place cache entries: {str(e)}")
+            stats['entries'] = None
+            stats['negative_entries'] = None
+
+        return stats
+
+    @staticmethod
+    def trim_place_details(place):
+        """
+        Reduce a Place Details result to the fields we store
+
+        Args:
+            place (dict): Place details from Google Places API
+
+        Returns:
+            dict: Trimmed place details, or None if place is empty
+        """
+        if not place:
+            return None
+
+        trimmed = {field: place[field] for field in TRIMMED_PLACE_FIELDS if field in place}
+        location = (place.get('geometry') or {}).get('location')
+        if location:
+            trimmed['geometry'] = {'location': location}
+        return trimmed
+
+    @classmethod
+    def _remember_miss(cls, cache_key, expires_at):
+        with cls._stats_lock:
+            cls._negative_memo[cache_key] = expires_at
+            cls._negative_memo.move_to_end(cache_key)
+            while len(cls._negative_memo) > cls.NEGATIVE_MEMO_MAX_ENTRIES:
+                cls._negative_memo.popitem(last=False)
+
+    @classmethod
+    def _count(cls, counter):
+        with cls._stats_lock:
+            cls._stats[counter] += 1
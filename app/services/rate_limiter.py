@@ -0,0 +1,183 @@
+"""
+Rate Limiter
+
+Token-bucket rate limiting shared by every worker process. Bucket state
+lives in a small SQLite file (RATE_LIMIT_STORE_PATH) and is updated under
+BEGIN IMMEDIATE, so concurrent gunicorn workers and threads draw from the
+same budget. A caller that finds the bucket empty reserves the next token
+and waits for it, but only if few enough callers are already queued and
+the wait is short; otherwise it's shed immediately and should fall back
+to cached data.
+"""
+import logging
+import math
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from flask import current_app
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Per-service limits. rate is tokens per second, capacity the burst size,
+# max_queue how many callers may wait for a token and max_wait the longest
+# any caller may wait, in seconds.
+RATE_LIMITS = {
+    'nominatim': {
+        'rate': 1.0,  # Nominatim usage policy: at most 1 request per second
+        'capacity': 1,
+        'max_queue': 1,
+        'max_wait': 1.5,
+    },
+}
+
+class RateLimiter:
+    """Cross-process token bucket backed by a SQLite file"""
+
+    def __init__(self, name, store_path, rate, capacity, max_queue, max_wait):
+        self.name = name
+        self.store_path = store_path
+        self.rate = rate
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'acquired': 0, 'waited': 0, 'shed': 0, 'errors': 0, 'wait_seconds': 0.0}
+        self._ensure_store()
+
+    def acquire(self):
+        """
+        Take a token, waiting briefly if the queue allows it
+
+        Returns:
+            bool: True if the caller may proceed, False if it was shed and
+            should serve from cache instead
+        """
+        try:
+            wait = self._reserve()
+        except sqlite3.Error as e:
+            # Fail closed: without the shared state we can't honour the limit
+            logger.warning(f"Rate limiter {self.name} store unavailable: {str(e)}")
+            self._count('errors')
+            self._count('shed')
+            return False
+
+        if wait is None:
+            logger.info(f"Rate limiter {self.name} shed a request")
+            self._count('shed')
+            return False
+
+        if wait > 0:
+            with self._stats_lock:
+                self._stats['waited'] += 1
+                self._stats['wait_seconds'] += wait
+            time.sleep(wait)
+
+        self._count('acquired')
+        return True
+
+    def queue_depth(self):
+        """
+        Number of callers (in any process) currently waiting for a token
+
+        Returns:
+            int: Queue depth, or None if the store can't be read
+        """
+        try:
+            tokens = self._read_tokens()
+        except sqlite3.Error:
+            return None
+        return max(0, math.ceil(-tokens))
+
+    def stats(self):
+        """Return this process's counters plus the shared queue depth"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        stats['queue_depth'] = self.queue_depth()
+        return stats
+
+    def _reserve(self):
+        """
+        Take or reserve a token in the shared bucket
+
+        Returns:
+            float: Seconds to wait before proceeding (0 if a token was free),
+            or None if the caller should be shed
+        """
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            tokens = self._refilled_tokens(conn)
+            now = time.time()
+
+            if tokens >= 1:
+                wait = 0.0
+            else:
+                # Tokens below zero are reservations held by waiting callers
+                queued = max(0, math.ceil(-tokens))
+                wait = (1 - tokens) / self.rate
+                if queued >= self.max_queue or wait > self.max_wait:
+                    conn.execute('ROLLBACK')
+                    return None
+
+            conn.execute('UPDATE buckets SET tokens = ?, updated_at = ? WHERE name = ?',
+                         (tokens - 1, now, self.name))
+            conn.execute('COMMIT')
+            return wait
+
+    def _read_tokens(self):
+        with self._connect() as conn:
+            return self._refilled_tokens(conn)
+
+    def _refilled_tokens(self, conn):
+        row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE name = ?', (self.name,)).fetchone()
+        if row is None:
+            return float(self.capacity)
+        tokens, updated_at = row
+        elapsed = max(0.0, time.time() - updated_at)
+        return min(float(self.capacity), tokens + elapsed * self.rate)
+
+    def _ensure_store(self):
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)')
+            conn.execute('INSERT OR IGNORE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)',
+                         (self.name, float(self.capacity), time.time()))
+
+    def _connect(self):
+        # Autocommit mode so transactions are controlled explicitly; closing
+        # the connection rolls back anything left open by an error
+        return closing(sqlite3.connect(self.store_path, timeout=2, isolation_level=None))
+
+    def _count(self, counter):
+        with self._stats_lock:
+            self._stats[counter] += 1
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name):
+    """
+    Get the shared limiter for a service
+
+    Args:
+        name (str): A key of RATE_LIMITS
+
+    Returns:
+        RateLimiter: The process-wide limiter, stored at RATE_LIMIT_STORE_PATH
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                store_path = current_app.config['RATE_LIMIT_STORE_PATH']
+                limiter = RateLimiter(name, store_path, **RATE_LIMITS[name])
+                _limiters[name] = limiter
+    return limiter
+
+def limiter_stats():
+    """Return counters for every limiter created in this process"""
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
@@ -0,0 +1,180 @@
+"""
+Single Flight
+
+Coalesces identical concurrent calls so only one of them does the work.
+Within a process, callers with the same key wait on the in-flight call and
+share its result. Across worker processes, a call that can be answered from
+a shared cache also takes an advisory file lock (SINGLE_FLIGHT_LOCK_DIR) for
+its key and re-checks the cache once it has the lock, so workers that were
+waiting on another worker's lookup pick up its result instead of repeating it.
+Followers wait at most the call's timeout (normally its HTTP client's
+deadline); if the leader is still stuck by then they make their own call.
+"""
+import copy
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from flask import current_app
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; coalescing stays per process
+    fcntl = None
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Returned by a recheck callable when the shared cache has no answer yet
+MISSING = object()
+
+class _Call:
+    """An in-flight call that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """A named group of coalesced calls"""
+
+    # Keys are spread over a fixed set of lock files so the lock directory stays small
+    LOCK_STRIPES = 256
+    LOCK_TIMEOUT = 10.0
+    LOCK_POLL_INTERVAL = 0.05
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'leaders': 0, 'followers': 0, 'shared_cache_hits': 0, 'lock_timeouts': 0, 'wait_timeouts': 0}
+
+    def do(self, key, fn, recheck=None, timeout=None):
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key (str): Identity of the call, e.g. a normalized cache key
+            fn (callable): Does the work; its return value is shared
+            recheck (callable, optional): Reads the shared cache, returning
+                MISSING if there is no answer yet. Enables cross-process
+                coalescing through an advisory lock.
+            timeout (float, optional): Longest a follower waits on the leader
+                before running fn itself; None waits indefinitely
+
+        Returns:
+            The result of fn (a copy for followers), or of recheck if another
+            worker produced it first
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['leaders'] += 1
+            else:
+                self._stats['followers'] += 1
+
+        if not leader:
+            logger.info(f"Waiting on in-flight {self.name} call for: {key}")
+            if not call.done.wait(timeout):
+                logger.warning(f"Gave up waiting on in-flight {self.name} call after {timeout}s: {key}")
+                self._count('wait_timeouts')
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            if recheck is not None and fcntl is not None:
+                result = self._run_locked(key, fn, recheck)
+            else:
+                result = fn()
+            # Followers copy from a snapshot the leader's caller can't mutate
+            call.result = copy.deepcopy(result)
+            return result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """Return this group's counters for this process"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+    def _run_locked(self, key, fn, recheck):
+        handle = self._acquire_file_lock(key)
+        try:
+            if handle is not None:
+                result = recheck()
+                if result is not MISSING:
+                    self._count('shared_cache_hits')
+                    return result
+            return fn()
+        finally:
+            if handle is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+
+    def _acquire_file_lock(self, key):
+        """Take the advisory lock for key's stripe, or None if it isn't available in time"""
+        try:
+            lock_dir = current_app.config['SINGLE_FLIGHT_LOCK_DIR']
+            os.makedirs(lock_dir, exist_ok=True)
+            stripe = int(hashlib.sha256(f"{self.name}:{key}".encode('utf-8')).hexdigest(), 16) % self.LOCK_STRIPES
+            handle = open(os.path.join(lock_dir, f"{self.name}.{stripe}.lock"), 'a')
+        except Exception as e:
+            logger.warning(f"Could not open single-flight lock for {self.name}: {str(e)}")
+            return None
+
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while True:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return handle
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    # Don't hold the request hostage; do the work unlocked
+                    logger.warning(f"Timed out waiting for {self.name} lock: {key}")
+                    self._count('lock_timeouts')
+                    handle.close()
+                    return None
+                time.sleep(self.LOCK_POLL_INTERVAL)
+
+    def _count(self, counter):
+        with self._lock:
+            self._stats[counter] += 1
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+def get_flight(name):
+    """
+    Get the shared single-flight group for a kind of call
+
+    Args:
+        name (str): Group name, e.g. 'google_places.find_place'
+
+    Returns:
+        SingleFlight: The process-wide group
+    """
+    flight = _flights.get(name)
+    if flight is None:
+        with _flights_lock:
+            flight = _flights.get(name)
+            if flight is None:
+                flight = _flights[name] = SingleFlight(name)
+    return flight
+
+def flight_stats():
+    """Return counters for every single-flight group created in this process"""
+    return {name: flight.stats() for name, flight in _flights.items()}
@@ -0,0 +1,68 @@
+"""
+Text Chunking
+
+Splits long free text (pasted guides, voice memo transcripts) into pieces
+of bounded size for separate AI requests. Paragraphs are kept together
+where they fit, then sentences; only a single sentence longer than the
+limit is cut mid-text, at the last space before the limit.
+"""
+import re
+
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+def split_text(text, max_chars):
+    """
+    Split text into chunks of at most max_chars characters
+
+    Args:
+        text (str): The text to split
+        max_chars (int): Largest chunk size
+
+    Returns:
+        list: Non-empty chunks, in order; [text] if it already fits
+    """
+    text = (text or '').strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    pieces = []  # (paragraph number, text)
+    for number, paragraph in enumerate(_PARAGRAPH_RE.split(text)):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append((number, paragraph))
+            continue
+        for sentence in _SENTENCE_RE.split(paragraph):
+            pieces.extend((number, part) for part in _hard_split(sentence, max_chars))
+
+    # Pack neighbouring pieces back together up to the limit
+    chunks = []
+    current = ''
+    current_paragraph = None
+    for number, piece in pieces:
+        separator = ' ' if number == current_paragraph else '\n\n'
+        if current and len(current) + len(separator) + len(piece) <= max_chars:
+            current = f"{current}{separator}{piece}"
+        else:
+            if current:
+                chunks.append(current)
+            current = piece
+        current_paragraph = number
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _hard_split(sentence, max_chars):
+    """Cut an over-long sentence at word boundaries"""
+    parts = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(' ', 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
@@ -1,6 +1,7 @@
 /**
  * Recommendation filter component for the trip page
- * Handles filtering recommendations by contributor and category
+ * Handles filtering recommendations by contributor and category (applied by
+ * the activities API) and searching the loaded cards' text
  */
 function initRecommendationFilter() {
   // Keep track of active filters
@@ -40,49 +41,30 @@ function initRecommendationFilter() {
     });
   });
   
-  // Function to apply filters to recommendation cards and map markers
+  // Ask the server for the matching activities; the list and map reload from it
   function applyFilters() {
-    const cards = document.querySelectorAll('.recommendation-card');
-    const markers = window.mapMarkers || [];
+    const filters = { category: [], contributor: [] };
     
-    cards.forEach(card => {
-      const cardCategory = card.dataset.category;
-      const cardContributors = card.dataset.contributors.split(',');
-      
-      // Check if no filters are active for a type (show all)
-      const noCategoryFilters = activeFilters.category.size === 0;
-      const noContributorFilters = activeFilters.contributor.size === 0;
-      
-      // Check if card should be visible based on category filter
-      const categoryMatch = 
-        noCategoryFilters || 
-        (cardCategory && activeFilters.category.has(cardCategory));
-      
-      // Check if card should be visible based on contributor filter
-      const contributorMatch = 
-        noContributorFilters || 
-        cardContributors.some(id => activeFilters.contributor.has(id));
-      
-      // Show/hide card based on filter matches
-      if (categoryMatch && contributorMatch) {
-        card.classList.remove('hidden');
-      } else {
-        card.classList.add('hidden');
-      }
+    Object.keys(filters).forEach(filterType => {
+      const pills = document.querySelectorAll(`[data-filter-type="${filterType}"]`);
+      const active = activeFilters[filterType];
       
-      // Find and update corresponding map marker visibility
-      if (window.map && markers.length > 0) {
-        const activityId = card.dataset.activityId;
-        const marker = markers.find(m => m.activityId === activityId);
-        if (marker) {
-          marker.setVisible(categoryMatch && contributorMatch);
-        }
+      // All or none selected means no filter for this type
+      if (active.size > 0 && active.size < pills.length) {
+        filters[filterType] = Array.from(active);
       }
     });
     
-    // Update map bounds after filtering
-    if (window.centerMap) {
-      window.centerMap();
+    if (window.tripActivities) {
+      window.tripActivities.setFilters(filters).then(() => {
+        // Re-apply any search to the freshly loaded cards
+        searchInput.dispatchEvent(new Event('input'));
+      });
+    }
+    
+    // Reload map markers for the new filters
+    if (window.reloadMapMarkers) {
+      window.reloadMapMarkers();
     }
   }
 
@@ -125,7 +107,13 @@ function initRecommendationFilter() {
     
     // Only filter if searchTerm has 3 or more characters
     if (searchTerm.length >= 3) {
-      searchCards(searchTerm);
+      // Cards load a page at a time; search needs all of them
+      const loaded = window.tripActivities ? window.tripActivities.loadAll() : Promise.resolve();
+      loaded.then(() => {
+        if (searchInput.value.trim().toLowerCase() === searchTerm) {
+          searchCards(searchTerm);
+        }
+      });
     } else {
       // Show all cards if search term is too short
       document.querySelectorAll('.recommendation-card').forEach(card => {
@@ -0,0 +1,219 @@
+/**
+ * Recommendation list component for the trip page
+ * Loads grouped activities from the trip activities API a page at a time
+ * and renders them as recommendation cards. The first page is rendered by
+ * the server; later pages load as the end of the list scrolls into view.
+ */
+function initRecommendationList() {
+  const cardView = document.getElementById('card-view');
+  if (!cardView) {
+    return;
+  }
+
+  const sentinel = document.getElementById('card-view-sentinel');
+  const firstPageData = document.getElementById('trip-activities-data');
+  const url = cardView.dataset.activitiesUrl;
+
+  // Current server-side filters: empty lists mean "everything"
+  let filters = { category: [], contributor: [] };
+  let cursor = cardView.dataset.nextCursor || null;
+  let pending = null;
+  // Bumped when the filters change so late responses for old filters are dropped
+  let generation = 0;
+  let activities = firstPageData ? JSON.parse(firstPageData.textContent) : [];
+
+  function buildUrl(activeFilters, pageCursor, limit) {
+    const params = new URLSearchParams();
+    activeFilters.category.forEach(value => params.append('category', value));
+    activeFilters.contributor.forEach(value => params.append('contributor', value));
+    if (pageCursor) {
+      params.set('cursor', pageCursor);
+    }
+    if (limit) {
+      params.set('limit', limit);
+    }
+    const query = params.toString();
+    return query ? `${url}?${query}` : url;
+  }
+
+  function fetchPage(activeFilters, pageCursor, limit) {
+    return fetch(buildUrl(activeFilters, pageCursor, limit), { headers: { 'Accept': 'application/json' } })
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Activities request failed: ${response.status}`);
+        }
+        return response.json();
+      });
+  }
+
+  function updateSentinel() {
+    sentinel.classList.toggle('hidden', !cursor);
+  }
+
+  // Load the next page of cards, if there is one
+  function loadMore() {
+    if (!cursor) {
+      return Promise.resolve();
+    }
+    if (pending) {
+      return pending;
+    }
+
+    const requestGeneration = generation;
+    pending = fetchPage(filters, cursor)
+      .then(data => {
+        if (requestGeneration !== generation) {
+          return;
+        }
+        data.activities.forEach(activity => cardView.appendChild(renderActivityCard(activity)));
+        activities = activities.concat(data.activities);
+        cursor = data.next_cursor;
+        updateSentinel();
+      })
+      .catch(error => console.error('Error loading recommendations:', error))
+      .finally(() => {
+        if (requestGeneration === generation) {
+          pending = null;
+        }
+      });
+    return pending;
+  }
+
+  // Load every remaining page (e.g. before searching the cards' text)
+  function loadAll() {
+    if (!cursor) {
+      return Promise.resolve();
+    }
+    return loadMore().then(() => (cursor ? loadAll() : undefined));
+  }
+
+  // Replace the list with the first page matching new filters
+  function setFilters(newFilters) {
+    filters = newFilters;
+    generation += 1;
+    pending = null;
+    cursor = null;
+    cardView.innerHTML = '';
+    activities = [];
+
+    const requestGeneration = generation;
+    pending = fetchPage(filters, null)
+      .then(data => {
+        if (requestGeneration !== generation) {
+          return;
+        }
+        data.activities.forEach(activity => cardView.appendChild(renderActivityCard(activity)));
+        activities = data.activities;
+        cursor = data.next_cursor;
+        updateSentinel();
+      })
+      .catch(error => console.error('Error filtering recommendations:', error))
+      .finally(() => {
+        if (requestGeneration === generation) {
+          pending = null;
+        }
+      });
+    return pending;
+  }
+
+  if ('IntersectionObserver' in window) {
+    const observer = new IntersectionObserver(entries => {
+      if (entries.some(entry => entry.isIntersecting)) {
+        loadMore();
+      }
+    }, { rootMargin: '400px' });
+    observer.observe(sentinel);
+  } else {
+    // Old browsers just get the whole list
+    loadAll();
+  }
+
+  window.tripActivities = {
+    loadMore,
+    loadAll,
+    setFilters,
+    getFilters: () => filters,
+    getLoaded: () => activities
+  };
+}
+
+/**
+ * Build a recommendation card matching components/trip/_recommendation_card.html
+ */
+function renderActivityCard(activity) {
+  const card = document.createElement('div');
+  card.className = 'card card-hover recommendation-card';
+  card.dataset.category = activity.category || '';
+  card.dataset.contributors = activity.recommendations.map(rec => rec.author_id).join(',');
+  card.dataset.activityId = String(activity.id);
+  card.dataset.lat = activity.lat ?? '';
+  card.dataset.lng = activity.lng ?? '';
+  card.dataset.name = activity.name;
+  card.dataset.placeId = activity.place_id || '';
+
+  const title = document.createElement('h3');
+  title.className = 'text-xl font-semibold text-gray-900 mb-2';
+  title.textContent = activity.name;
+  card.appendChild(title);
+
+  const meta = document.createElement('div');
+  meta.className = 'flex flex-wrap items-center gap-3 mb-3';
+  if (activity.category) {
+    const badge = document.createElement('span');
+    badge.className = 'badge badge-blue';
+    badge.textContent = activity.category;
+    meta.appendChild(badge);
+  }
+  if (activity.website_url) {
+    const link = document.createElement('a');
+    link.href = activity.website_url;
+    link.target = '_blank';
+    link.rel = 'noopener noreferrer';
+    link.className = 'link-icon';
+    link.textContent = 'Website';
+    meta.appendChild(link);
+  }
+  card.appendChild(meta);
+
+  const recommenders = document.createElement('div');
+  recommenders.className = 'mb-4';
+  const byline = document.createElement('p');
+  byline.className = 'text-gray-500 text-sm mb-2';
+  const recommendations = activity.recommendations;
+
+  if (recommendations.length > 1) {
+    byline.textContent = `Recommended by ${recommendations.length} people:`;
+    recommenders.appendChild(byline);
+
+    const list = document.createElement('div');
+    list.className = 'pl-4 border-l-2 border-gray-200 space-y-3';
+    recommendations.forEach(rec => {
+      const item = document.createElement('div');
+      const author = document.createElement('p');
+      author.className = 'text-sm font-medium text-gray-700';
+      author.textContent = `${rec.author || 'Friend'}:`;
+      item.appendChild(author);
+      if (rec.description) {
+        const description = document.createElement('p');
+        description.className = 'text-gray-600 text-sm';
+        description.textContent = rec.description;
+        item.appendChild(description);
+      }
+      list.appendChild(item);
+    });
+    recommenders.appendChild(list);
+  } else {
+    const rec = recommendations[0];
+    byline.textContent = `Recommended by ${rec.author || 'a friend'}`;
+    recommenders.appendChild(byline);
+    if (rec.description) {
+      const description = document.createElement('p');
+      description.className = 'text-gray-600';
+      description.textContent = rec.description;
+      recommenders.appendChild(description);
+    }
+  }
+  card.appendChild(recommenders);
+
+  return card;
+}
@@ -1,6 +1,8 @@
 /**
  * Recommendation map component for the trip page
- * Handles map initialization, markers, and info windows
+ * Handles map initialization, markers, and info windows. Markers come from
+ * the trip markers API, clustered on the server for the current zoom and
+ * limited to the visible area, starting when the map is first shown.
  */
 
 // Map initialization function (called by Google Maps API after loading)
@@ -25,165 +27,230 @@ function initRecommendationMap() {
       return;
     }
     
-    const cards = document.querySelectorAll('.recommendation-card');
+    const markersUrl = recommendationsMap.dataset.markersUrl;
+    const missingCoordinatesMessage = document.getElementById('missing-coordinates-message');
+    const missingCoordinatesList = document.getElementById('missing-coordinates-list');
     
-    // Extract location data
-    const locations = [];
-    const missingLocations = [];
+    // Create info window for marker click events
+    const infoWindow = new google.maps.InfoWindow();
+    // Extent of every located activity for the current filters
+    let overviewBbox = null;
+    // Only the newest response is drawn
+    let requestId = 0;
+    let idleTimer = null;
+    let markersRequested = false;
     
-    cards.forEach(card => {
-      const lat = parseFloat(card.dataset.lat);
-      const lng = parseFloat(card.dataset.lng);
-      const name = card.dataset.name;
-      
-      // Only add locations with valid coordinates
-      if (!isNaN(lat) && !isNaN(lng) && lat !== 0 && lng !== 0) {
-        locations.push({
-          lat,
-          lng,
-          name,
-          activityId: card.dataset.activityId,
-          category: card.dataset.category,
-          placeId: card.dataset.placeId,
-          element: card
+    function buildUrl(params) {
+      const query = new URLSearchParams(params);
+      const filters = window.tripActivities ? window.tripActivities.getFilters() : { category: [], contributor: [] };
+      filters.category.forEach(value => query.append('category', value));
+      filters.contributor.forEach(value => query.append('contributor', value));
+      return `${markersUrl}?${query.toString()}`;
+    }
+    
+    function fetchMarkers(params) {
+      return fetch(buildUrl(params), { headers: { 'Accept': 'application/geo+json' } })
+        .then(response => {
+          if (!response.ok) {
+            throw new Error(`Markers request failed: ${response.status}`);
+          }
+          return response.json();
         });
-      } else {
-        // Track missing locations
-        missingLocations.push(name);
-      }
-    });
+    }
     
-    // Show missing coordinates message if needed
-    const missingCoordinatesMessage = document.getElementById('missing-coordinates-message');
-    const missingCoordinatesList = document.getElementById('missing-coordinates-list');
+    function boundsFromBbox(bbox) {
+      return new google.maps.LatLngBounds(
+        { lat: bbox[1], lng: bbox[0] },
+        { lat: bbox[3], lng: bbox[2] }
+      );
+    }
     
-    if (missingLocations.length > 0) {
-      // Clear previous list
+    function showMissing(names) {
       missingCoordinatesList.innerHTML = '';
-      
-      // Add each missing location to the list
-      missingLocations.forEach(name => {
+      names.forEach(name => {
         const listItem = document.createElement('li');
         listItem.textContent = name;
         missingCoordinatesList.appendChild(listItem);
       });
-      
-      // Show the message
-      missingCoordinatesMessage.classList.remove('hidden');
-    } else {
-      // Hide the message if no missing locations
-      missingCoordinatesMessage.classList.add('hidden');
+      missingCoordinatesMessage.classList.toggle('hidden', names.length === 0);
     }
     
-    if (locations.length === 0) {
-      // If no valid locations, show message in map container
-      recommendationsMap.innerHTML = '<div class="flex h-full items-center justify-center"><p class="text-gray-500">No location data available for these recommendations</p></div>';
-      return;
+    function showInfoPanel(place) {
+      const infoPanel = document.getElementById('map-info-panel');
+      const infoTitle = document.getElementById('map-info-title');
+      const infoCategory = document.getElementById('map-info-category');
+      const infoContent = document.getElementById('map-info-content');
+      
+      // Set info panel content
+      infoTitle.textContent = place.name;
+      
+      // Add category badge if available
+      infoCategory.innerHTML = '';
+      if (place.category) {
+        const badge = document.createElement('span');
+        badge.className = 'inline-flex items-center px-3 py-1 rounded-full text-sm font-medium bg-blue-100 text-blue-800';
+        badge.textContent = place.category;
+        infoCategory.appendChild(badge);
+      }
+      
+      infoContent.textContent = place.description || 'No description available';
+      
+      // Show the info panel
+      infoPanel.classList.remove('hidden');
     }
     
-    // Calculate average center point if multiple locations
-    let centerLat = 0;
-    let centerLng = 0;
-    
-    locations.forEach(loc => {
-      centerLat += loc.lat;
-      centerLng += loc.lng;
-    });
-    
-    centerLat /= locations.length;
-    centerLng /= locations.length;
-    
-    // Create the map
-    window.map = new google.maps.Map(recommendationsMap, {
-      center: { lat: centerLat, lng: centerLng },
-      zoom: 12,
-      mapTypeControl: true,
-      fullscreenControl: true
-    });
-    
-    // Create info window for marker click events
-    const infoWindow = new google.maps.InfoWindow();
+    function infoWindowContent(place) {
+      const content = document.createElement('div');
+      content.className = 'p-2';
+      const title = document.createElement('h3');
+      title.className = 'font-semibold';
+      title.textContent = place.name;
+      content.appendChild(title);
+      if (place.category) {
+        const category = document.createElement('p');
+        category.className = 'text-sm text-gray-600';
+        category.textContent = place.category;
+        content.appendChild(category);
+      }
+      if (place.place_id) {
+        const link = document.createElement('a');
+        link.href = `https://www.google.com/maps/place/?q=place_id:${encodeURIComponent(place.place_id)}`;
+        link.target = '_blank';
+        link.className = 'text-blue-600 text-sm hover:underline';
+        link.textContent = 'View on Google Maps';
+        content.appendChild(link);
+      }
+      return content;
+    }
     
-    // Create markers for each location
-    locations.forEach(location => {
-      const marker = new google.maps.Marker({
-        position: { lat: location.lat, lng: location.lng },
-        map: window.map,
-        title: location.name,
-        activityId: location.activityId,
-        animation: google.maps.Animation.DROP
-      });
+    // Replace the markers with a server response's points and clusters
+    function drawFeatures(features) {
+      window.mapMarkers.forEach(marker => marker.setMap(null));
+      window.mapMarkers = [];
       
-      // Store marker reference for filtering
-      window.mapMarkers.push(marker);
-      
-      // Add click event to marker
-      marker.addListener('click', () => {
-        // Scroll to corresponding card in the card view
-        const card = location.element;
-        if (card) {
-          // Update info panel
-          const infoPanel = document.getElementById('map-info-panel');
-          const infoTitle = document.getElementById('map-info-title');
-          const infoCategory = document.getElementById('map-info-category');
-          const infoContent = document.getElementById('map-info-content');
-          
-          // Set info panel content
-          infoTitle.textContent = location.name;
-          
-          // Add category badge if available
-          if (location.category) {
-            infoCategory.innerHTML = `<span class="inline-flex items-center px-3 py-1 rounded-full text-sm font-medium bg-blue-100 text-blue-800">${location.category}</span>`;
-          } else {
-            infoCategory.innerHTML = '';
-          }
-          
-          // Add recommendation descriptions
-          const descriptions = Array.from(card.querySelectorAll('.text-gray-600')).map(el => el.textContent);
-          if (descriptions.length > 0) {
-            infoContent.textContent = descriptions[0]; // Show first description
-          } else {
-            infoContent.textContent = 'No description available';
-          }
-          
-          // Show the info panel
-          infoPanel.classList.remove('hidden');
+      features.forEach(feature => {
+        const [lng, lat] = feature.geometry.coordinates;
+        const properties = feature.properties;
+        
+        if (properties.cluster) {
+          const marker = new google.maps.Marker({
+            position: { lat, lng },
+            map: window.map,
+            label: { text: String(properties.point_count), color: '#ffffff', fontWeight: 'bold' },
+            title: `${properties.point_count} places`
+          });
+          // Zoom in to the cluster's extent
+          marker.addListener('click', () => window.map.fitBounds(boundsFromBbox(feature.bbox)));
+          window.mapMarkers.push(marker);
+          return;
         }
         
-        // Open Google Maps info window
-        infoWindow.setContent(`
-          <div class="p-2">
-            <h3 class="font-semibold">${location.name}</h3>
-            ${location.category ? `<p class="text-sm text-gray-600">${location.category}</p>` : ''}
-            ${location.placeId ? `<a href="https://www.google.com/maps/place/?q=place_id:${location.placeId}" target="_blank" class="text-blue-600 text-sm hover:underline">View on Google Maps</a>` : ''}
-          </div>
-        `);
-        infoWindow.open(window.map, marker);
+        const marker = new google.maps.Marker({
+          position: { lat, lng },
+          map: window.map,
+          title: properties.name,
+          activityId: String(properties.id)
+        });
+        marker.addListener('click', () => {
+          showInfoPanel(properties);
+          infoWindow.setContent(infoWindowContent(properties));
+          infoWindow.open(window.map, marker);
+        });
+        window.mapMarkers.push(marker);
       });
-    });
+    }
+    
+    // Fetch only the markers in view, clustered for the current zoom
+    function loadVisibleMarkers() {
+      const bounds = window.map.getBounds();
+      if (!bounds) {
+        return;
+      }
+      const southWest = bounds.getSouthWest();
+      const northEast = bounds.getNorthEast();
+      const currentRequest = ++requestId;
+      
+      fetchMarkers({
+        zoom: window.map.getZoom(),
+        bbox: [southWest.lng(), southWest.lat(), northEast.lng(), northEast.lat()].map(value => value.toFixed(6)).join(',')
+      })
+        .then(collection => {
+          if (currentRequest === requestId) {
+            drawFeatures(collection.features);
+          }
+        })
+        .catch(error => console.error('Error loading map markers:', error));
+    }
     
     // Center map function
     window.centerMap = function() {
-      if (window.map && locations.length > 0) {
-        // Find visible markers based on active filters
-        const visibleMarkers = window.mapMarkers.filter(marker => marker.getVisible());
+      if (window.map && overviewBbox) {
+        window.map.fitBounds(boundsFromBbox(overviewBbox));
         
-        if (visibleMarkers.length > 0) {
-          const bounds = new google.maps.LatLngBounds();
-          visibleMarkers.forEach(marker => {
-            bounds.extend(marker.getPosition());
-          });
-          window.map.fitBounds(bounds);
-          
-          // Adjust zoom level if there's only one marker
-          if (visibleMarkers.length === 1) {
-            window.map.setZoom(15);
-          }
+        // Don't zoom all the way in on a single place
+        if (overviewBbox[0] === overviewBbox[2] && overviewBbox[1] === overviewBbox[3]) {
+          window.map.setZoom(15);
         }
       }
     };
     
-    // Initial centering
-    window.centerMap();
+    // Markers are only fetched once the map view has been opened
+    window.loadMapMarkers = function() {
+      if (!markersRequested) {
+        markersRequested = true;
+        window.reloadMapMarkers();
+      }
+    };
+    
+    // Fit the map to the current filters' places; the idle handler then loads what's visible
+    window.reloadMapMarkers = function() {
+      if (!markersRequested) {
+        return;
+      }
+      
+      const currentRequest = ++requestId;
+      // The overview only needs the extent and missing list, so ask for the coarsest tier
+      fetchMarkers({ zoom: 0 })
+        .then(collection => {
+          if (currentRequest !== requestId) {
+            return;
+          }
+          overviewBbox = collection.bbox;
+          showMissing(collection.missing);
+          
+          if (!overviewBbox) {
+            drawFeatures([]);
+            if (!window.map) {
+              // If no valid locations, show message in map container
+              recommendationsMap.innerHTML = '<div class="flex h-full items-center justify-center"><p class="text-gray-500">No location data available for these recommendations</p></div>';
+            }
+            return;
+          }
+          
+          if (!window.map) {
+            window.map = new google.maps.Map(recommendationsMap, {
+              center: { lat: (overviewBbox[1] + overviewBbox[3]) / 2, lng: (overviewBbox[0] + overviewBbox[2]) / 2 },
+              zoom: 12,
+              mapTypeControl: true,
+              fullscreenControl: true
+            });
+            
+            // Refetch after panning or zooming settles
+            window.map.addListener('idle', () => {
+              clearTimeout(idleTimer);
+              idleTimer = setTimeout(loadVisibleMarkers, 150);
+            });
+          }
+          window.centerMap();
+          // fitBounds to the same view doesn't fire idle, so load now as well
+          loadVisibleMarkers();
+        })
+        .catch(error => console.error('Error loading map markers:', error));
+    };
+    
+    // The map view may have been opened before the Maps API finished loading
+    if (!document.getElementById('map-view').classList.contains('hidden')) {
+      window.loadMapMarkers();
+    }
   };
-} 
\ No newline at end of file
+}
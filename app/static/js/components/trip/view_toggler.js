@@ -33,6 +33,11 @@ function initViewToggler() {
     cardViewBtn.classList.remove('bg-blue-100', 'text-blue-800');
     cardViewBtn.classList.add('bg-white', 'text-gray-600');
     
+    // Fetch markers the first time the map is shown
+    if (window.loadMapMarkers) {
+      window.loadMapMarkers();
+    }
+    
     // Trigger map resize event to ensure proper rendering
     if (window.google && window.google.maps && window.map) {
       google.maps.event.trigger(window.map, 'resize');
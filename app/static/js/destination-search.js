@@ -2,7 +2,8 @@
  * Destination Search Library
  * 
  * Provides client-side integration with destination search APIs.
- * Performs parallel searches across multiple sources and combines results.
+ * Searches across multiple sources through a single server-side endpoint,
+ * which queries them in parallel and returns combined, ranked results.
  */
 
 const DestinationSearch = (function() {
@@ -11,24 +12,26 @@ const DestinationSearch = (function() {
     // Default configuration
     const DEFAULT_CONFIG = {
         sources: ['database', 'google', 'openstreetmap'],
-        prioritize: 'database',
         limit: 8,
         timeout: 5000, // 5 seconds
         minQueryLength: 2,
         cacheLifetime: 5 * 60 * 1000 // 5 minutes in milliseconds
     };
 
-    // API endpoints for each source
-    const ENDPOINTS = {
-        database: '/api/destinations/database/',
-        google: '/api/destinations/google-places/',
-        openstreetmap: '/api/destinations/openstreetmap/'
+    // Federated search endpoint: queries every source in parallel on the server
+    const SEARCH_ENDPOINT = '/api/destinations/search/';
+
+    // Client source names mapped to the names the search endpoint expects
+    const SOURCE_NAMES = {
+        database: 'database',
+        google: 'google_places',
+        openstreetmap: 'openstreetmap'
     };
 
     // In-memory cache for search results
     const cache = {
         // Structure: { 
-        //   'query-source': {
+        //   'query-sources-limit': {
         //     timestamp: Date.now(),
         //     results: [...]
         //   }
@@ -37,12 +40,10 @@ const DestinationSearch = (function() {
         
         /**
          * Set cache entry
-         * @param {string} query - The search query
-         * @param {string} source - The data source
+         * @param {string} key - The cache key
          * @param {Array} results - The search results
          */
-        set: function(query, source, results) {
-            const key = `${query}-${source}`;
+        set: function(key, results) {
             this.data[key] = {
                 timestamp: Date.now(),
                 results: results
@@ -51,13 +52,11 @@ const DestinationSearch = (function() {
         
         /**
          * Get cache entry if valid
-         * @param {string} query - The search query
-         * @param {string} source - The data source
+         * @param {string} key - The cache key
          * @param {number} lifetime - Max age in milliseconds
          * @returns {Array|null} The cached results or null if not found/expired
          */
-        get: function(query, source, lifetime) {
-            const key = `${query}-${source}`;
+        get: function(key, lifetime) {
             const entry = this.data[key];
             
             if (!entry) return null;
@@ -81,33 +80,32 @@ const DestinationSearch = (function() {
     };
 
     /**
-     * Fetch results from a specific source with timeout
+     * Fetch merged results for the given sources with timeout
      * @param {string} query - The search query
-     * @param {string} source - The data source to search
-     * @param {number} timeout - Timeout in milliseconds
-     * @param {number} cacheLifetime - Cache lifetime in milliseconds
+     * @param {Array} sources - Server-side source names to search
+     * @param {Object} config - Search configuration
      * @returns {Promise<Array>} Promise that resolves to search results
      */
-    async function fetchSourceWithTimeout(query, source, timeout, cacheLifetime) {
+    async function fetchWithTimeout(query, sources, config) {
+        const cacheKey = `${query}-${sources.join(',')}-${config.limit}`;
+        
         // First check cache
-        const cachedResults = cache.get(query, source, cacheLifetime);
+        const cachedResults = cache.get(cacheKey, config.cacheLifetime);
         if (cachedResults) {
-            console.log(`Using cached results for ${query} from ${source}`);
+            console.log(`Using cached results for ${query}`);
             return cachedResults;
         }
         
-        // Create the endpoint URL
-        const endpoint = ENDPOINTS[source];
-        if (!endpoint) {
-            console.error(`Unknown source: ${source}`);
-            return [];
-        }
-        
-        const url = `${endpoint}?query=${encodeURIComponent(query)}`;
+        const params = new URLSearchParams({
+            query: query,
+            sources: sources.join(','),
+            limit: config.limit
+        });
+        const url = `${SEARCH_ENDPOINT}?${params.toString()}`;
         
         // Create a promise that will reject after timeout
         const timeoutPromise = new Promise((_, reject) => {
-            setTimeout(() => reject(new Error(`Request to ${source} timed out`)), timeout);
+            setTimeout(() => reject(new Error('Destination search timed out')), config.timeout);
         });
         
         try {
@@ -118,73 +116,25 @@ const DestinationSearch = (function() {
             ]);
             
             if (!response.ok) {
-                throw new Error(`HTTP error ${response.status} from ${source}`);
+                throw new Error(`HTTP error ${response.status}`);
             }
             
             const data = await response.json();
             
             if (data.status !== 'success') {
-                throw new Error(`API error from ${source}: ${data.message || 'Unknown error'}`);
+                throw new Error(`API error: ${data.message || 'Unknown error'}`);
             }
             
-            // Filter for cities and countries for Google and OpenStreetMap
-            let filteredResults = data.results;
-            if (source === 'google' || source === 'openstreetmap') {
-                filteredResults = data.results.filter(item => item.type === 'city' || item.type === 'country');
-            }
-            // Cache the results
-            cache.set(query, source, filteredResults);
+            // Results arrive deduplicated, filtered and ranked by the server
+            cache.set(cacheKey, data.results);
             
-            return filteredResults;
+            return data.results;
         } catch (error) {
-            console.warn(`Error fetching from ${source}:`, error.message);
+            console.warn('Error searching destinations:', error.message);
             return [];
         }
     }
 
-    /**
-     * Deduplicate results from multiple sources, prioritizing certain sources
-     * @param {Object} resultsBySource - Object mapping sources to their results
-     * @param {string} prioritySource - Source to prioritize during deduplication
-     * @param {number} limit - Maximum number of results to return
-     * @returns {Array} Deduplicated results
-     */
-    function deduplicateResults(resultsBySource, prioritySource, limit) {
-        // First, flatten all results into a single array with source information
-        let allResults = [];
-        for (const source in resultsBySource) {
-            const sourceResults = resultsBySource[source];
-            allResults = allResults.concat(sourceResults);
-        }
-        
-        // Use a map to deduplicate by name + country
-        const dedupMap = new Map();
-        
-        // Process results from priority source first
-        if (resultsBySource[prioritySource]) {
-            resultsBySource[prioritySource].forEach(result => {
-                const key = (result.name + '-' + (result.country || '')).toLowerCase();
-                dedupMap.set(key, result);
-            });
-        }
-        
-        // Then process other sources
-        for (const source in resultsBySource) {
-            if (source === prioritySource) continue;
-            
-            resultsBySource[source].forEach(result => {
-                const key = (result.name + '-' + (result.country || '')).toLowerCase();
-                // Only add if not already added from priority source
-                if (!dedupMap.has(key)) {
-                    dedupMap.set(key, result);
-                }
-            });
-        }
-        
-        // Convert back to array and limit results
-        return Array.from(dedupMap.values()).slice(0, limit);
-    }
-
     return {
         /**
          * Search for destinations across multiple sources
@@ -205,8 +155,10 @@ const DestinationSearch = (function() {
             // Normalize query to trim whitespace
             query = query.trim();
             
-            // Start parallel requests to all specified sources
-            const sources = config.sources.filter(source => ENDPOINTS[source]);
+            // Map to the source names the search endpoint understands
+            const sources = config.sources
+                .filter(source => SOURCE_NAMES[source])
+                .map(source => SOURCE_NAMES[source]);
             
             if (sources.length === 0) {
                 console.warn('No valid sources specified');
@@ -215,37 +167,8 @@ const DestinationSearch = (function() {
             
             console.log(`Searching for "${query}" across sources:`, sources);
             
-            const sourcePromises = {};
-            sources.forEach(source => {
-                sourcePromises[source] = fetchSourceWithTimeout(
-                    query, 
-                    source, 
-                    config.timeout,
-                    config.cacheLifetime
-                );
-            });
-            
-            // Wait for all promises to settle (either resolve or reject)
-            const results = await Promise.all(
-                Object.keys(sourcePromises).map(source => 
-                    sourcePromises[source]
-                        .then(data => ({ source, data }))
-                        .catch(error => ({ source, error }))
-                )
-            );
-            
-            // Organize results by source
-            const resultsBySource = {};
-            results.forEach(result => {
-                resultsBySource[result.source] = result.data || [];
-            });
-            
-            // Deduplicate and limit results
-            const finalResults = deduplicateResults(
-                resultsBySource,
-                config.prioritize,
-                config.limit
-            );
+            // One request; the server searches the sources in parallel
+            const finalResults = await fetchWithTimeout(query, sources, config);
             
             console.log(`Found ${finalResults.length} unique destinations for "${query}"`);
             return finalResults;
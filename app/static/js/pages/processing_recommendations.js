@@ -0,0 +1,123 @@
+/**
+ * Processing Recommendations Page
+ * Follows the extraction job until it finishes, then reloads the page,
+ * which the server answers with the confirmation form (or a redirect
+ * back with an error). Recommendations are listed as they are extracted.
+ * The job is followed over server-sent events when the browser supports
+ * them; the server closes each stream after a short while and EventSource
+ * reconnects, resuming after the last item. Otherwise (or if the stream
+ * can't be opened) the job status is polled: quickly while the job runs,
+ * backing off while it waits in the queue so a slow queue isn't hammered.
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('extraction-status');
+    if (!container) {
+        return;
+    }
+    
+    const statusUrl = container.dataset.statusUrl;
+    const eventsUrl = container.dataset.eventsUrl;
+    const message = document.getElementById('extraction-status-message');
+    const preview = document.getElementById('extracted-preview');
+    
+    function showStatus(job) {
+        if (job.status === 'queued' && job.position) {
+            message.textContent = `You're in line behind ${job.position} other ${job.position === 1 ? 'request' : 'requests'}...`;
+        } else if (job.status === 'running') {
+            message.textContent = job.items
+                ? `Found ${job.items} ${job.items === 1 ? 'place' : 'places'} so far...`
+                : "We're identifying the places you've recommended";
+        }
+    }
+    
+    function showItem(item) {
+        const entry = document.createElement('li');
+        entry.className = 'card p-3';
+        
+        const name = document.createElement('span');
+        name.className = 'font-semibold text-gray-900';
+        name.textContent = item.name || 'Unnamed place';
+        entry.appendChild(name);
+        
+        if (item.type) {
+            const type = document.createElement('span');
+            type.className = 'badge badge-blue ml-2';
+            type.textContent = item.type;
+            entry.appendChild(type);
+        }
+        preview.appendChild(entry);
+    }
+    
+    // Recommendations listed so far; each poll only asks for newer ones
+    let shown = 0;
+    
+    function followEvents() {
+        const source = new EventSource(`${eventsUrl}?since=${shown}`);
+        
+        source.addEventListener('item', event => {
+            showItem(JSON.parse(event.data));
+            shown += 1;
+        });
+        source.addEventListener('reset', () => {
+            // The job was retried and started over; so does the list
+            preview.replaceChildren();
+            shown = 0;
+        });
+        source.addEventListener('status', event => {
+            const job = JSON.parse(event.data);
+            if (job.done) {
+                source.close();
+                window.location.reload();
+                return;
+            }
+            showStatus(job);
+        });
+        // A stream the server ended is reopened by EventSource itself; one
+        // that failed outright (e.g. an error response) is closed, so poll
+        source.addEventListener('error', () => {
+            if (source.readyState === EventSource.CLOSED) {
+                poll(1000);
+            }
+        });
+    }
+    
+    function poll(delay) {
+        setTimeout(() => {
+            fetch(`${statusUrl}?since=${shown}`, { headers: { 'Accept': 'application/json' } })
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`Job status request failed: ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(job => {
+                    if (job.done) {
+                        window.location.reload();
+                        return;
+                    }
+                    if (job.items < shown) {
+                        // The job was retried and started over; so does the list
+                        preview.replaceChildren();
+                        shown = 0;
+                    } else {
+                        job.progress.forEach(showItem);
+                        shown += job.progress.length;
+                    }
+                    showStatus(job);
+                    // Keep up with a running job; back off while it's queued
+                    poll(job.status === 'running' ? 1000 : Math.min(Math.round(delay * 1.5), 5000));
+                })
+                .catch(error => {
+                    console.error('Error checking extraction status:', error);
+                    poll(Math.min(Math.round(delay * 1.5), 5000));
+                });
+        }, delay);
+    }
+    
+    if (eventsUrl && 'EventSource' in window) {
+        followEvents();
+    } else {
+        poll(750);
+    }
+});
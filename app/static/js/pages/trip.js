@@ -6,6 +6,9 @@ document.addEventListener('DOMContentLoaded', function() {
   // Initialize view toggler
   initViewToggler();
   
+  // Initialize the paged recommendation list (used by the filter and map)
+  initRecommendationList();
+  
   // Initialize recommendation filter
   initRecommendationFilter();
   
@@ -24,6 +24,57 @@ class Config:
     
     # URL configuration
     PREFERRED_URL_SCHEME = 'http'
+    
+    # External lookup caching
+    PLACE_CACHE_TTL_DAYS = int(os.environ.get('PLACE_CACHE_TTL_DAYS', 30))
+    PLACE_NEGATIVE_CACHE_TTL_HOURS = int(os.environ.get('PLACE_NEGATIVE_CACHE_TTL_HOURS', 24))
+    
+    # In-memory destination autocomplete index (one per worker)
+    DESTINATION_INDEX_ENABLED = os.environ.get('DESTINATION_INDEX_ENABLED', 'true').lower() == 'true'
+    DESTINATION_INDEX_REFRESH_SECONDS = int(os.environ.get('DESTINATION_INDEX_REFRESH_SECONDS', 30))
+    DESTINATION_INDEX_REBUILD_SECONDS = int(os.environ.get('DESTINATION_INDEX_REBUILD_SECONDS', 3600))
+    DESTINATION_INDEX_MAX_ENTRIES = int(os.environ.get('DESTINATION_INDEX_MAX_ENTRIES', 50000))
+    
+    # Shared store for cross-worker rate limits on external APIs
+    RATE_LIMIT_STORE_PATH = os.environ.get('RATE_LIMIT_STORE_PATH', str(instance_dir / 'rate_limits.db'))
+    
+    # Advisory lock files used to coalesce identical lookups across workers
+    SINGLE_FLIGHT_LOCK_DIR = os.environ.get('SINGLE_FLIGHT_LOCK_DIR', str(instance_dir / 'locks'))
+    
+    # Nominatim is only asked when local destinations don't fill the results
+    OSM_FALLBACK_ENABLED = os.environ.get('OSM_FALLBACK_ENABLED', 'true').lower() == 'true'
+    
+    # Rendered trip page fragments: per-worker LRU size, and whether to share them through the database
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 256))
+    FRAGMENT_CACHE_SHARED = os.environ.get('FRAGMENT_CACHE_SHARED', 'false').lower() == 'true'
+    
+    # Background jobs: run them in the request unless a `flask run-worker` process is deployed
+    JOB_QUEUE_INLINE = os.environ.get('JOB_QUEUE_INLINE', 'true').lower() == 'true'
+    # A running job is retried after this long without finishing, up to JOB_QUEUE_MAX_ATTEMPTS times
+    JOB_QUEUE_LEASE_SECONDS = int(os.environ.get('JOB_QUEUE_LEASE_SECONDS', 300))
+    JOB_QUEUE_MAX_ATTEMPTS = int(os.environ.get('JOB_QUEUE_MAX_ATTEMPTS', 3))
+    JOB_QUEUE_RETENTION_HOURS = int(os.environ.get('JOB_QUEUE_RETENTION_HOURS', 24))
+    # Job event streams are closed after this long (and resumed by the browser) so they can't hold a web thread
+    JOB_EVENTS_MAX_SECONDS = int(os.environ.get('JOB_EVENTS_MAX_SECONDS', 20))
+    
+    # Extracted recommendations cached by submitted text (least recently used evicted past the cap)
+    EXTRACTION_CACHE_MAX_ENTRIES = int(os.environ.get('EXTRACTION_CACHE_MAX_ENTRIES', 5000))
+    # Stream extraction completions so the waiting page shows recommendations as they're generated
+    EXTRACTION_STREAMING = os.environ.get('EXTRACTION_STREAMING', 'true').lower() == 'true'
+    # Longer texts are split on paragraph/sentence boundaries and extracted concurrently
+    EXTRACTION_CHUNK_CHARS = int(os.environ.get('EXTRACTION_CHUNK_CHARS', 3000))
+    EXTRACTION_MAX_CONCURRENCY = int(os.environ.get('EXTRACTION_MAX_CONCURRENCY', 4))
+    # Short texts submitted within the window share one multi-document request (worker needs --threads > 1)
+    EXTRACTION_BATCHING = os.environ.get('EXTRACTION_BATCHING', 'false').lower() == 'true'
+    EXTRACTION_BATCH_WINDOW_MS = int(os.environ.get('EXTRACTION_BATCH_WINDOW_MS', 50))
+    EXTRACTION_BATCH_MAX_ITEMS = int(os.environ.get('EXTRACTION_BATCH_MAX_ITEMS', 8))
+    EXTRACTION_BATCH_MAX_CHARS = int(os.environ.get('EXTRACTION_BATCH_MAX_CHARS', 500))
+    # Line-per-place lists are parsed directly; anything scoring below this confidence goes to OpenAI
+    EXTRACTION_LIST_PARSER = os.environ.get('EXTRACTION_LIST_PARSER', 'true').lower() == 'true'
+    EXTRACTION_LIST_MIN_CONFIDENCE = float(os.environ.get('EXTRACTION_LIST_MIN_CONFIDENCE', 0.8))
+    
+    # Shared AI destination suggestions older than this are refreshed in the background
+    DESTINATION_SUGGESTIONS_MAX_AGE_DAYS = int(os.environ.get('DESTINATION_SUGGESTIONS_MAX_AGE_DAYS', 30))
 
 class DevConfig(Config):
     """Development config."""
@@ -5,6 +5,8 @@ from flask import current_app
 
 from alembic import context
 
+from app.database.search import FTS_TABLE
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -90,9 +92,21 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # the destination search index (the FTS5 table with its shadow tables on
+    # SQLite, the trigram indexes on PostgreSQL) is raw DDL, not part of the
+    # models, so keep autogenerate from proposing to drop it
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == 'table' and name.startswith(FTS_TABLE):
+            return False
+        if type_ == 'index' and reflected and name.endswith('_trgm'):
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,29 @@
+"""add destination external_id column
+
+Revision ID: a7d3e5f08c21
+Revises: f2b9c7d41e06
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e5f08c21'
+down_revision = 'f2b9c7d41e06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('destinations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('external_id', sa.String(length=100), nullable=True))
+        batch_op.create_index(batch_op.f('ix_destinations_external_id'), ['external_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_destinations_external_id'), table_name='destinations')
+    # Drop the column in place: a batch table rebuild on SQLite would also
+    # drop the destinations_fts sync triggers
+    op.execute("ALTER TABLE destinations DROP COLUMN external_id")
@@ -0,0 +1,43 @@
+"""add extraction_cache table
+
+Revision ID: a9d3e6b2c714
+Revises: f2a7c4e9b581
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3e6b2c714'
+down_revision = 'f2a7c4e9b581'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('extraction_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('prompt_version', sa.String(length=16), nullable=False),
+        sa.Column('destination', sa.String(length=255), nullable=True),
+        sa.Column('text_length', sa.Integer(), nullable=False),
+        sa.Column('recommendations', sa.JSON(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('extraction_cache', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_extraction_cache_cache_key'), ['cache_key'], unique=True)
+        batch_op.create_index(batch_op.f('ix_extraction_cache_last_used_at'), ['last_used_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('extraction_cache', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_extraction_cache_last_used_at'))
+        batch_op.drop_index(batch_op.f('ix_extraction_cache_cache_key'))
+    op.drop_table('extraction_cache')
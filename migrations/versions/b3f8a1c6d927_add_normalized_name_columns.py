@@ -0,0 +1,61 @@
+"""add normalized_name to activities and destinations
+
+Revision ID: b3f8a1c6d927
+Revises: a7d3e5f08c21
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.normalization import normalize_text
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f8a1c6d927'
+down_revision = 'a7d3e5f08c21'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill(table_name):
+    """Fill normalized_name in batches so large tables aren't locked in one statement"""
+    conn = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('name', sa.String),
+                     sa.column('normalized_name', sa.String))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, table.c.name)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            table.update().where(table.c.id == sa.bindparam('row_id')).values(normalized_name=sa.bindparam('value')),
+            [{'row_id': row.id, 'value': normalize_text(row.name)[:255]} for row in rows]
+        )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    for table_name in ('activities', 'destinations'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('normalized_name', sa.String(length=255), nullable=True))
+
+        backfill(table_name)
+
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.create_index(f'ix_{table_name}_normalized_name_country', ['normalized_name', 'country'], unique=False)
+
+
+def downgrade():
+    for table_name in ('activities', 'destinations'):
+        op.drop_index(f'ix_{table_name}_normalized_name_country', table_name=table_name)
+        # Drop in place: a batch rebuild of destinations would also drop its FTS sync triggers
+        op.execute(f"ALTER TABLE {table_name} DROP COLUMN normalized_name")
@@ -0,0 +1,53 @@
+"""add destination_suggestions table and trip reference
+
+Revision ID: b4e8f2a6d139
+Revises: a9d3e6b2c714
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8f2a6d139'
+down_revision = 'a9d3e6b2c714'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('destination_suggestions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('normalized_query', sa.String(length=255), nullable=False),
+        sa.Column('query', sa.String(length=255), nullable=False),
+        sa.Column('destination_id', sa.Integer(), nullable=True),
+        sa.Column('suggestions', sa.JSON(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.Column('refresh_requested_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['destination_id'], ['destinations.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('destination_suggestions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_destination_suggestions_normalized_query'), ['normalized_query'], unique=True)
+        batch_op.create_index(batch_op.f('ix_destination_suggestions_destination_id'), ['destination_id'], unique=False)
+
+    with op.batch_alter_table('trips', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('destination_suggestion_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_trips_destination_suggestion_id'), ['destination_suggestion_id'], unique=False)
+        batch_op.create_foreign_key('fk_trips_destination_suggestion_id', 'destination_suggestions', ['destination_suggestion_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('trips', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_trips_destination_suggestion_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_trips_destination_suggestion_id'))
+        batch_op.drop_column('destination_suggestion_id')
+
+    with op.batch_alter_table('destination_suggestions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_destination_suggestions_destination_id'))
+        batch_op.drop_index(batch_op.f('ix_destination_suggestions_normalized_query'))
+    op.drop_table('destination_suggestions')
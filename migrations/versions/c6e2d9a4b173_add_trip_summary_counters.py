@@ -0,0 +1,42 @@
+"""add summary counters to trips
+
+Revision ID: c6e2d9a4b173
+Revises: b3f8a1c6d927
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e2d9a4b173'
+down_revision = 'b3f8a1c6d927'
+branch_labels = None
+depends_on = None
+
+
+COUNTER_COLUMNS = ('recommendation_count', 'activity_count', 'contributor_count', 'last_recommendation_at')
+
+
+def upgrade():
+    with op.batch_alter_table('trips', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recommendation_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('activity_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('contributor_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('last_recommendation_at', sa.DateTime(), nullable=True))
+
+    # Backfill every trip from its recommendations in one statement
+    op.execute("""
+        UPDATE trips SET
+            recommendation_count = (SELECT COUNT(id) FROM recommendations WHERE trip_id = trips.id),
+            activity_count = (SELECT COUNT(DISTINCT activity_id) FROM recommendations WHERE trip_id = trips.id),
+            contributor_count = (SELECT COUNT(DISTINCT author_id) FROM recommendations WHERE trip_id = trips.id),
+            last_recommendation_at = (SELECT MAX(created_at) FROM recommendations WHERE trip_id = trips.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('trips', schema=None) as batch_op:
+        for column in reversed(COUNTER_COLUMNS):
+            batch_op.drop_column(column)
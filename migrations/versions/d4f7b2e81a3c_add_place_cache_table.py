@@ -0,0 +1,46 @@
+"""add place_cache table
+
+Revision ID: d4f7b2e81a3c
+Revises: 825af8bdc5e9
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f7b2e81a3c'
+down_revision = '825af8bdc5e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('place_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('query_name', sa.String(length=255), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('search_vicinity', sa.String(length=255), nullable=True),
+        sa.Column('destination_country', sa.String(length=100), nullable=True),
+        sa.Column('place_id', sa.String(length=255), nullable=True),
+        sa.Column('place_data', sa.JSON(), nullable=True),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    with op.batch_alter_table('place_cache', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_place_cache_cache_key'), ['cache_key'], unique=True)
+        batch_op.create_index(batch_op.f('ix_place_cache_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('place_cache', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_place_cache_expires_at'))
+        batch_op.drop_index(batch_op.f('ix_place_cache_cache_key'))
+    op.drop_table('place_cache')
@@ -0,0 +1,46 @@
+"""add trip content version and rendered_fragments table
+
+Revision ID: d8b4f1e7a265
+Revises: c6e2d9a4b173
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b4f1e7a265'
+down_revision = 'c6e2d9a4b173'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('trips', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_version', sa.Integer(), nullable=False, server_default='1'))
+
+    op.create_table('rendered_fragments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('scope', sa.String(length=255), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    with op.batch_alter_table('rendered_fragments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_rendered_fragments_cache_key'), ['cache_key'], unique=True)
+        batch_op.create_index(batch_op.f('ix_rendered_fragments_scope'), ['scope'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('rendered_fragments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_rendered_fragments_scope'))
+        batch_op.drop_index(batch_op.f('ix_rendered_fragments_cache_key'))
+    op.drop_table('rendered_fragments')
+
+    with op.batch_alter_table('trips', schema=None) as batch_op:
+        batch_op.drop_column('content_version')
@@ -0,0 +1,26 @@
+"""index recommendations by trip and activity
+
+Revision ID: e5c9a2f6d318
+Revises: d8b4f1e7a265
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c9a2f6d318'
+down_revision = 'd8b4f1e7a265'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.create_index('ix_recommendations_trip_id_activity_id', ['trip_id', 'activity_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.drop_index('ix_recommendations_trip_id_activity_id')
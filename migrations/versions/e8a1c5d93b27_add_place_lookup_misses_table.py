@@ -0,0 +1,41 @@
+"""add place_lookup_misses table
+
+Revision ID: e8a1c5d93b27
+Revises: d4f7b2e81a3c
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a1c5d93b27'
+down_revision = 'd4f7b2e81a3c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('place_lookup_misses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('query_name', sa.String(length=255), nullable=False),
+        sa.Column('search_vicinity', sa.String(length=255), nullable=True),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    with op.batch_alter_table('place_lookup_misses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_place_lookup_misses_cache_key'), ['cache_key'], unique=True)
+        batch_op.create_index(batch_op.f('ix_place_lookup_misses_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('place_lookup_misses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_place_lookup_misses_expires_at'))
+        batch_op.drop_index(batch_op.f('ix_place_lookup_misses_cache_key'))
+    op.drop_table('place_lookup_misses')
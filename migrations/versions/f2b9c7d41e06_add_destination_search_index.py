@@ -0,0 +1,49 @@
+"""add destination search index
+
+Revision ID: f2b9c7d41e06
+Revises: e8a1c5d93b27
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.search import (
+    FTS_TABLE, POSTGRES_CREATE_DDL, SEARCH_COLUMNS, SQLITE_CREATE_DDL, SQLITE_DROP_DDL
+)
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b9c7d41e06'
+down_revision = 'e8a1c5d93b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    # Same DDL create_all attaches to the destinations table
+    if dialect == 'postgresql':
+        for statement in POSTGRES_CREATE_DDL:
+            op.execute(statement)
+
+    elif dialect == 'sqlite':
+        for statement in SQLITE_CREATE_DDL:
+            op.execute(statement)
+        # Index the destinations that already exist
+        op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        for column in SEARCH_COLUMNS:
+            op.execute(f"DROP INDEX IF EXISTS ix_destinations_{column}_trgm")
+
+    elif dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        for statement in SQLITE_DROP_DDL:
+            op.execute(statement)
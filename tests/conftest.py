@@ -2,6 +2,7 @@ import os
 import sys
 import pytest
 import tempfile
+from types import SimpleNamespace
 from flask import Flask
 
 # Add parent directory to path so that app imports work
@@ -13,9 +14,9 @@ from app.database import db as _db
 @pytest.fixture
 def app():
     """Create a Flask application for testing."""
-    # Set up configuration for testing
-    app = create_app()
-    app.config.update({
+    # Set up configuration for testing; the database URI has to be set before
+    # Flask-SQLAlchemy creates its engine, so it's passed to create_app
+    app = create_app({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
         'SQLALCHEMY_TRACK_MODIFICATIONS': False,
@@ -40,4 +41,43 @@ def client(app):
 def db(app):
     """Provide the database object for testing."""
     with app.app_context():
-        yield _db 
\ No newline at end of file
+        yield _db 
+@pytest.fixture
+def make_trip(db):
+    """
+    Factory for a trip with an owner, friends, activities and recommendations.
+
+    Call it as make_trip(slug, destination=..., friends=2, activities=None,
+    recommendations=()). activities is a list of Activity keyword dicts
+    (default: five '<slug> place <i>' activities alternating museum/food);
+    recommendations is a list of (activity index, friend index or None for
+    the owner, description) tuples. Everything is committed, and a namespace
+    with trip, owner, friends and activities is returned.
+    """
+    from app.database.models import Activity, Recommendation, Trip, User
+
+    def make(slug, destination='Lisbon', friends=2, activities=None, recommendations=()):
+        owner = User(email=f'{slug}@example.com', name='Owner')
+        friend_users = [User(email=f'{slug}-friend{i}@example.com', name=f'Friend {i}') for i in range(friends)]
+        db.session.add_all([owner] + friend_users)
+        db.session.flush()
+
+        if activities is None:
+            activities = [{'name': f'{slug} place {i}', 'category': 'food' if i % 2 else 'museum'} for i in range(5)]
+        trip = Trip(destination=destination, traveler_name='Owner', share_token=slug, slug=slug, user_id=owner.id)
+        activity_rows = [Activity(**fields) for fields in activities]
+        db.session.add_all([trip] + activity_rows)
+        db.session.flush()
+
+        for activity_index, friend_index, description in recommendations:
+            author = owner if friend_index is None else friend_users[friend_index]
+            db.session.add(Recommendation(
+                activity_id=activity_rows[activity_index].id,
+                author_id=author.id,
+                trip_id=trip.id,
+                description=description
+            ))
+        db.session.commit()
+        return SimpleNamespace(trip=trip, owner=owner, friends=friend_users, activities=activity_rows)
+
+    return make
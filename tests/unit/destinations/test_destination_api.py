@@ -111,7 +111,7 @@ def test_google_places_search_endpoint_mock_mode(client):
     assert mock_result['latitude'] == 12.345
     assert mock_result['longitude'] == 67.890
 
-@patch('app.services.google_places_service.GooglePlacesService.search_destinations')
+@patch('app.services.google_places_destinations.GooglePlacesDestinations.search_destinations')
 def test_google_places_search_endpoint_with_service_mock(mock_search, client):
     """Test Google Places search endpoint with mocked service response"""
     # Set up the mock
@@ -210,4 +210,76 @@ def test_openstreetmap_search_endpoint_with_service_mock(mock_search, client):
     assert result['source'] == 'openstreetmap'
     
     # Verify the mock was called with correct arguments
-    mock_search.assert_called_once_with('Tokyo') 
\ No newline at end of file
+    mock_search.assert_called_once_with('Tokyo') 
+def test_federated_search_endpoint_with_short_query(client):
+    """Test federated search endpoint validation when query is too short"""
+    response = client.get('/api/destinations/search/?query=a')
+    assert response.status_code == 400
+    data = response.get_json()
+    assert data['status'] == 'error'
+    assert data['results'] == []
+
+def test_federated_search_endpoint_merges_sources(client, app, db):
+    """Test federated search dedupes across sources and tags each result"""
+    with app.app_context():
+        db.session.add(Destination(name='Paris', display_name='Paris, France', country='France', type='city'))
+        db.session.commit()
+
+        google_results = [
+            {'name': 'Paris', 'country': 'France', 'type': 'city', 'google_place_id': 'g-paris', 'source': 'google_places'},
+            {'name': 'Paris Las Vegas', 'country': 'United States', 'type': 'landmark', 'google_place_id': 'g-lv', 'source': 'google_places'},
+        ]
+        osm_results = [
+            {'name': 'Paris', 'country': 'France', 'type': 'city', 'osm_id': '7444', 'source': 'openstreetmap'},
+            {'name': 'Paris', 'country': 'United States', 'type': 'city', 'osm_id': '115', 'source': 'openstreetmap'},
+        ]
+
+        with patch('app.services.destination_search_service.GooglePlacesDestinations.search_destinations', return_value=google_results), \
+             patch('app.services.destination_search_service.OpenStreetMapService.search_destinations', return_value=osm_results):
+            response = client.get('/api/destinations/search/?query=Paris')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['status'] == 'success'
+
+        # Duplicates of the database result and non-city types are dropped
+        results = data['results']
+        assert [(r['name'], r['country'], r['source']) for r in results] == [
+            ('Paris', 'France', 'database'),
+            ('Paris', 'United States', 'openstreetmap'),
+        ]
+        assert all('source_latency_ms' in r for r in results)
+        assert data['sources']['google_places']['status'] == 'ok'
+        assert data['sources']['google_places']['count'] == 1
+        assert data['sources']['database']['status'] == 'ok'
+
+def test_federated_search_skips_osm_when_database_fills_results(client, app, db):
+    """Test OpenStreetMap is only queried when local results fall short"""
+    with app.app_context():
+        db.session.add(Destination(name='Paris', display_name='Paris, France', country='France', type='city'))
+        db.session.commit()
+
+        with patch('app.services.destination_search_service.GooglePlacesDestinations.search_destinations', return_value=[]), \
+             patch('app.services.destination_search_service.OpenStreetMapService.search_destinations', return_value=[]) as mock_osm:
+            response = client.get('/api/destinations/search/?query=Paris&limit=1')
+
+        data = response.get_json()
+        assert [r['name'] for r in data['results']] == ['Paris']
+        assert data['sources']['openstreetmap']['status'] == 'skipped'
+        mock_osm.assert_not_called()
+
+def test_federated_search_clamps_limit_and_skips_osm_with_enough_local_results(client, app, db):
+    """Test limit is kept within bounds and a few database hits are enough to skip OpenStreetMap"""
+    with app.app_context():
+        for country in ('France', 'United States', 'Canada'):
+            db.session.add(Destination(name='Paris', display_name=f'Paris, {country}', country=country, type='city'))
+        db.session.commit()
+
+        with patch('app.services.destination_search_service.GooglePlacesDestinations.search_destinations', return_value=[]), \
+             patch('app.services.destination_search_service.OpenStreetMapService.search_destinations', return_value=[]) as mock_osm:
+            assert len(client.get('/api/destinations/search/?query=Paris&limit=0').get_json()['results']) == 1
+            data = client.get('/api/destinations/search/?query=Paris&limit=-5').get_json()
+            assert len(client.get('/api/destinations/search/?query=Paris&limit=100000').get_json()['results']) == 3
+
+        assert len(data['results']) == 1
+        mock_osm.assert_not_called()
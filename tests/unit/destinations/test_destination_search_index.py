@@ -0,0 +1,38 @@
+from app.database import search as destination_search
+from app.database.models import Destination
+
+def _add(db, *destinations):
+    for dest in destinations:
+        db.session.add(dest)
+    db.session.commit()
+
+def test_search_uses_fts_index(app, db):
+    """Test destination search runs against the FTS5 shadow table on SQLite"""
+    _add(db, Destination(name='Zürich', display_name='Zürich, Switzerland', country='Switzerland', type='city'))
+
+    assert destination_search.search_ids('zur', 10) is not None
+    # Accents and case are ignored; the last token matches as a prefix
+    assert [d.name for d in Destination.search('zur')] == ['Zürich']
+    assert [d.name for d in Destination.search('zurich swi')] == ['Zürich']
+
+def test_search_ranks_exact_name_first(app, db):
+    """Test an exact name match outranks longer names sharing the prefix"""
+    _add(db,
+         Destination(name='Parisville', country='United States', type='city', travel_popularity=9.0),
+         Destination(name='Paris', display_name='Paris, France', country='France', type='city', travel_popularity=1.0))
+
+    assert [d.name for d in Destination.search('paris')] == ['Paris', 'Parisville']
+
+def test_search_index_follows_updates_and_deletes(app, db):
+    """Test the triggers keep the index in sync with the destinations table"""
+    dest = Destination(name='Bombay', country='India', type='city')
+    _add(db, dest)
+
+    dest.name = 'Mumbai'
+    db.session.commit()
+    assert Destination.search('bombay') == []
+    assert [d.name for d in Destination.search('mumb')] == ['Mumbai']
+
+    db.session.delete(dest)
+    db.session.commit()
+    assert Destination.search('mumb') == []
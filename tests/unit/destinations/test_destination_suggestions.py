@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import update
+
+from app.database.models import BackgroundJob, Destination, DestinationSuggestion, Trip, User
+from app.routes.user_routes import create_trip_for_user
+from app.services.ai_service import AIService, FALLBACK_DESTINATION_DESCRIPTION
+from app.services.destination_suggestion_service import DestinationSuggestionService
+from app.services.job_queue import JobQueue
+from app.services.job_worker import JobWorker
+
+TOKYO = [{'name': 'Tokyo', 'country': 'Japan', 'description': 'Capital of Japan', 'population': '14 million',
+          'known_for': ['Food'], 'map_description': 'Eastern Honshu'}]
+
+def test_trips_share_one_cached_entry(app, db):
+    """Test suggestions are fetched once per normalized query and trips reference the shared entry"""
+    with app.app_context():
+        destination = Destination(name='Tokyo', country='Japan')
+        owner = User(email='tokyo@example.com', name='Owner')
+        db.session.add_all([destination, owner])
+        db.session.commit()
+
+        with patch.object(AIService, 'get_destination_suggestions', return_value=TOKYO) as mock_suggest:
+            first = create_trip_for_user(owner, 'Tokyo', 'Owner')
+            second = create_trip_for_user(owner, '  TOKYO ', 'Owner')
+            assert mock_suggest.call_count == 1
+
+        assert first.destination_suggestion_id == second.destination_suggestion_id
+        assert first.destination_info is None
+        assert first.destination_details == TOKYO
+        assert first.destination_id == destination.id
+        assert first.destination_display_name == 'Tokyo'
+
+        fallback = [dict(TOKYO[0], name='Atlantis', description=FALLBACK_DESTINATION_DESCRIPTION)]
+        with patch.object(AIService, 'get_destination_suggestions', return_value=fallback):
+            unknown = create_trip_for_user(owner, 'Atlantis', 'Owner')
+        assert unknown.destination_suggestion_id is None
+        assert unknown.destination_details == fallback
+
+def test_stale_entries_are_refreshed_in_the_background(app, db):
+    """Test an old entry is still served while a single refresh job replaces it"""
+    with app.app_context():
+        app.config['JOB_QUEUE_INLINE'] = False
+        with patch.object(AIService, 'get_destination_suggestions', return_value=TOKYO):
+            DestinationSuggestionService.get('Tokyo')
+
+        with db.engine.begin() as conn:
+            conn.execute(update(DestinationSuggestion.__table__).values(refreshed_at=datetime.utcnow() - timedelta(days=60)))
+
+        with patch.object(AIService, 'get_destination_suggestions') as mock_suggest:
+            assert DestinationSuggestionService.get('tokyo')['suggestions'] == TOKYO
+            DestinationSuggestionService.get('Tokyo')
+            assert mock_suggest.call_count == 0
+        assert JobQueue.stats()['depth']['queued'] == 1
+
+        updated = [dict(TOKYO[0], description='Updated')]
+        with patch.object(AIService, 'get_destination_suggestions', return_value=updated):
+            assert JobWorker.work(burst=True) == 1
+
+        entry = DestinationSuggestionService.get('Tokyo')
+        assert entry['suggestions'] == updated
+        assert entry['refresh_requested_at'] is None
+
+def test_stale_entries_are_not_refreshed_inline(app, db):
+    """Test creating a trip for a stale destination makes no OpenAI call when jobs run inline"""
+    with app.app_context():
+        owner = User(email='inline@example.com', name='Owner')
+        db.session.add(owner)
+        db.session.commit()
+        with patch.object(AIService, 'get_destination_suggestions', return_value=TOKYO):
+            DestinationSuggestionService.get('Tokyo')
+
+        with db.engine.begin() as conn:
+            conn.execute(update(DestinationSuggestion.__table__).values(refreshed_at=datetime.utcnow() - timedelta(days=60)))
+
+        assert app.config['JOB_QUEUE_INLINE'] is True
+        with patch.object(AIService, 'get_destination_suggestions') as mock_suggest:
+            trip = create_trip_for_user(owner, 'Tokyo', 'Owner')
+            assert mock_suggest.call_count == 0
+
+        assert trip.destination_details == TOKYO
+        assert BackgroundJob.query.count() == 0
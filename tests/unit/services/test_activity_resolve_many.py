@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from app.database.models import Activity
+
+def _place(place_id, name):
+    return {
+        'place_id': place_id,
+        'name': name,
+        'formatted_address': f'{name}, Paris, France',
+        'geometry': {'location': {'lat': 48.86, 'lng': 2.34}},
+        'address_components': [
+            {'long_name': 'Paris', 'types': ['locality']},
+            {'long_name': 'France', 'types': ['country']},
+        ],
+    }
+
+def test_resolve_many_matches_resolves_and_flushes_once(app, db):
+    """Test known names are matched, the rest resolved together, duplicates shared"""
+    existing = Activity(name='Louvre Museum', category='museum')
+    db.session.add(existing)
+    db.session.commit()
+
+    places = [_place('pl-eiffel', 'Eiffel Tower'), _place('pl-eiffel', 'Eiffel Tower'), None]
+    items = [
+        {'name': 'louvre museum'},
+        {'name': 'Eiffel Tower', 'category': 'landmark'},
+        {'name': 'Tour Eiffel'},
+        {'name': 'Chez Nobody', 'website_url': 'https://example.com'},
+        {'name': 'EIFFEL TOWER'},
+    ]
+
+    with patch('app.services.google_places_batch.GooglePlacesBatch.find_places', return_value=places) as mock_find:
+        activities = Activity.resolve_many(items, search_vicinity='Paris, France')
+
+    # Only unmatched, distinct names go to Google, in one batch with the trip context
+    lookups = mock_find.call_args[0][0]
+    assert lookups == [('Eiffel Tower', 'landmark'), ('Tour Eiffel', None), ('Chez Nobody', None)]
+    assert mock_find.call_args[1] == {'search_vicinity': 'Paris, France'}
+
+    louvre, eiffel, tour_eiffel, nobody, eiffel_again = activities
+    assert louvre is existing
+    assert eiffel is tour_eiffel is eiffel_again
+    assert (eiffel.google_place_id, eiffel.city, eiffel.country) == ('pl-eiffel', 'Paris', 'France')
+    assert nobody.google_place_id is None and nobody.website_url == 'https://example.com'
+
+    # Flushed (ids assigned) but left for the caller to commit
+    assert eiffel.id is not None and nobody.id is not None
+    db.session.rollback()
+    assert Activity.query.count() == 1
+
+def test_get_or_create_matches_normalized_names(app, db):
+    """Test accents, case, punctuation and spacing don't create duplicates"""
+    cafe = Activity(name='Café de Flore', category='cafe')
+    db.session.add(cafe)
+    db.session.commit()
+    assert cafe.normalized_name == 'cafe de flore'
+
+    with patch('app.services.google_places_service.GooglePlacesService.find_place') as mock_find:
+        assert Activity.get_or_create('cafe  de FLORE') is cafe
+        assert Activity.resolve_many([{'name': 'Cafe-de-Flore'}]) == [cafe]
+
+    mock_find.assert_not_called()
+
+def test_name_matches_are_scoped_to_the_trip_country(app, db):
+    """Test a name known in another country isn't reused, while country-less activities still match"""
+    krakow = Activity(name='Old Town', country='Poland')
+    unplaced = Activity(name='Sunset walk')
+    db.session.add_all([krakow, unplaced])
+    db.session.commit()
+
+    with patch('app.services.google_places_batch.GooglePlacesBatch.find_places', return_value=[None]):
+        old_town, walk = Activity.resolve_many([{'name': 'old town'}, {'name': 'Sunset Walk'}],
+                                               destination_country='Czechia')
+    assert old_town is not krakow and old_town.country == 'Czechia'
+    assert walk is unplaced
+    db.session.commit()
+
+    with patch('app.services.google_places_service.GooglePlacesService.find_place') as mock_find:
+        assert Activity.get_or_create('Old Town', destination_country='Poland') is krakow
+        assert Activity.get_or_create('Old Town', destination_country='Czechia') is old_town
+    mock_find.assert_not_called()
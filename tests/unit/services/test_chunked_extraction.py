@@ -0,0 +1,59 @@
+import threading
+import time
+from unittest.mock import patch
+
+from app.services.ai_service import AIService
+from app.services.extraction_requests import ExtractionRequests
+from app.services.text_chunks import split_text
+
+GUIDE = '''Ichiran in Shibuya is open all night. Get the extra-rich broth.
+
+Afuri does yuzu ramen. The Harajuku branch is quieter. Go early!
+
+Ichiran is also great for solo diners. Tsukiji outer market for breakfast.'''
+
+def test_split_text_keeps_paragraphs_and_sentences_together():
+    """Test chunks stay under the limit, break at paragraph or sentence ends and keep every word in order"""
+    chunks = split_text(GUIDE, 80)
+
+    assert all(len(chunk) <= 80 for chunk in chunks)
+    assert chunks[0] == 'Ichiran in Shibuya is open all night. Get the extra-rich broth.'
+    assert ' '.join(chunks).split() == GUIDE.split()
+    assert split_text('short', 80) == ['short']
+
+    words = split_text('word ' * 50, 24)
+    assert all(len(chunk) <= 24 for chunk in words)
+    assert ' '.join(words).split() == ['word'] * 50
+
+def test_long_text_is_extracted_in_parallel_and_merged(app, db):
+    """Test each chunk is its own request, run concurrently up to the cap, and duplicates are merged"""
+    app.config.update(EXTRACTION_CHUNK_CHARS=80, EXTRACTION_MAX_CONCURRENCY=2)
+    per_chunk = {
+        'Ichiran': ({'name': 'Ichiran', 'type': 'restaurant', 'website_url': '', 'description': 'Open all night'}, True),
+        'Afuri': ({'name': 'Afuri', 'type': 'restaurant', 'website_url': '', 'description': 'Yuzu ramen'}, True),
+        'Ichiran is also': ({'name': 'ICHIRAN', 'type': '', 'website_url': 'https://ichiran.com', 'description': 'Solo diners'}, True),
+    }
+    lock = threading.Lock()
+    running = {'now': 0, 'peak': 0}
+
+    def fake_request(chunk, destination, on_item=None):
+        with lock:
+            running['now'] += 1
+            running['peak'] = max(running['peak'], running['now'])
+        time.sleep(0.05)
+        with lock:
+            running['now'] -= 1
+        prefix = max((p for p in per_chunk if chunk.startswith(p)), key=len)
+        rec, complete = per_chunk[prefix]
+        return [rec], complete
+
+    with app.app_context():
+        with patch.object(ExtractionRequests, 'request', side_effect=fake_request) as mock_request:
+            result = AIService.extract_recommendations(GUIDE, 'Tokyo')
+
+    assert mock_request.call_count == len(split_text(GUIDE, 80)) == 3
+    assert running['peak'] == 2
+    assert result == [
+        {'name': 'Ichiran', 'type': 'restaurant', 'website_url': 'https://ichiran.com', 'description': 'Open all night Solo diners'},
+        {'name': 'Afuri', 'type': 'restaurant', 'website_url': '', 'description': 'Yuzu ramen'},
+    ]
@@ -0,0 +1,125 @@
+from datetime import datetime
+
+from sqlalchemy import delete, update
+
+from app.database.models import Destination
+from app.services.destination_index import DestinationIndex
+
+def _add(db, *destinations):
+    for dest in destinations:
+        db.session.add(dest)
+    db.session.commit()
+
+def _names(results):
+    return [result['name'] for result in results]
+
+def test_index_prefix_search_and_ranking(app, db):
+    """Test prefix matching on any word, ranked by name match then popularity"""
+    _add(db,
+         Destination(name='New York', display_name='New York, USA', country='United States', type='city', travel_popularity=9.0),
+         Destination(name='York', display_name='York, UK', country='United Kingdom', type='city', travel_popularity=2.0),
+         Destination(name='Yokohama', country='Japan', type='city', population=3700000))
+
+    index = DestinationIndex(app)
+    assert index.rebuild()
+
+    assert _names(index.search('york')) == ['York', 'New York']
+    assert _names(index.search('new yo')) == ['New York']
+    assert _names(index.search('yo')) == ['York', 'Yokohama', 'New York']
+    assert _names(index.search('united')) == ['New York', 'York']
+    assert index.search('xyz') == []
+
+def test_index_applies_changes_from_other_workers(app, db):
+    """Test the updated_at feed picks up edits and deletions made elsewhere"""
+    _add(db,
+         Destination(name='Bombay', country='India', type='city'),
+         Destination(name='Madras', country='India', type='city'))
+
+    index = DestinationIndex(app)
+    index.rebuild()
+    table = Destination.__table__
+
+    # Write through core so no mapper events fire, as in another process
+    with db.engine.begin() as conn:
+        conn.execute(update(table).where(table.c.name == 'Bombay')
+                     .values(name='Mumbai', updated_at=datetime.utcnow()))
+    index.refresh(force=True)
+    assert _names(index.search('mum')) == ['Mumbai']
+    assert index.search('bomb') == []
+
+    with db.engine.begin() as conn:
+        conn.execute(delete(table).where(table.c.name == 'Madras'))
+    index.refresh(force=True)
+    assert index.search('madr') == []
+    assert index.stats()['destinations'] == 1
+
+def test_capped_index_falls_back_to_database(app, db):
+    """Test a capped index defers to the database when it may be missing matches"""
+    _add(db,
+         Destination(name='Paris', country='France', type='city', travel_popularity=9.0),
+         Destination(name='Parma', country='Italy', type='city', travel_popularity=1.0))
+
+    app.config['DESTINATION_INDEX_MAX_ENTRIES'] = 1
+    index = DestinationIndex(app)
+    index.rebuild()
+
+    assert index.stats()['complete'] is False
+    assert index.search('par', limit=5) is None
+    assert _names(index.search('par', limit=1)) == ['Paris']
+
+def test_refresh_swaps_in_a_new_snapshot(app, db):
+    """Test searches keep reading the old snapshot while a refresh builds the next one"""
+    _add(db, Destination(name='Lisbon', country='Portugal', type='city'))
+
+    index = DestinationIndex(app)
+    index.rebuild()
+    before = index._snapshot
+    table = Destination.__table__
+
+    with db.engine.begin() as conn:
+        conn.execute(update(table).where(table.c.name == 'Lisbon')
+                     .values(name='Lisboa', updated_at=datetime.utcnow()))
+    index.refresh(force=True)
+
+    assert index._snapshot is not before
+    assert [record.name for record in before.records.values()] == ['Lisbon']
+    assert _names(index.search('lisboa')) == ['Lisboa']
+    assert index.stats()['rebuilds'] == 1
+
+def test_bulk_changes_rebuild_instead_of_patching(app, db):
+    """Test a refresh that sees many changed rows reloads the index"""
+    _add(db, *[Destination(name=f'Town {i}', country='Spain', type='city') for i in range(4)])
+
+    index = DestinationIndex(app)
+    index.INCREMENTAL_MAX_CHANGES = 2
+    index.rebuild()
+    table = Destination.__table__
+
+    with db.engine.begin() as conn:
+        conn.execute(update(table).values(country='España', updated_at=datetime.utcnow()))
+    index.refresh(force=True)
+
+    assert index.stats()['rebuilds'] == 2
+    assert len(index.search('espa', limit=10)) == 4
+
+def test_delete_and_insert_with_the_same_row_count_rebuilds(app, db):
+    """Test a deletion hidden by an insert is still noticed by comparing against the max id"""
+    _add(db, Destination(name='Porto', country='Portugal', type='city'),
+         Destination(name='Faro', country='Portugal', type='city'))
+
+    index = DestinationIndex(app)
+    index.rebuild()
+    table = Destination.__table__
+
+    with db.engine.begin() as conn:
+        conn.execute(delete(table).where(table.c.name == 'Porto'))
+    _add(db, Destination(name='Braga', country='Portugal', type='city'))
+    index.refresh(force=True)
+
+    assert index.stats()['rebuilds'] == 2
+    assert _names(index.search('portugal')) == ['Braga', 'Faro']
+
+def test_index_is_not_loaded_under_tests(app):
+    """Test the index stays out of processes that don't serve searches"""
+    assert DestinationIndex.init_app(app) is None
+    assert 'destination_index' not in app.extensions
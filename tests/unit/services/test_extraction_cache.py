@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+from app.services import ai_service
+from app.services.ai_service import AIService
+from app.services.extraction_cache import ExtractionCache
+from app.services.extraction_requests import ExtractionRequests
+
+EXTRACTED = [{'name': 'Ichiran', 'type': 'restaurant', 'website_url': '', 'description': 'Ramen'}]
+
+def test_resubmitted_text_skips_the_api(app, db):
+    """Test the same text is only extracted once per prompt version, and fallbacks aren't cached"""
+    with app.app_context():
+        with patch.object(ExtractionRequests, 'request', return_value=(EXTRACTED, True)) as mock_request:
+            assert AIService.extract_recommendations('Try Ichiran\n\nfor ramen', 'Tokyo') == EXTRACTED
+            assert AIService.extract_recommendations('  Try Ichiran for   ramen ', 'tokyo') == EXTRACTED
+            assert mock_request.call_count == 1
+
+            # Case can change what's extracted, so it is part of the key
+            AIService.extract_recommendations('try ichiran for ramen', 'Tokyo')
+            assert mock_request.call_count == 2
+
+            with patch.object(ai_service, 'EXTRACTION_PROMPT_VERSION', 'edited'):
+                AIService.extract_recommendations('Try Ichiran for ramen', 'Tokyo')
+            assert mock_request.call_count == 3
+
+        fallback = [{'name': 'Recommendations for Tokyo', 'type': '', 'website_url': '', 'description': 'Afuri'}]
+        with patch.object(ExtractionRequests, 'request', return_value=(fallback, False)) as mock_request:
+            AIService.extract_recommendations('Afuri', 'Tokyo')
+            AIService.extract_recommendations('Afuri', 'Tokyo')
+            assert mock_request.call_count == 2
+
+def test_least_recently_used_entries_are_evicted(app, db):
+    """Test the table stays under its cap by dropping the entries used longest ago"""
+    with app.app_context():
+        app.config['EXTRACTION_CACHE_MAX_ENTRIES'] = 2
+        for text in ('first', 'second'):
+            ExtractionCache.set(text, 'Tokyo', 'model', 'v1', EXTRACTED)
+
+        assert ExtractionCache.get('first', 'Tokyo', 'model', 'v1') == EXTRACTED
+        ExtractionCache.set('third', 'Tokyo', 'model', 'v1', EXTRACTED)
+
+        assert ExtractionCache.get('second', 'Tokyo', 'model', 'v1') is None
+        assert ExtractionCache.get('first', 'Tokyo', 'model', 'v1') == EXTRACTED
+        assert ExtractionCache.get('third', 'Tokyo', 'model', 'v1') == EXTRACTED
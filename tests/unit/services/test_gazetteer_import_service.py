@@ -0,0 +1,50 @@
+from app.database.models import Destination
+from app.services.gazetteer_import_service import GazetteerImportService
+
+def _geonames_line(geoname_id, name, feature_class, country_code, population, lat='48.85341', lon='2.3488'):
+    fields = [''] * 19
+    fields[0], fields[1], fields[2] = geoname_id, name, name
+    fields[4], fields[5] = lat, lon
+    fields[6], fields[8], fields[14] = feature_class, country_code, population
+    return '\t'.join(fields) + '\n'
+
+def test_import_geonames_upserts_on_external_id(app, db, tmp_path):
+    """Test GeoNames rows are imported in chunks and re-imports update in place"""
+    country_info = tmp_path / 'countryInfo.txt'
+    country_info.write_text('#ISO\tISO3\tISO-Numeric\tfips\tCountry\n'
+                            'FR\tFRA\t250\tFR\tFrance\n'
+                            'JP\tJPN\t392\tJA\tJapan\n')
+    dump = tmp_path / 'cities.txt'
+    dump.write_text(_geonames_line('2988507', 'Paris', 'P', 'FR', '2138551')
+                    + _geonames_line('1850147', 'Tokyo', 'P', 'JP', '8336599')
+                    + _geonames_line('2972191', 'Mont Blanc', 'T', 'FR', '0'))
+
+    counts = GazetteerImportService.import_file(str(dump), country_info_path=str(country_info), chunk_size=1)
+    assert counts == {'read': 3, 'imported': 2, 'skipped': 1}
+
+    paris = Destination.query.filter_by(external_id='geonames:2988507').one()
+    assert (paris.name, paris.display_name, paris.country, paris.type) == ('Paris', 'Paris, France', 'France', 'city')
+    assert paris.population == 2138551
+
+    # Importing an updated dump changes the existing rows rather than adding new ones
+    dump.write_text(_geonames_line('2988507', 'Paris', 'P', 'FR', '2200000'))
+    GazetteerImportService.import_file(str(dump), country_info_path=str(country_info))
+    db.session.expire_all()
+
+    assert Destination.query.count() == 2
+    assert Destination.query.filter_by(external_id='geonames:2988507').one().population == 2200000
+
+def test_import_csv_maps_natural_earth_headers(app, db, tmp_path):
+    """Test headed CSV dumps are mapped by column name"""
+    dump = tmp_path / 'populated_places.csv'
+    dump.write_text('NE_ID,NAME,ADM0NAME,ISO_A2,LATITUDE,LONGITUDE,POP_MAX\n'
+                    '1159151299,Lisbon,Portugal,PT,38.72,-9.14,2812000\n'
+                    '1159151300,Smallville,Portugal,PT,40.0,-8.0,900\n')
+
+    counts = GazetteerImportService.import_file(str(dump), file_format='csv', source='naturalearth', min_population=1000)
+    assert counts['imported'] == 1
+
+    lisbon = Destination.query.one()
+    assert lisbon.external_id == 'naturalearth:1159151299'
+    assert lisbon.country == 'Portugal'
+    assert lisbon.latitude == 38.72
@@ -0,0 +1,62 @@
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from app.services.google_places_batch import GooglePlacesBatch
+from app.services.google_places_destinations import GooglePlacesDestinations
+from app.services.google_places_service import GooglePlacesService
+
+def make_details(place_id, name):
+    return {
+        'place_id': place_id,
+        'name': name,
+        'formatted_address': f'{name}, Japan',
+        'geometry': {'location': {'lat': 35.0, 'lng': 139.0}},
+        'address_components': [{'long_name': 'Japan', 'short_name': 'JP', 'types': ['country']}],
+        'types': ['locality']
+    }
+
+def autocomplete_response(place_ids):
+    response = MagicMock()
+    response.json.return_value = {
+        'status': 'OK',
+        'predictions': [{'place_id': place_id} for place_id in place_ids]
+    }
+    return response
+
+@patch.dict('os.environ', {'GOOGLE_MAPS_API_KEY': 'test-key'})
+@patch('app.services.google_places_destinations.http')
+def test_search_destinations_fetches_details_concurrently(mock_http):
+    """Detail lookups overlap, and results keep prediction order"""
+    mock_http.get.return_value = autocomplete_response(['tokyo', 'kyoto', 'osaka'])
+    delays = {'tokyo': 0.3, 'kyoto': 0.1, 'osaka': 0.2}
+    
+    def slow_details(place_id, api_key, deadline=None):
+        time.sleep(delays[place_id])
+        return make_details(place_id, place_id.title())
+    
+    with patch.object(GooglePlacesService, 'get_place_details', side_effect=slow_details):
+        started = time.monotonic()
+        results = GooglePlacesDestinations.search_destinations('to')
+        elapsed = time.monotonic() - started
+    
+    assert [result['google_place_id'] for result in results] == ['tokyo', 'kyoto', 'osaka']
+    assert elapsed < 0.55  # Serial lookups would take 0.6s
+
+@patch.dict('os.environ', {'GOOGLE_MAPS_API_KEY': 'test-key'})
+@patch('app.services.google_places_destinations.http')
+def test_search_destinations_drops_details_past_deadline(mock_http):
+    """Predictions whose details miss the deadline or fail are left out"""
+    mock_http.get.return_value = autocomplete_response(['tokyo', 'kyoto', 'osaka'])
+    
+    def details(place_id, api_key, deadline=None):
+        if place_id == 'kyoto':
+            time.sleep(0.5)
+        if place_id == 'osaka':
+            raise ValueError('boom')
+        return make_details(place_id, place_id.title())
+    
+    with patch.object(GooglePlacesBatch, 'DETAILS_FANOUT_DEADLINE', 0.2), \
+            patch.object(GooglePlacesService, 'get_place_details', side_effect=details):
+        results = GooglePlacesDestinations.search_destinations('to')
+    
+    assert [result['google_place_id'] for result in results] == ['tokyo']
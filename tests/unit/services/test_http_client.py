@@ -0,0 +1,112 @@
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from app.services.http_client import SERVICE_PROFILES, HttpClient, DeadlineExceeded, get_client
+
+def make_response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+def make_client(**overrides):
+    settings = {
+        'connect_timeout': 1,
+        'read_timeout': 2,
+        'deadline': 5,
+        'max_retries': 2,
+        'retry_methods': ('GET',),
+    }
+    settings.update(overrides)
+    client = HttpClient('test', **settings)
+    client._session = MagicMock()
+    return client
+
+@patch('app.services.http_client.time.sleep')
+def test_retries_transient_status_then_succeeds(mock_sleep):
+    """A 503 is retried with backoff and the eventual 200 is returned"""
+    client = make_client()
+    client._session.request.side_effect = [make_response(503), make_response(200)]
+    
+    response = client.get('https://example.com/')
+    
+    assert response.status_code == 200
+    assert client._session.request.call_count == 2
+    assert mock_sleep.call_count == 1
+    assert client.stats()['retries'] == 1
+
+def test_passes_per_service_timeouts():
+    """Each attempt uses the service's connect and read timeouts"""
+    client = make_client()
+    client._session.request.return_value = make_response(200)
+    
+    client.get('https://example.com/', params={'q': 'paris'})
+    
+    _, kwargs = client._session.request.call_args
+    assert kwargs['timeout'] == (1, 2)
+    assert kwargs['params'] == {'q': 'paris'}
+
+def test_non_idempotent_post_is_not_retried_after_read_timeout():
+    """POSTs outside retry_methods fail fast once the request may have been sent"""
+    client = make_client(retry_methods=())
+    client._session.request.side_effect = requests.ReadTimeout()
+    
+    with pytest.raises(requests.ReadTimeout):
+        client.post('https://example.com/', json={})
+    
+    assert client._session.request.call_count == 1
+
+@patch('app.services.http_client.time.sleep')
+def test_read_timeout_is_not_retried_when_disabled(mock_sleep):
+    """Profiles like OpenAI's retry 5xx on POST but not a read timeout that may have been billed"""
+    client = make_client(retry_methods=('POST',), retry_read_timeouts=False)
+    client._session.request.side_effect = requests.ReadTimeout()
+    
+    with pytest.raises(requests.ReadTimeout):
+        client.post('https://example.com/', json={})
+    assert client._session.request.call_count == 1
+    
+    client._session.request.side_effect = [make_response(503), make_response(200)]
+    assert client.post('https://example.com/', json={}).status_code == 200
+    assert get_client('openai').retry_read_timeouts is False
+
+@patch('app.services.http_client.time.sleep')
+def test_connect_timeout_is_always_retried(mock_sleep):
+    """Connect timeouts never reached the server, so even POSTs retry them"""
+    client = make_client(retry_methods=())
+    client._session.request.side_effect = [requests.ConnectTimeout(), make_response(200)]
+    
+    assert client.post('https://example.com/', json={}).status_code == 200
+
+def test_retry_budget_is_bounded_by_deadline():
+    """A Retry-After longer than the remaining deadline returns the error response"""
+    client = make_client(deadline=1)
+    client._session.request.return_value = make_response(429, {'Retry-After': '3'})
+    
+    response = client.get('https://example.com/')
+    
+    assert response.status_code == 429
+    assert client._session.request.call_count == 1
+
+def test_expired_deadline_raises():
+    """A request whose deadline has already passed is not sent"""
+    client = make_client()
+    
+    with pytest.raises(DeadlineExceeded):
+        client.get('https://example.com/', deadline=0)
+    
+    client._session.request.assert_not_called()
+
+def test_get_client_is_shared_per_service():
+    """Every caller gets the same pooled client for a service"""
+    assert get_client('google_places') is get_client('google_places')
+    assert get_client('google_places') is not get_client('nominatim')
+
+def test_nominatim_is_never_retried():
+    """Nominatim allows one request per rate limiter token, so a 503 is returned as is"""
+    client = HttpClient('nominatim', **SERVICE_PROFILES['nominatim'])
+    client._session = MagicMock()
+    client._session.request.return_value = make_response(503)
+    
+    assert client.get('https://nominatim.example/search').status_code == 503
+    assert client._session.request.call_count == 1
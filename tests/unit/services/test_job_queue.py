@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import update
+
+from app.database import db
+from app.database.models import BackgroundJob, Trip, User
+from app.services.ai_service import AIService
+from app.services.job_queue import JobQueue
+from app.services.job_worker import JobWorker
+
+@JobQueue.handler('test_double')
+def _double(payload):
+    return payload['value'] * 2
+
+@JobQueue.handler('test_fail')
+def _fail(payload):
+    raise RuntimeError('boom')
+
+def test_worker_runs_queued_jobs_in_order(app, db):
+    """Test jobs wait in the queue until a worker claims them, oldest first"""
+    app.config['JOB_QUEUE_INLINE'] = False
+    first = JobQueue.enqueue('test_double', {'value': 21})
+    second = JobQueue.enqueue('test_fail')
+
+    assert JobQueue.get(first)['status'] == 'queued'
+    assert JobQueue.get(second)['position'] == 1
+    assert JobQueue.stats()['depth']['queued'] == 2
+
+    assert JobWorker.work(worker_id='test', burst=True) == 2
+
+    done = JobQueue.get(first)
+    assert (done['status'], done['result'], done['attempts']) == ('succeeded', 42, 1)
+    failed = JobQueue.get(second)
+    assert (failed['status'], failed['error']) == ('failed', 'boom')
+
+    stats = JobQueue.stats()
+    assert stats['depth'] == {'queued': 0, 'running': 0, 'succeeded': 1, 'failed': 1}
+    assert stats['recent']['jobs'] == 2
+
+@JobQueue.handler('test_session')
+def _leave_pending_user(payload):
+    sessions.append(db.session())
+    db.session.add(User(email=f"pending-{payload['value']}@example.com"))
+
+sessions = []
+
+def test_worker_gives_each_job_a_fresh_session(app, db):
+    """Test ORM state a job leaves behind doesn't carry into the next job or the worker"""
+    app.config['JOB_QUEUE_INLINE'] = False
+    JobQueue.enqueue('test_session', {'value': 1})
+    JobQueue.enqueue('test_session', {'value': 2})
+    sessions.clear()
+
+    assert JobWorker.work(burst=True) == 2
+
+    first, second = sessions
+    assert first is not second
+    assert not first.new and not second.new
+    assert not db.session.new
+
+def test_expired_lease_is_taken_over(app, db):
+    """Test a job whose worker stopped is reclaimed, and the old worker can't overwrite it"""
+    app.config['JOB_QUEUE_INLINE'] = False
+    token = JobQueue.enqueue('test_double', {'value': 1})
+    stuck = JobWorker.claim_next('worker-a')
+    assert JobWorker.claim_next('worker-b') is None
+
+    with db.engine.begin() as conn:
+        conn.execute(update(BackgroundJob.__table__).values(started_at=datetime.utcnow() - timedelta(hours=1)))
+
+    retry = JobWorker.claim_next('worker-b')
+    assert (retry['token'], retry['attempts']) == (token, 2)
+
+    JobQueue.run(retry)
+    with patch.dict(JobQueue._handlers, {'test_double': lambda payload: -1}):
+        JobQueue.run(stuck)
+    assert JobQueue.get(token)['result'] == 2
+
+def test_extraction_is_queued_and_confirmed_when_ready(app, db, client):
+    """Test submitting text redirects to a status page that shows the confirm form once the job is done"""
+    app.config['JOB_QUEUE_INLINE'] = False
+    owner = User(email='lisbon@example.com', name='Owner')
+    db.session.add(owner)
+    db.session.flush()
+    db.session.add(Trip(destination='Lisbon', traveler_name='Owner', share_token='lisbon', slug='lisbon', user_id=owner.id))
+    db.session.commit()
+
+    response = client.post('/trip/lisbon/process/', data={
+        'unstructured_recommendations': 'Go to Time Out Market',
+        'recommender_name': 'Ana'
+    })
+    assert response.status_code == 302
+    token = response.headers['Location'].rstrip('/').rsplit('/', 1)[-1]
+
+    waiting = client.get(f'/trip/lisbon/process/{token}/')
+    assert b'data-status-url="/api/jobs/' in waiting.data
+    assert client.get(f'/api/jobs/{token}/').get_json() == {
+        'status': 'queued', 'done': False, 'position': 0, 'attempts': 0, 'items': 0, 'progress': []
+    }
+
+    extracted = [{'name': 'Time Out Market', 'type': 'food hall', 'website_url': '', 'description': 'Lunch'}]
+    with patch.object(AIService, 'extract_recommendations', return_value=extracted):
+        JobWorker.work(burst=True)
+
+    assert client.get(f'/api/jobs/{token}/').get_json()['status'] == 'succeeded'
+
+    confirm = client.get(f'/trip/lisbon/process/{token}/')
+    assert b'Time Out Market' in confirm.data
+    assert b'value="Ana"' in confirm.data
+
+    assert client.get('/api/jobs/unknown/').status_code == 404
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from app.services.ai_service import AIService
+from app.services.extraction_requests import ExtractionRequests
+from app.services.list_parser import ListParser
+
+LIST = '''Our Tokyo favourites:
+- Ichiran - open all night, get the extra-rich broth
+- Afuri – yuzu ramen https://afuri.com
+* Tsukiji Outer Market
+1. ichiran - great for solo diners'''
+
+PROSE = '''You should definitely try Ichiran in Shibuya, it's open all night.
+Afuri does yuzu ramen and the Harajuku branch is quieter.'''
+
+def test_parse_scores_lists_above_prose():
+    """Test bulleted lines become items with descriptions and URLs, while sentences score low"""
+    recommendations, confidence = ListParser.parse(LIST)
+
+    assert confidence == 1.0
+    assert recommendations[:3] == [
+        {'name': 'Ichiran', 'type': '', 'website_url': '', 'description': 'open all night, get the extra-rich broth'},
+        {'name': 'Afuri', 'type': '', 'website_url': 'https://afuri.com', 'description': 'yuzu ramen'},
+        {'name': 'Tsukiji Outer Market', 'type': '', 'website_url': '', 'description': ''},
+    ]
+    assert ListParser.parse(PROSE)[1] < 0.5
+    assert ListParser.parse('Ichiran')[1] == 0.0
+
+def test_short_notes_are_not_taken_for_lists():
+    """Test conversational lines without bullets, URLs or descriptions go to the AI service"""
+    for note in ('Thanks!\nHave fun', 'Have fun\nSee you soon', 'Ichiran\nAfuri', '- Thanks!\n- Have fun'):
+        assert ListParser.parse(note)[1] < ListParser.DEFAULT_MIN_CONFIDENCE, note
+
+    # One unmarked line is enough to send the whole submission on
+    assert ListParser.parse('- Ichiran\n- Afuri\nEnjoy the trip')[1] == 0.0
+
+def test_confident_lists_skip_the_ai_request(app, db):
+    """Test list-shaped text is answered without OpenAI, prose still goes to it, and both count toward the hit rate"""
+    before = ListParser.stats()
+    extracted = [{'name': 'Ichiran', 'type': 'restaurant', 'website_url': '', 'description': 'Ramen'}]
+
+    with app.app_context():
+        with patch.object(ExtractionRequests, 'request', return_value=(extracted, True)) as mock_request:
+            listed = AIService.extract_recommendations(LIST, 'Tokyo')
+            assert mock_request.call_count == 0
+            assert AIService.extract_recommendations(PROSE, 'Tokyo') == extracted
+            assert mock_request.call_count == 1
+
+    # Same place listed twice is merged
+    assert [rec['name'] for rec in listed] == ['Ichiran', 'Afuri', 'Tsukiji Outer Market']
+    assert listed[0]['description'] == 'open all night, get the extra-rich broth great for solo diners'
+
+    stats = ListParser.stats()
+    assert (stats['attempts'] - before['attempts'], stats['hits'] - before['hits']) == (2, 1)
+    assert 0 < stats['hit_rate'] <= 1
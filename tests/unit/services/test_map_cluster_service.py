@@ -0,0 +1,63 @@
+from app.database.models import Activity, Recommendation
+from app.services.map_cluster_service import MapClusterService
+
+PLACES = [
+    ('Louvre', 48.8606, 2.3376),
+    ('Orsay', 48.8600, 2.3266),
+    ('Sacre-Coeur', 48.8867, 2.3431),
+    ('Versailles', 48.8049, 2.1204),
+    ('Somewhere unknown', None, None),
+]
+
+def _make_trip(make_trip, slug):
+    return make_trip(
+        slug,
+        destination='Paris',
+        friends=0,
+        activities=[{'name': name, 'latitude': lat, 'longitude': lng, 'category': 'sight'} for name, lat, lng in PLACES],
+        recommendations=[(i, None, name) for i, (name, _, _) in enumerate(PLACES)]
+    ).trip
+
+def test_points_cluster_by_zoom_and_filter_by_bbox(app, db, make_trip):
+    """Test nearby places merge at low zoom, split when zoomed in, and only visible ones are returned"""
+    trip = _make_trip(make_trip, 'paris-clusters')
+
+    world = MapClusterService.markers(trip, zoom=3)
+    assert len(world['features']) == 1
+    assert world['features'][0]['properties'] == {'cluster': True, 'point_count': 4}
+    assert world['bbox'] == [2.1204, 48.8049, 2.3431, 48.8867]
+    assert world['missing'] == ['Somewhere unknown']
+
+    city = MapClusterService.markers(trip, zoom=9)
+    counts = sorted(feature['properties'].get('point_count', 1) for feature in city['features'])
+    assert counts == [1, 3]
+
+    street = MapClusterService.markers(trip, zoom=17)
+    assert len(street['features']) == 4
+    assert street['features'][0]['geometry']['coordinates'] == [2.3376, 48.8606]
+
+    # Central Paris only: Versailles is out of view
+    visible = MapClusterService.markers(trip, zoom=17, bbox=(2.25, 48.84, 2.40, 48.90))
+    assert sorted(feature['properties']['name'] for feature in visible['features']) == ['Louvre', 'Orsay', 'Sacre-Coeur']
+
+def test_tiers_are_built_once_per_trip_version(app, db, client, make_trip):
+    """Test the markers endpoint reuses cached tiers until the trip changes"""
+    trip = _make_trip(make_trip, 'paris-tiers')
+    builds = MapClusterService.stats()['builds']
+
+    response = client.get('/api/trips/paris-tiers/markers/?zoom=5')
+    assert response.mimetype == 'application/geo+json'
+    client.get('/api/trips/paris-tiers/markers/?zoom=12&bbox=2.2,48.8,2.4,48.9')
+    assert MapClusterService.stats()['builds'] == builds + 1
+
+    activity = Activity(name='Pantheon', latitude=48.8462, longitude=2.3464)
+    db.session.add(activity)
+    db.session.flush()
+    db.session.add(Recommendation(activity_id=activity.id, author_id=trip.user_id, trip_id=trip.id))
+    db.session.commit()
+
+    data = client.get('/api/trips/paris-tiers/markers/').get_json()
+    assert len(data['features']) == 5
+    assert MapClusterService.stats()['builds'] == builds + 2
+
+    assert client.get('/api/trips/paris-tiers/markers/?bbox=1,2,3').status_code == 400
@@ -0,0 +1,59 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from app.services import extraction_requests
+from app.services.ai_service import AIService
+from app.services.extraction_requests import ExtractionRequests
+from app.services.micro_batch import UNBATCHED, MicroBatcher
+
+def _submit_concurrently(count, submit):
+    results = [None] * count
+    def run(i):
+        results[i] = submit(i)
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_calls_share_one_batch():
+    """Test calls arriving together run as one batch, overflow leads the next, and a lone call is sent back unbatched"""
+    batcher = MicroBatcher('test')
+    batches = []
+    def run_batch(items):
+        batches.append(sorted(items))
+        return [item * 10 for item in items]
+
+    results = _submit_concurrently(5, lambda i: batcher.submit(i, run_batch, max_items=3, max_wait=0.5))
+
+    assert results == [0, 10, 20, 30, 40]
+    assert sorted(len(batch) for batch in batches) == [2, 3]
+    assert batcher.submit(7, run_batch, max_items=3, max_wait=0.01) is UNBATCHED
+    assert batcher.stats() == {'batches': 2, 'batched_items': 5, 'unbatched': 1, 'failed_batches': 0, 'max_batch_size': 3, 'pending': 0}
+
+def test_batched_extraction_falls_back_per_document(app, db, monkeypatch):
+    """Test short submissions go out as one multi-document request, and a document missing from the answer is retried alone"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    app.config.update(EXTRACTION_BATCHING=True, EXTRACTION_BATCH_WINDOW_MS=500, EXTRACTION_BATCH_MAX_ITEMS=2)
+    ichiran = {'name': 'Ichiran', 'type': 'restaurant', 'website_url': '', 'description': 'Ramen'}
+    content = 'Sure! ' + json.dumps({'1': [ichiran], '2': 'not a list'})
+    response = MagicMock(status_code=200)
+    response.json.return_value = {'choices': [{'message': {'content': content}}]}
+    single = [{'name': 'Alone', 'type': '', 'website_url': '', 'description': ''}]
+
+    def extract(i):
+        text = ['try Ichiran', 'and Afuri'][i]
+        with app.app_context():
+            return AIService.extract_recommendations(text, 'Tokyo')
+
+    with patch.object(extraction_requests.http, 'post', return_value=response) as mock_post, \
+         patch.object(ExtractionRequests, 'request', return_value=(single, True)) as mock_single:
+        results = _submit_concurrently(2, extract)
+
+    assert mock_post.call_count == 1
+    prompt = mock_post.call_args.kwargs['json']['messages'][1]['content']
+    assert '<document id="1" destination="Tokyo">' in prompt and '<document id="2" destination="Tokyo">' in prompt
+    assert mock_single.call_count == 1
+    assert sorted(results, key=str) == sorted([[ichiran], single], key=str)
@@ -0,0 +1,95 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app.database.models import PlaceCacheEntry
+from app.services.google_places_service import GooglePlacesService, GooglePlacesError
+from app.services.place_cache_service import PlaceCacheService
+
+EIFFEL_TOWER = {
+    'place_id': 'ChIJLU7jZClu5kcR4PcOOO6p3I0',
+    'name': 'Eiffel Tower',
+    'formatted_address': 'Champ de Mars, 5 Av. Anatole France, 75007 Paris, France',
+    'geometry': {
+        'location': {'lat': 48.8583701, 'lng': 2.2944813},
+        'viewport': {'northeast': {'lat': 48.86, 'lng': 2.30}, 'southwest': {'lat': 48.85, 'lng': 2.29}}
+    },
+    'types': ['tourist_attraction', 'point_of_interest']
+}
+
+@pytest.fixture(autouse=True)
+def clear_negative_memo():
+    """The in-process negative memo outlives each test's database"""
+    PlaceCacheService._negative_memo.clear()
+    yield
+    PlaceCacheService._negative_memo.clear()
+
+def test_make_key_normalizes_lookup():
+    """Lookups differing only in case, accents and spacing share a key"""
+    key = PlaceCacheService.make_key('google_places', 'Café de Flore', None, 'Paris, France')
+    assert key == PlaceCacheService.make_key('google_places', '  cafe DE flore ', None, 'paris france')
+    assert key != PlaceCacheService.make_key('google_places', 'Café de Flore', None, 'Lyon, France')
+
+def test_trim_place_details_keeps_location_only():
+    """Trimmed details drop the viewport but keep the coordinates"""
+    trimmed = PlaceCacheService.trim_place_details(EIFFEL_TOWER)
+    assert trimmed['place_id'] == EIFFEL_TOWER['place_id']
+    assert trimmed['geometry'] == {'location': {'lat': 48.8583701, 'lng': 2.2944813}}
+
+@patch.dict('os.environ', {'GOOGLE_MAPS_API_KEY': 'test-key'})
+def test_find_place_repeat_lookup_skips_network(app):
+    """A second identical lookup is answered from the cache"""
+    with app.app_context():
+        hits = PlaceCacheService.stats()['hits']
+        with patch.object(GooglePlacesService, '_lookup_place', return_value=EIFFEL_TOWER) as mock_lookup:
+            first = GooglePlacesService.find_place('Eiffel Tower', search_vicinity='Paris, France')
+            second = GooglePlacesService.find_place('eiffel tower', search_vicinity='Paris France')
+        
+        assert mock_lookup.call_count == 1
+        assert first == second
+        assert second['place_id'] == EIFFEL_TOWER['place_id']
+        assert PlaceCacheEntry.query.count() == 1
+        
+        # The hit is counted in-process; reading the cache doesn't write to it
+        assert PlaceCacheService.stats()['hits'] == hits + 1
+        assert PlaceCacheEntry.query.one().hit_count == 0
+
+def test_evict_expired_removes_only_stale_entries(app):
+    """The eviction sweep deletes expired entries and keeps live ones"""
+    with app.app_context():
+        PlaceCacheService.set('google_places', 'Eiffel Tower', PlaceCacheService.trim_place_details(EIFFEL_TOWER))
+        PlaceCacheService.set('google_places', 'Louvre', {'place_id': 'louvre', 'name': 'Louvre'})
+        
+        assert PlaceCacheService.evict_expired() == 0
+        assert PlaceCacheService.get('google_places', 'Louvre')['place_id'] == 'louvre'
+        
+        evicted = PlaceCacheService.evict_expired(now=datetime.utcnow() + timedelta(days=365))
+        assert evicted == 2
+        assert PlaceCacheService.get('google_places', 'Louvre') is None
+
+@patch.dict('os.environ', {'GOOGLE_MAPS_API_KEY': 'test-key'})
+def test_find_place_known_miss_skips_network(app):
+    """A lookup that found nothing is not repeated for the same vicinity"""
+    with app.app_context():
+        with patch.object(GooglePlacesService, '_lookup_place', return_value=None) as mock_lookup:
+            assert GooglePlacesService.find_place('walk along the river', search_vicinity='Kyoto, Japan') is None
+            assert GooglePlacesService.find_place('Walk along the river', search_vicinity='Kyoto, Japan') is None
+            assert mock_lookup.call_count == 1
+            
+            # A different vicinity is a different lookup
+            GooglePlacesService.find_place('walk along the river', search_vicinity='Paris, France')
+            assert mock_lookup.call_count == 2
+        
+        # The miss is shared through the database, not just this process
+        PlaceCacheService._negative_memo.clear()
+        assert PlaceCacheService.is_known_miss('google_places', 'walk along the river', search_vicinity='Kyoto, Japan')
+
+@patch.dict('os.environ', {'GOOGLE_MAPS_API_KEY': 'test-key'})
+def test_find_place_api_failure_is_not_cached(app):
+    """API errors are retried on the next request rather than cached as misses"""
+    with app.app_context():
+        with patch.object(GooglePlacesService, '_lookup_place', side_effect=GooglePlacesError('OVER_QUERY_LIMIT')) as mock_lookup:
+            GooglePlacesService.find_place('Eiffel Tower')
+            GooglePlacesService.find_place('Eiffel Tower')
+        
+        assert mock_lookup.call_count == 2
+        assert not PlaceCacheService.is_known_miss('google_places', 'Eiffel Tower')
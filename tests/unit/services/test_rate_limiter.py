@@ -0,0 +1,35 @@
+from unittest.mock import patch
+
+from app.services.rate_limiter import RateLimiter
+
+def _limiter(tmp_path, **overrides):
+    settings = {'rate': 1.0, 'capacity': 2, 'max_queue': 1, 'max_wait': 0.5}
+    settings.update(overrides)
+    return RateLimiter('test', str(tmp_path / 'rate_limits.db'), **settings)
+
+def test_bucket_is_shared_across_limiter_instances(tmp_path):
+    """Test two limiters on the same store (as in two workers) share one budget"""
+    first = _limiter(tmp_path)
+    second = _limiter(tmp_path)
+
+    assert first.acquire() is True
+    assert second.acquire() is True
+    # The burst is spent and the next token is a second away, beyond max_wait
+    assert first.acquire() is False
+    assert first.stats()['shed'] == 1
+    assert second.stats()['acquired'] == 1
+
+def test_wait_queue_is_bounded(tmp_path):
+    """Test one caller may queue for the next token while the next is shed"""
+    limiter = _limiter(tmp_path, rate=5.0, capacity=1, max_wait=1.0)
+
+    with patch('app.services.rate_limiter.time.sleep') as mock_sleep:
+        assert limiter.acquire() is True
+        assert limiter.acquire() is True
+        assert limiter.queue_depth() == 1
+        assert limiter.acquire() is False
+
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args[0][0] <= 0.2
+    stats = limiter.stats()
+    assert (stats['acquired'], stats['waited'], stats['shed']) == (2, 1, 1)
@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import MISSING, SingleFlight
+
+def _run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+def test_concurrent_callers_share_one_call():
+    """Test callers with the same key wait on one in-flight call"""
+    flight = SingleFlight('test')
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'place_id': 'abc'}
+
+    results, errors = _run_concurrently(5, lambda: flight.do('same-key', lookup))
+
+    assert len(calls) == 1
+    assert errors == [None] * 5
+    assert all(result == {'place_id': 'abc'} for result in results)
+    # Each caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+    assert flight.stats()['leaders'] + flight.stats()['followers'] == 5
+
+def test_followers_see_the_leaders_error():
+    """Test a failed call is raised to every waiting caller and not remembered"""
+    flight = SingleFlight('test')
+
+    def failing_lookup():
+        time.sleep(0.1)
+        raise RuntimeError('upstream down')
+
+    results, errors = _run_concurrently(3, lambda: flight.do('key', failing_lookup))
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+    # Nothing is left in flight, so the next caller runs the call again
+    assert flight.do('key', lambda: 'ok') == 'ok'
+
+def test_recheck_under_lock_reuses_another_workers_result(app, tmp_path):
+    """Test the cross-process path answers from the shared cache when it can"""
+    app.config['SINGLE_FLIGHT_LOCK_DIR'] = str(tmp_path)
+    flight = SingleFlight('test')
+
+    with app.app_context():
+        def lookup():
+            pytest.fail('lookup should not run when the cache has the answer')
+
+        assert flight.do('key', lookup, recheck=lambda: 'cached') == 'cached'
+        assert flight.do('other', lambda: 'fresh', recheck=lambda: MISSING) == 'fresh'
+
+    assert flight.stats()['shared_cache_hits'] == 1
+
+def test_followers_stop_waiting_on_a_stuck_leader():
+    """Test a follower runs the call itself once the timeout passes"""
+    flight = SingleFlight('test')
+    release = threading.Event()
+
+    def stuck_lookup():
+        release.wait(5)
+        return 'slow'
+
+    leader = threading.Thread(target=lambda: flight.do('key', stuck_lookup))
+    leader.start()
+    time.sleep(0.05)
+
+    assert flight.do('key', lambda: 'fresh', timeout=0.1) == 'fresh'
+    assert flight.stats()['wait_timeouts'] == 1
+    release.set()
+    leader.join()
@@ -0,0 +1,105 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from app.services import extraction_requests
+from app.services.extraction_requests import ExtractionRequests
+from app.services.job_queue import JobQueue
+from app.services.job_worker import JobWorker
+from app.services.json_stream import JSONArrayStreamParser
+
+COMPLETION = '''Here are the places I found:
+[
+  {"name": "Ichiran", "type": "restaurant", "website_url": "", "description": "Ramen with {custom} \\"spice\\" levels"},
+  {"name": "Afuri", "type": "restaurant", "website_url": "https://afuri.com", "description": "Yuzu [shio] ramen"},
+  {"name": "TeamLab", "type": "museum", "website_url": "", "description": "Digital art", "tags": {"kids": true}}
+]
+Enjoy!'''
+
+@JobQueue.handler('test_progress')
+def _report_two_items(payload):
+    JobQueue.report_progress([{'name': 'First'}])
+    JobQueue.report_progress([{'name': 'First'}, {'name': 'Second'}])
+    return 'done'
+
+def _chunks(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_parser_yields_each_object_as_it_closes():
+    """Test objects split across chunks are returned once complete, ignoring braces inside strings"""
+    parser = JSONArrayStreamParser()
+    items = []
+    for chunk in _chunks(COMPLETION):
+        items.extend(parser.feed(chunk))
+
+    expected = json.loads(COMPLETION[COMPLETION.find('['):COMPLETION.rfind(']') + 1])
+    assert items == expected
+
+    parser = JSONArrayStreamParser()
+    assert parser.feed(COMPLETION[:COMPLETION.index('Afuri')]) == expected[:1]
+
+def test_streamed_extraction_matches_the_full_response(app, monkeypatch):
+    """Test streaming passes items along early and returns the same list as the non-streaming path"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+
+    full = MagicMock(status_code=200)
+    full.json.return_value = {'choices': [{'message': {'content': COMPLETION}}]}
+
+    lines = [b'data: ' + json.dumps({'choices': [{'delta': {'content': chunk}}]}).encode('utf-8') for chunk in _chunks(COMPLETION, 7)]
+    streamed = MagicMock(status_code=200)
+    streamed.iter_lines.return_value = [b'data: {"choices": [{"delta": {"role": "assistant"}}]}', b''] + lines + [b'data: [DONE]']
+
+    with patch.object(extraction_requests.http, 'post', return_value=full):
+        expected = ExtractionRequests.request('text', 'Tokyo')
+
+    seen = []
+    with patch.object(extraction_requests.http, 'post', return_value=streamed) as mock_post:
+        result = ExtractionRequests.request('text', 'Tokyo', on_item=seen.append)
+    assert mock_post.call_args.kwargs['json']['stream'] is True
+
+    assert result == expected
+    assert seen == expected[0]
+    streamed.close.assert_called_once()
+
+def test_job_status_returns_progress_after_since(app, db, client):
+    """Test polls get the partial results reported so far, only the ones after since"""
+    app.config['JOB_QUEUE_INLINE'] = False
+    token = JobQueue.enqueue('test_progress')
+    JobWorker.work(burst=True)
+
+    data = client.get(f'/api/jobs/{token}/').get_json()
+    assert data['items'] == 2
+    assert data['progress'] == [{'name': 'First'}, {'name': 'Second'}]
+
+    assert client.get(f'/api/jobs/{token}/?since=1').get_json()['progress'] == [{'name': 'Second'}]
+    assert client.get(f'/api/jobs/{token}/?since=5').get_json()['progress'] == []
+
+def test_job_events_stream_partial_results(app, db, client):
+    """Test reported progress is sent as numbered item events that reconnects resume from"""
+    app.config['JOB_QUEUE_INLINE'] = False
+    token = JobQueue.enqueue('test_progress')
+    JobWorker.work(burst=True)
+
+    events = client.get(f'/api/jobs/{token}/events/')
+    assert events.mimetype == 'text/event-stream'
+    data = events.get_data(as_text=True)
+    assert 'id: 1\nevent: item\ndata: {"name": "First"}' in data
+    assert 'id: 2\nevent: item\ndata: {"name": "Second"}' in data
+    assert '"status": "succeeded"' in data
+
+    resumed = client.get(f'/api/jobs/{token}/events/', headers={'Last-Event-ID': '1'}).get_data(as_text=True)
+    assert 'First' not in resumed and 'Second' in resumed
+    assert 'First' not in client.get(f'/api/jobs/{token}/events/?since=1').get_data(as_text=True)
+
+    # A client ahead of the job's progress (the job was retried) starts over
+    restarted = client.get(f'/api/jobs/{token}/events/', headers={'Last-Event-ID': '5'}).get_data(as_text=True)
+    assert restarted.index('event: reset') < restarted.index('id: 1\nevent: item')
+
+def test_job_events_stream_closes_after_max_seconds(app, db, client):
+    """Test a stream for an unfinished job ends after JOB_EVENTS_MAX_SECONDS so the web thread is freed"""
+    app.config['JOB_QUEUE_INLINE'] = False
+    app.config['JOB_EVENTS_MAX_SECONDS'] = 0
+    token = JobQueue.enqueue('test_progress')
+
+    data = client.get(f'/api/jobs/{token}/events/').get_data(as_text=True)
+    assert 'event: status\ndata: {"status": "queued"' in data
+    assert client.get('/api/jobs/missing/events/').status_code == 404
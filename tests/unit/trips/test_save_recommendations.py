@@ -0,0 +1,69 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from app.database import db
+from app.database.models import Activity, PlaceCacheEntry, Recommendation, Trip, User
+from app.services.google_places_service import GooglePlacesService
+
+EIFFEL_TOWER = {
+    'place_id': 'pl-eiffel',
+    'name': 'Eiffel Tower',
+    'formatted_address': 'Champ de Mars, 75007 Paris, France',
+    'geometry': {'location': {'lat': 48.8583701, 'lng': 2.2944813}},
+}
+
+@pytest.fixture
+def file_app(tmp_path):
+    """
+    An app on a file-backed SQLite database. The shared in-memory database
+    the other tests use has a single connection, so it can't show one
+    connection waiting on another's write lock.
+    """
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'save.db'}",
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'WTF_CSRF_ENABLED': False,
+    })
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+@patch.dict('os.environ', {'GOOGLE_MAPS_API_KEY': 'test-key'})
+def test_guest_save_caches_places_without_waiting_on_the_session(file_app):
+    """A named guest's save writes the place cache without hitting the session's write lock"""
+    with file_app.app_context():
+        owner = User(email='owner@example.com', name='Owner')
+        db.session.add(owner)
+        db.session.flush()
+        db.session.add(Trip(destination='Paris', destination_display_name='Paris, France', user_id=owner.id,
+                            slug='paris', share_token='paris-token'))
+        db.session.commit()
+
+    client = file_app.test_client()
+    started = time.monotonic()
+    with patch.object(GooglePlacesService, '_lookup_place', return_value=EIFFEL_TOWER):
+        response = client.post('/trip/paris/save/', data={
+            'recommendations[]': ['Eiffel Tower'],
+            'descriptions[]': ['Go at sunset'],
+            'recommender_name': 'Sam',
+        })
+
+    # A lock wait would take sqlite's five second busy timeout
+    assert time.monotonic() - started < 3
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/paris/thank-you/')
+
+    with file_app.app_context():
+        assert PlaceCacheEntry.query.count() == 1
+        recommendation = Recommendation.query.one()
+        assert recommendation.activity.google_place_id == 'pl-eiffel'
+        assert recommendation.author.name == 'Sam'
+        assert Activity.query.count() == 1
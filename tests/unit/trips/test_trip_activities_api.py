@@ -0,0 +1,84 @@
+from app.database.models import Activity, Recommendation, Trip
+
+def _make_trip(make_trip, slug):
+    # Friend 0 recommends every place, friend 1 seconds the first two
+    made = make_trip(
+        slug,
+        destination='Mexico City',
+        activities=[{'name': f'Place {i}', 'category': 'food' if i % 2 else 'museum'} for i in range(5)],
+        recommendations=[(i, 0, f'Place {i}') for i in range(5)] + [(i, 1, None) for i in range(2)]
+    )
+    return [friend.id for friend in made.friends]
+
+def test_activities_are_paged_with_a_cursor(app, db, client, make_trip):
+    """Test keyset pages cover every grouped activity once, in first-recommended order"""
+    _make_trip(make_trip, 'cdmx-pages')
+
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        url = '/api/trips/cdmx-pages/activities/?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(url).get_json()
+        names.extend(activity['name'] for activity in data['activities'])
+        pages += 1
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == [f'Place {i}' for i in range(5)]
+
+    first = client.get('/api/trips/cdmx-pages/activities/?limit=2').get_json()['activities'][0]
+    assert first['category'] == 'museum'
+    assert [rec['author'] for rec in first['recommendations']] == ['Friend 0', 'Friend 1']
+
+def test_activities_filter_by_category_and_contributor(app, db, client, make_trip):
+    """Test server-side filters return only the matching activities"""
+    friend_ids = _make_trip(make_trip, 'cdmx-filters')
+
+    food = client.get('/api/trips/cdmx-filters/activities/?category=food').get_json()
+    assert [activity['name'] for activity in food['activities']] == ['Place 1', 'Place 3']
+
+    seconded = client.get(f'/api/trips/cdmx-filters/activities/?contributor={friend_ids[1]}').get_json()
+    assert [activity['name'] for activity in seconded['activities']] == ['Place 0', 'Place 1']
+
+    both = client.get(f'/api/trips/cdmx-filters/activities/?contributor={friend_ids[1]}&category=food').get_json()
+    assert [activity['name'] for activity in both['activities']] == ['Place 1']
+
+    assert client.get('/api/trips/cdmx-filters/activities/?cursor=abc').status_code == 400
+
+def test_trip_page_renders_first_page_and_revalidates_api(app, db, client, make_trip):
+    """Test the page embeds the first page and the API answers repeat requests with 304"""
+    _make_trip(make_trip, 'cdmx-page')
+
+    page = client.get('/trip/cdmx-page/')
+    assert b'id="trip-activities-data"' in page.data
+    assert b'data-activities-url="/api/trips/cdmx-page/activities/"' in page.data
+
+    response = client.get('/api/trips/cdmx-page/activities/')
+    repeat = client.get('/api/trips/cdmx-page/activities/', headers={'If-None-Match': response.headers['ETag']})
+    assert repeat.status_code == 304
+
+def test_facets_count_activities_and_follow_the_trip_version(app, db, client, make_trip):
+    """Test facet counts come back per category and contributor and refresh when the trip changes"""
+    friend_ids = _make_trip(make_trip, 'cdmx-facets')
+
+    data = client.get('/api/trips/cdmx-facets/facets/').get_json()
+    assert data['activity_count'] == 5
+    assert data['categories'] == [{'value': 'food', 'count': 2}, {'value': 'museum', 'count': 3}]
+    assert data['contributors'] == [
+        {'id': friend_ids[0], 'name': 'Friend 0', 'count': 5},
+        {'id': friend_ids[1], 'name': 'Friend 1', 'count': 2},
+    ]
+
+    trip = Trip.query.filter_by(slug='cdmx-facets').first()
+    activity = Activity(name='Place 5', category='food')
+    db.session.add(activity)
+    db.session.flush()
+    db.session.add(Recommendation(activity_id=activity.id, author_id=friend_ids[1], trip_id=trip.id))
+    db.session.commit()
+
+    data = client.get('/api/trips/cdmx-facets/facets/').get_json()
+    assert data['categories'][0] == {'value': 'food', 'count': 3}
+    assert data['contributors'][1]['count'] == 3
@@ -0,0 +1,46 @@
+from app.database.models import Recommendation
+from app.database.trip_counters import reconcile_trip_counters
+
+def _make_trip(make_trip, slug):
+    made = make_trip(slug, destination='Porto', activities=[{'name': f'{slug} place {i}'} for i in range(2)])
+    return made.trip, made.friends, made.activities
+
+def test_counters_follow_recommendation_writes(app, db, make_trip):
+    """Test counters are maintained in the same transaction as recommendation saves and deletes"""
+    trip, friends, activities = _make_trip(make_trip, 'porto-counters')
+    recommendations = [
+        Recommendation(activity_id=activities[0].id, author_id=friends[0].id, trip_id=trip.id),
+        Recommendation(activity_id=activities[0].id, author_id=friends[1].id, trip_id=trip.id),
+        Recommendation(activity_id=activities[1].id, author_id=friends[1].id, trip_id=trip.id),
+    ]
+    db.session.add_all(recommendations)
+    db.session.commit()
+
+    assert (trip.recommendation_count, trip.activity_count, trip.contributor_count) == (3, 2, 2)
+    assert trip.last_recommendation_at == max(rec.created_at for rec in recommendations)
+
+    db.session.delete(recommendations[2])
+    db.session.commit()
+    assert (trip.recommendation_count, trip.activity_count, trip.contributor_count) == (2, 1, 2)
+
+    db.session.add(Recommendation(activity_id=activities[1].id, author_id=friends[0].id, trip_id=trip.id))
+    db.session.rollback()
+    assert trip.recommendation_count == 2
+
+def test_reconcile_repairs_drifted_counters(app, db, make_trip):
+    """Test the reconciliation pass fixes trips whose counters were bypassed"""
+    trip, friends, activities = _make_trip(make_trip, 'porto-drift')
+    db.session.add(Recommendation(activity_id=activities[0].id, author_id=friends[0].id, trip_id=trip.id))
+    db.session.commit()
+
+    # Bulk deletes skip the flush hooks
+    Recommendation.query.filter_by(trip_id=trip.id).delete()
+    db.session.commit()
+    assert trip.recommendation_count == 1
+
+    with db.engine.begin() as conn:
+        assert reconcile_trip_counters(conn) == 1
+        assert reconcile_trip_counters(conn) == 0
+
+    db.session.expire(trip)
+    assert (trip.recommendation_count, trip.activity_count, trip.last_recommendation_at) == (0, 0, None)
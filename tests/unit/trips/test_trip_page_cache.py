@@ -0,0 +1,66 @@
+from app.database.models import Activity, Recommendation, RenderedFragment
+from app.services.fragment_cache import FragmentCache
+
+def _make_trip(make_trip, slug):
+    made = make_trip(
+        slug,
+        destination='Kyoto',
+        friends=1,
+        activities=[{'name': 'Fushimi Inari', 'category': 'temple'}],
+        recommendations=[(0, 0, None)]
+    )
+    return made.owner.id, made.friends[0].id, made.trip.id
+
+def test_repeat_visit_gets_304_until_trip_changes(app, db, client, make_trip):
+    """Test the ETag revalidates repeat visits and changes when recommendations are added"""
+    _, friend_id, trip_id = _make_trip(make_trip, 'kyoto-etag')
+
+    first = client.get('/trip/kyoto-etag/')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert first.last_modified is not None
+
+    repeat = client.get('/trip/kyoto-etag/', headers={'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304
+
+    activity = Activity(name='Kinkaku-ji', category='temple')
+    db.session.add(activity)
+    db.session.flush()
+    db.session.add(Recommendation(activity_id=activity.id, author_id=friend_id, trip_id=trip_id))
+    db.session.commit()
+
+    changed = client.get('/trip/kyoto-etag/', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != first.headers['ETag']
+    assert b'Kinkaku-ji' in changed.data
+
+def test_recommendations_fragment_is_shared_but_owner_controls_are_not(app, db, client, make_trip):
+    """Test visitors share one rendered list while owner-only markup stays per user"""
+    owner_id, _, _ = _make_trip(make_trip, 'kyoto-fragment')
+    renders = FragmentCache.stats()['renders']
+
+    visitor_page = client.get('/trip/kyoto-fragment/')
+    with client.session_transaction() as sess:
+        sess['user_id'] = owner_id
+    owner_page = client.get('/trip/kyoto-fragment/')
+
+    assert FragmentCache.stats()['renders'] == renders + 1
+    assert b'Fushimi Inari' in visitor_page.data and b'Fushimi Inari' in owner_page.data
+    assert b'Ask your friends for recommendations' in owner_page.data
+    assert b'Ask your friends for recommendations' not in visitor_page.data
+    assert owner_page.headers['ETag'] != visitor_page.headers['ETag']
+
+def test_shared_store_serves_other_workers_and_keeps_latest_version(app, db):
+    """Test fragments written to the shared store are reused after the worker LRU is gone"""
+    app.config['FRAGMENT_CACHE_SHARED'] = True
+    try:
+        FragmentCache.get_or_render('trip:1:shared', 1, 'recommendations', lambda: '<p>v1</p>')
+        FragmentCache.clear()
+        cached = FragmentCache.get_or_render('trip:1:shared', 1, 'recommendations', lambda: '<p>rendered again</p>')
+        assert cached == '<p>v1</p>'
+
+        FragmentCache.get_or_render('trip:1:shared', 2, 'recommendations', lambda: '<p>v2</p>')
+        assert [row.version for row in RenderedFragment.query.filter_by(scope='trip:1:shared')] == [2]
+    finally:
+        app.config['FRAGMENT_CACHE_SHARED'] = False
+        FragmentCache.clear()
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.database.models import Recommendation, User
+from app.database.trip_view import load_trip_view
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def _recommendations(count):
+    """Recommendations spread round-robin over the five default activities and three friends"""
+    return [(i % 5, i % 3, f'note {i}') for i in range(count)]
+
+def test_trip_view_groups_recommendations_by_activity(app, db, make_trip):
+    """Test the read model matches the grouping the trip page expects"""
+    trip = make_trip('lisbon-small', friends=3, recommendations=_recommendations(7)).trip
+
+    view = load_trip_view(trip)
+
+    assert view.recommendation_count == 7
+    assert [group.activity.name for group in view.groups] == [f'lisbon-small place {i}' for i in range(5)]
+    assert [rec.description for rec in view.groups[0].recommendations] == ['note 0', 'note 5']
+    assert view.groups[0].recommendations[1].author.name == 'Friend 2'
+    assert [contributor.name for contributor in view.contributors] == ['Friend 0', 'Friend 1', 'Friend 2']
+
+def test_trip_page_query_count_does_not_grow_with_recommendations(app, db, client, make_trip):
+    """Test the trip page issues the same few queries for 3 or 60 recommendations"""
+    make_trip('lisbon-few', friends=3, recommendations=_recommendations(3))
+    make_trip('lisbon-many', friends=3, recommendations=_recommendations(60))
+    db.session.remove()
+
+    with count_queries(db.engine) as small_queries:
+        assert client.get('/trip/lisbon-few/').status_code == 200
+    with count_queries(db.engine) as large_queries:
+        response = client.get('/trip/lisbon-many/')
+
+    assert response.status_code == 200
+    assert b'60 recommendations' in response.data
+    assert len(large_queries) == len(small_queries) <= 3
+
+def test_contributor_filter_does_not_show_email_addresses(app, db, client, make_trip):
+    """Test the cached recommendations fragment labels contributors like the APIs, never by email"""
+    made = make_trip('lisbon-anon', friends=3, recommendations=_recommendations(3))
+    trip = made.trip
+    anonymous = User(email='anonymous@example.com', name='Anonymous User')
+    unnamed = User(email='unnamed-friend@example.com')
+    db.session.add_all([anonymous, unnamed])
+    db.session.flush()
+    for author in (anonymous, unnamed):
+        db.session.add(Recommendation(activity_id=made.activities[0].id, author_id=author.id, trip_id=trip.id, description='shh'))
+    db.session.commit()
+
+    page = client.get('/trip/lisbon-anon/').get_data(as_text=True)
+    filters = page.split('id="filter-section"')[1].split('Filter by Recommendation Type')[0]
+
+    assert 'Friend 0' in filters
+    assert filters.count('Anonymous') == 2
+    assert '@example.com' not in page